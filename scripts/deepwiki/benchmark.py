@@ -0,0 +1,530 @@
+"""Micro-benchmarks for the DeepWiki generator.
+
+Run from the repository root:
+
+    python -m scripts.deepwiki.benchmark lexer
+    python -m scripts.deepwiki.benchmark references
+    python -m scripts.deepwiki.benchmark variables
+    python -m scripts.deepwiki.benchmark graph --nodes 10000 --edges 50000
+    python -m scripts.deepwiki.benchmark memory --profile large
+    python -m scripts.deepwiki.benchmark suite --profile caf [--save-baseline]
+
+``suite`` generates a synthetic CAF-shaped repository, times every generator
+phase, records its peak traced memory and compares both with the baseline
+stored for the profile; it exits non-zero when a phase regressed.
+"""
+import argparse
+import contextlib
+import dataclasses
+import gc
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki import synthetic_repo
+
+
+# -----------------------------
+# Reference implementations (pre-optimisation), kept for comparison
+# -----------------------------
+
+def legacy_find_block_body(content: str, start: int) -> Tuple[str, int]:
+    depth = 1
+    i = start
+    while i < len(content):
+        char = content[i]
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return content[start:i], i + 1
+        i += 1
+    return content[start:], len(content)
+
+
+def legacy_extract_blocks(content: str) -> List[Dict[str, str]]:
+    pattern = re.compile(r'(resource|module|data)\s+"([^"]+)"(?:\s+"([^"]+)")?\s*\{', re.MULTILINE)
+    blocks: List[Dict[str, str]] = []
+    idx = 0
+    while True:
+        match = pattern.search(content, idx)
+        if not match:
+            break
+        kind = match.group(1)
+        primary = match.group(2)
+        secondary = match.group(3)
+        body, end_idx = legacy_find_block_body(content, match.end())
+
+        if kind == "resource":
+            if not secondary:
+                idx = end_idx
+                continue
+            node = f"{primary}.{secondary}"
+        elif kind == "data":
+            if not secondary:
+                idx = end_idx
+                continue
+            node = f"data.{primary}.{secondary}"
+        else:  # module
+            node = f"module.{primary}"
+
+        blocks.append({"kind": kind, "node": node, "body": body})
+        idx = end_idx
+
+    return blocks
+
+
+def dict_blocks(content: str) -> List[Dict[str, str]]:
+    """Blocks as they were kept before ``gma.Block``: plain dicts with a copy of every body."""
+    return [{"kind": b.kind, "node": b.node, "body": b.body} for b in gma._extract_blocks(content)]
+
+
+def dict_scan(data: Dict[str, Any]) -> Dict[str, Any]:
+    """A scan as cached before ``gma.Variable``/``gma.Output``: one dict per variable and output."""
+    return dict(data, variables=[v._asdict() for v in data["variables"]],
+                outputs=[o._asdict() for o in data["outputs"]])
+
+
+def legacy_extract_dependencies(blocks: List[Dict[str, str]]):
+    nodes = {block["node"] for block in blocks}
+    edges = set()
+    remote_deps = set()
+
+    for block in blocks:
+        body = block["body"]
+        source = block["node"]
+
+        for module_name in re.findall(r'module\.([A-Za-z0-9_]+)', body):
+            target = f"module.{module_name}"
+            if target in nodes and target != source:
+                edges.add((source, target))
+
+        for data_type, data_name in re.findall(r'data\.([A-Za-z0-9_]+)\.([A-Za-z0-9_]+)', body):
+            target = f"data.{data_type}.{data_name}"
+            if target in nodes and target != source:
+                edges.add((source, target))
+
+        for res_type, res_name in re.findall(r'([A-Za-z0-9_]+)\.([A-Za-z0-9_]+)', body):
+            if res_type in {"var", "local", "each", "toset", "try", "coalesce", "path", "lookup", "length"}:
+                continue
+            candidate = f"{res_type}.{res_name}"
+            if candidate in nodes and candidate != source:
+                edges.add((source, candidate))
+
+        for remote_obj in re.findall(r'var\.remote_objects\.([A-Za-z0-9_]+)', body):
+            remote_deps.add(f"remote:{remote_obj}")
+
+    if remote_deps:
+        nodes = nodes.union(remote_deps)
+        for remote_node in remote_deps:
+            for block in blocks:
+                if f"var.remote_objects.{remote_node[7:]}" in block["body"]:
+                    edges.add((block["node"], remote_node))
+
+    return nodes, sorted(edges)
+
+
+def naive_reduce_graph(edges: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Transitive reduction of a DAG by one DFS per edge; reference for reduce_graph()."""
+    successors: Dict[str, List[str]] = {}
+    for src, dst in edges:
+        successors.setdefault(src, []).append(dst)
+
+    def reachable_without(src: str, dst: str) -> bool:
+        stack = [n for n in successors[src] if n != dst]
+        seen = set(stack)
+        while stack:
+            node = stack.pop()
+            if node == dst:
+                return True
+            for child in successors.get(node, ()):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return False
+
+    return sorted((src, dst) for src, dst in set(edges) if not reachable_without(src, dst))
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+
+def module_contents(modules_root: str) -> List[str]:
+    """Concatenated .tf content of every module folder under ``modules_root``."""
+    contents = []
+    for root, _dirs, files in os.walk(modules_root):
+        if any(fn.endswith(".tf") for fn in files):
+            contents.append(gma.read_tf_from_folder(root))
+    return contents
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def synthetic_graph(nodes: int, edges: int, cycles: int = 0, seed: int = 42) -> List[Tuple[str, str]]:
+    """Layered module-like DAG with many transitive shortcuts, plus ``cycles`` back edges."""
+    rng = random.Random(seed)
+    names = [f"module.m{i:05d}" for i in range(nodes)]
+    result = set()
+    while len(result) < edges:
+        src = rng.randrange(nodes - 1)
+        dst = min(nodes - 1, src + 1 + int(rng.expovariate(1 / 20)))
+        result.add((names[src], names[dst]))
+    for _ in range(cycles):
+        dst = rng.randrange(nodes - 10)
+        result.add((names[dst + rng.randrange(1, 10)], names[dst]))
+    return sorted(result)
+
+
+def print_comparison(title: str, size_bytes: int, timings: Dict[str, float]):
+    print(title)
+    baseline = next(iter(timings.values()))
+    for name, seconds in timings.items():
+        rate = size_bytes / seconds / 1e6 if seconds else float("inf")
+        print(f"  {name:<10} {seconds * 1000:9.1f} ms  {rate:8.1f} MB/s  x{baseline / seconds:5.2f}")
+
+
+# -----------------------------
+# Benchmarks
+# -----------------------------
+
+def bench_lexer(args: argparse.Namespace) -> int:
+    contents = module_contents(args.modules_root)
+    size = sum(len(c) for c in contents)
+
+    def run_legacy():
+        for c in contents:
+            legacy_extract_blocks(c)
+
+    def run_lexer():
+        for c in contents:
+            gma._extract_blocks(c)
+
+    timings = {
+        "legacy": best_of(run_legacy, args.repeat),
+        "lexer": best_of(run_lexer, args.repeat),
+    }
+    print_comparison(f"Block extraction over {len(contents)} modules ({size / 1e6:.1f} MB)", size, timings)
+
+    differing = sum(
+        1 for c in contents
+        if {b["node"] for b in legacy_extract_blocks(c)} != {b.node for b in gma._extract_blocks(c)}
+    )
+    print(f"  modules whose block set differs (comments/strings/heredocs): {differing}")
+    return 0
+
+
+def bench_references(args: argparse.Namespace) -> int:
+    contents = module_contents(args.modules_root)
+    root_dir = os.path.dirname(os.path.abspath(args.modules_root))
+    contents += [gma._read_text(os.path.join(root_dir, fn)) for fn in sorted(os.listdir(root_dir)) if fn.endswith(".tf")]
+    block_sets = [gma._extract_blocks(c) for c in contents]
+    legacy_sets = [dict_blocks(c) for c in contents]
+    size = sum(b.end - b.start for blocks in block_sets for b in blocks)
+
+    timings = {
+        "legacy": best_of(lambda: [legacy_extract_dependencies(b) for b in legacy_sets], args.repeat),
+        "indexed": best_of(lambda: [gma.extract_dependencies_from_blocks(b) for b in block_sets], args.repeat),
+    }
+    print_comparison(f"Reference resolution over {len(block_sets)} files/modules ({size / 1e6:.1f} MB of bodies)",
+                     size, timings)
+
+    differing = sum(
+        1 for legacy, blocks in zip(legacy_sets, block_sets)
+        if legacy_extract_dependencies(legacy) != gma.extract_dependencies_from_blocks(blocks)
+    )
+    print(f"  inputs whose graph differs from the legacy resolver: {differing}")
+    return 0
+
+
+def bench_variables(args: argparse.Namespace) -> int:
+    import hcl2
+
+    texts = []
+    for root, _dirs, files in os.walk(args.modules_root):
+        for fn in sorted(files):
+            if fn in ("variables.tf", "outputs.tf", "output.tf"):
+                texts.append(gma._read_text(os.path.join(root, fn)))
+    size = sum(len(t) for t in texts)
+
+    timings = {
+        "hcl2": best_of(lambda: [hcl2.loads(t) for t in texts], max(1, args.repeat // 2)),
+        "fast": best_of(lambda: [gma.load_hcl(t) for t in texts], args.repeat),
+    }
+    with tempfile.TemporaryDirectory() as cache_dir:
+        previous = gma.set_parse_cache(gma.HclParseCache(cache_dir))
+        try:
+            [gma.load_hcl(t) for t in texts]  # Warm the parse cache
+            timings["fast+cache"] = best_of(lambda: [gma.load_hcl(t) for t in texts], args.repeat)
+        finally:
+            gma.set_parse_cache(previous)
+    print_comparison(f"variables/outputs parsing over {len(texts)} files ({size / 1e6:.1f} MB)", size, timings)
+
+    fast = fallback = 0
+    for t in texts:
+        try:
+            gma.load_hcl_fast(t)
+            fast += 1
+        except gma.UnsupportedHcl:
+            fallback += 1
+    print(f"  fast path: {fast} files, hcl2 fallback: {fallback} files")
+    return 0
+
+
+def bench_graph(args: argparse.Namespace) -> int:
+    edges = synthetic_graph(args.nodes, args.edges, cycles=args.nodes // 100)
+    best = best_of(lambda: gma.reduce_graph([], edges), args.repeat)
+    members, reduced = gma.reduce_graph([], edges)
+    cyclic = sum(1 for nodes in members.values() if len(nodes) > 1)
+    print(f"reduce_graph: {args.nodes} nodes, {len(edges)} edges -> {len(members)} nodes "
+          f"({cyclic} condensed cycles), {len(reduced)} edges in {best * 1000:.1f} ms")
+
+    # Cross-check against one-DFS-per-edge on an acyclic graph small enough for it
+    small = synthetic_graph(min(args.nodes, 2000), min(args.edges, 10000))
+    naive = best_of(lambda: naive_reduce_graph(small), 1)
+    bitset = best_of(lambda: gma.reduce_graph([], small), args.repeat)
+    print(f"Transitive reduction over {len(small)} edges")
+    print(f"  naive      {naive * 1000:9.1f} ms")
+    print(f"  bitset     {bitset * 1000:9.1f} ms  x{naive / bitset:5.0f}")
+    matches = gma.reduce_graph([], small)[1] == naive_reduce_graph(small)
+    print(f"  reduced edge sets identical: {matches}")
+    return 0 if matches else 1
+
+
+def gc_ms() -> float:
+    """Best-of-five full collection time in milliseconds over what is currently alive."""
+    gc.collect()
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        gc.collect()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def traced(fn: Callable[[], Any]) -> Tuple[float, float, float]:
+    """``(retained MB, peak MB, added full-collection ms)`` while the result of one call is alive."""
+    baseline = gc_ms()
+    tracemalloc.start()
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collect = gc_ms() - baseline
+    del result
+    return current / 1e6, peak / 1e6, collect
+
+
+def bench_memory(args: argparse.Namespace) -> int:
+    shape = synthetic_repo.PROFILES[args.profile]
+    with tempfile.TemporaryDirectory() as root, use_repo(root):
+        synthetic_repo.generate_repo(root, shape)
+        contents = module_contents(os.path.join(root, "modules"))
+        # What the module cache holds: every scan as JSON, loaded back for the whole run
+        payload = json.dumps([gma.scan_module(*task[:3]) for task in gma.discover_modules()])
+    legacy_payload = json.dumps([dict_scan(gma.compact_scan(data)) for data in json.loads(payload)])
+    print(f"Memory over {len(contents)} synthetic modules ('{args.profile}' profile)")
+
+    rows = [
+        ("blocks", "dicts + body copies", lambda: [dict_blocks(c) for c in contents],
+         "records + offsets", lambda: [gma._extract_blocks(c) for c in contents]),
+        ("dependencies", "dict blocks", lambda: [legacy_extract_dependencies(dict_blocks(c)) for c in contents],
+         "records", lambda: [gma.extract_dependencies_from_content(c) for c in contents]),
+        ("cached scans", "dicts", lambda: json.loads(legacy_payload),
+         "interned records", lambda: [gma.compact_scan(data) for data in json.loads(payload)]),
+    ]
+    for name, before_label, before, after_label, after in rows:
+        before_mb, before_peak, before_gc = traced(before)
+        after_mb, after_peak, after_gc = traced(after)
+        print(f"{name}: {before_label} -> {after_label}")
+        print(f"  retained   {before_mb:8.1f} MB -> {after_mb:8.1f} MB  x{before_mb / max(after_mb, 1e-9):5.1f}")
+        print(f"  peak       {before_peak:8.1f} MB -> {after_peak:8.1f} MB")
+        print(f"  gc.collect {before_gc:8.1f} ms -> {after_gc:8.1f} ms")
+    return 0
+
+
+# -----------------------------
+# Phase suite over a synthetic repository
+# -----------------------------
+
+@contextlib.contextmanager
+def use_repo(root: str):
+    """Point the generator's path globals at ``root`` for the duration of the block."""
+    names = ("REPO_ROOT", "MODULES_ROOT", "DOCS_ROOT", "DOCS_MODULES", "DOCS_ROOT_AGG")
+    saved = {name: getattr(gma, name) for name in names}
+    gma.REPO_ROOT = root
+    gma.MODULES_ROOT = os.path.join(root, "modules")
+    gma.DOCS_ROOT = os.path.join(root, "docs")
+    gma.DOCS_MODULES = os.path.join(root, "docs", "modules")
+    gma.DOCS_ROOT_AGG = os.path.join(root, "docs", "root")
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(gma, name, value)
+
+
+def suite_phases(root: str, jobs: int) -> List[Tuple[str, Callable[[], Any]]]:
+    """Generator phases in run order; later phases reuse what earlier ones produced."""
+    cache_dir = os.path.join(root, gma.CACHE_DIRNAME)
+    state: Dict[str, Any] = {}
+    dot_path = os.path.join(root, "docs", "root", "graph.dot")
+
+    def modules():
+        state["nav_modules"], _ = gma.generate_modules_docs(jobs=jobs, cache_dir=cache_dir)
+
+    def root_docs():
+        state["nav_root"] = gma.generate_root_docs(cache_dir=cache_dir)
+
+    def dependencies():
+        for content in module_contents(os.path.join(root, "modules")):
+            gma.extract_dependencies_from_content(content)
+
+    def dot_text():
+        with open(dot_path, "r", encoding="utf-8") as f:
+            gma.parse_dot_module_edges(f.read())
+
+    return [
+        ("modules (cold)", modules),
+        ("modules (warm)", modules),
+        ("root docs", root_docs),
+        ("extract_dependencies", dependencies),
+        ("parse_dot_module_edges", dot_text),
+        ("dependency map", lambda: gma.generate_root_dependency_map()),
+        ("mkdocs.yml", lambda: gma.generate_mkdocs_yml(state["nav_modules"], state["nav_root"])),
+    ]
+
+
+def run_suite(shape: "synthetic_repo.RepoShape", jobs: int = 1, memory: bool = True) -> Dict[str, Dict[str, float]]:
+    """Generate a repository of ``shape`` and return ``{phase: {"seconds", "peak_mb"}}``.
+
+    Phases are run once untraced for timing and, with ``memory``, once more
+    on a fresh copy under tracemalloc for peak allocation.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for traced in (False, True) if memory else (False,):
+        with tempfile.TemporaryDirectory() as root, use_repo(root), contextlib.redirect_stdout(open(os.devnull, "w")):
+            synthetic_repo.generate_repo(root, shape)
+            gma.reset_write_stats()
+            for name, phase in suite_phases(root, jobs):
+                if traced:
+                    tracemalloc.start()
+                    phase()
+                    _current, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    results[name]["peak_mb"] = round(peak / 1e6, 2)
+                else:
+                    start = time.perf_counter()
+                    phase()
+                    results[name] = {"seconds": round(time.perf_counter() - start, 4)}
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                        tolerance: float) -> List[str]:
+    """Describe every metric that exceeds its baseline by more than ``tolerance`` (a fraction).
+
+    Small absolute differences (10 ms, 1 MB) are ignored so tiny phases do not flap.
+    """
+    slack = {"seconds": 0.01, "peak_mb": 1.0}
+    regressions = []
+    for phase, metrics in results.items():
+        for metric, value in metrics.items():
+            reference = baseline.get(phase, {}).get(metric)
+            if reference is not None and value > reference * (1 + tolerance) + slack[metric]:
+                regressions.append(f"{phase}: {metric} {value:g} > baseline {reference:g}")
+    return regressions
+
+
+def bench_suite(args: argparse.Namespace) -> int:
+    shape = dataclasses.replace(
+        synthetic_repo.PROFILES[args.profile],
+        **{field: getattr(args, field) for field in ("categories", "modules", "blocks", "variables",
+                                                     "dot_modules", "dot_edges") if getattr(args, field)},
+    )
+    print(f"Synthetic repository '{args.profile}': {shape}")
+    results = run_suite(shape, jobs=args.jobs, memory=not args.no_memory)
+    for phase, metrics in results.items():
+        peak = f"{metrics['peak_mb']:8.1f} MB" if "peak_mb" in metrics else ""
+        print(f"  {phase:<24} {metrics['seconds'] * 1000:9.1f} ms  {peak}")
+
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+    except (OSError, ValueError):
+        baselines = {}
+    key = f"{args.profile}:{json.dumps(dataclasses.asdict(shape), sort_keys=True)}"
+
+    if args.save_baseline:
+        baselines[key] = results
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if key not in baselines:
+        print(f"No baseline for this shape in {args.baseline}; record one with --save-baseline")
+        return 0
+    regressions = compare_to_baseline(results, baselines[key], args.tolerance)
+    for line in regressions:
+        print(f"  ❌ {line}")
+    print("✅ Within baseline" if not regressions else f"{len(regressions)} regression(s) against the baseline")
+    return 1 if regressions else 0
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark DeepWiki generator stages")
+    parser.add_argument("--modules-root", default=gma.MODULES_ROOT, help="Modules tree to benchmark against")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions; the best time is reported")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    sub.add_parser("lexer", help="scan_hcl_blocks vs the legacy regex + brace scanner").set_defaults(func=bench_lexer)
+    sub.add_parser("references", help="indexed reference resolution vs the legacy four-regex resolver").set_defaults(
+        func=bench_references
+    )
+    sub.add_parser("variables", help="fast variable/output loader vs python-hcl2").set_defaults(func=bench_variables)
+    graph = sub.add_parser("graph", help="SCC condensation + transitive reduction on a synthetic graph")
+    graph.add_argument("--nodes", type=int, default=10000)
+    graph.add_argument("--edges", type=int, default=50000)
+    graph.set_defaults(func=bench_graph)
+    memory = sub.add_parser("memory", help="records vs dicts for blocks and cached scans on a synthetic repository")
+    memory.add_argument("--profile", choices=sorted(synthetic_repo.PROFILES), default="large")
+    memory.set_defaults(func=bench_memory)
+
+    suite = sub.add_parser("suite", help="time every generator phase on a synthetic CAF-shaped repository")
+    suite.add_argument("--profile", choices=sorted(synthetic_repo.PROFILES), default="small")
+    for field in ("categories", "modules", "blocks", "variables", "dot_modules", "dot_edges"):
+        suite.add_argument(f"--{field.replace('_', '-')}", dest=field, type=int, help="Override the profile")
+    suite.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for module scanning")
+    suite.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    suite.add_argument(
+        "--baseline",
+        default=os.path.join(gma.default_cache_dir(), "benchmark-baselines.json"),
+        help="Baseline file (default: <repo>/.deepwiki-cache/benchmark-baselines.json)",
+    )
+    suite.add_argument("--save-baseline", action="store_true", help="Record these results as the baseline")
+    suite.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown/growth as a fraction")
+    suite.set_defaults(func=bench_suite)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv if argv is not None else sys.argv[1:])
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""Catalog database (``.deepwiki-cache/catalog.sqlite``) and the ``query`` subcommand.
+
+Every generator run syncs the extracted module data into an indexed SQLite
+file, so questions such as "which modules declare this resource type" are
+answered without parsing the repository again:
+
+    python scripts/deepwiki/generate_mkdocs_auto.py query resource azurerm_private_endpoint
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+
+if TYPE_CHECKING:
+    import sqlite3
+
+CATALOG_FILENAME = "catalog.sqlite"
+# Bump whenever CATALOG_SCHEMA changes; older catalogs are rebuilt from scratch
+CATALOG_VERSION = "1"
+CATALOG_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE modules (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, category TEXT NOT NULL, path TEXT NOT NULL, key TEXT NOT NULL
+);
+CREATE TABLE resources (module_id INTEGER NOT NULL REFERENCES modules(id) ON DELETE CASCADE, type TEXT NOT NULL);
+CREATE TABLE variables (
+    module_id INTEGER NOT NULL REFERENCES modules(id) ON DELETE CASCADE, name TEXT NOT NULL, type TEXT,
+    default_value TEXT, required TEXT, description TEXT
+);
+CREATE TABLE outputs (
+    module_id INTEGER NOT NULL REFERENCES modules(id) ON DELETE CASCADE, name TEXT NOT NULL, value TEXT,
+    sensitive TEXT, description TEXT
+);
+CREATE TABLE edges (module_id INTEGER NOT NULL REFERENCES modules(id) ON DELETE CASCADE, src TEXT, dst TEXT);
+CREATE TABLE remote_objects (module_id INTEGER NOT NULL REFERENCES modules(id) ON DELETE CASCADE, key TEXT NOT NULL);
+CREATE TABLE root_modules (name TEXT PRIMARY KEY, file TEXT NOT NULL, source TEXT NOT NULL);
+CREATE TABLE module_edges (src TEXT NOT NULL, dst TEXT NOT NULL, PRIMARY KEY (src, dst));
+CREATE INDEX resources_type ON resources(type);
+CREATE INDEX resources_module ON resources(module_id);
+CREATE INDEX variables_name ON variables(name);
+CREATE INDEX variables_module ON variables(module_id);
+CREATE INDEX outputs_name ON outputs(name);
+CREATE INDEX outputs_module ON outputs(module_id);
+CREATE INDEX edges_module ON edges(module_id);
+CREATE INDEX remote_objects_key ON remote_objects(key);
+CREATE INDEX remote_objects_module ON remote_objects(module_id);
+CREATE INDEX root_modules_source ON root_modules(source);
+CREATE INDEX module_edges_dst ON module_edges(dst);
+"""
+
+# Modules matching ?1 by folder ("networking/vnet"), root call ("module.vnet") or call name ("vnet")
+_CATALOG_TARGETS = (
+    "SELECT name FROM root_modules WHERE name = ?1 OR name = 'module.' || ?1 OR source = ?1 UNION SELECT ?1"
+)
+# name -> (description, SQL taking the search term as ?1; GLOB wildcards allowed where noted)
+CATALOG_QUERIES: Dict[str, Tuple[str, str]] = {
+    "resource": (
+        "modules declaring a resource type (wildcards allowed)",
+        "SELECT DISTINCT m.name AS module, r.type AS resource FROM resources r "
+        "JOIN modules m ON m.id = r.module_id WHERE r.type GLOB ?1 ORDER BY 1, 2",
+    ),
+    "variable": (
+        "modules taking a variable (wildcards allowed)",
+        "SELECT m.name AS module, v.name AS variable, v.type, v.required, v.default_value AS \"default\" "
+        "FROM variables v JOIN modules m ON m.id = v.module_id WHERE v.name GLOB ?1 ORDER BY 1, 2",
+    ),
+    "output": (
+        "modules exposing an output (wildcards allowed)",
+        "SELECT m.name AS module, o.name AS output, o.value FROM outputs o "
+        "JOIN modules m ON m.id = o.module_id WHERE o.name GLOB ?1 ORDER BY 1, 2",
+    ),
+    "remote-object": (
+        "modules reading var.remote_objects.<key> (wildcards allowed)",
+        "SELECT m.name AS module, o.key AS remote_object FROM remote_objects o "
+        "JOIN modules m ON m.id = o.module_id WHERE o.key GLOB ?1 ORDER BY 1, 2",
+    ),
+    "dependents": (
+        "root module calls that depend on a module (folder, module.<name> or <name>)",
+        "SELECT DISTINCT e.src AS dependent, COALESCE(r.source, '') AS folder FROM module_edges e "
+        f"LEFT JOIN root_modules r ON r.name = e.src WHERE e.dst IN ({_CATALOG_TARGETS}) ORDER BY 1",
+    ),
+    "dependencies": (
+        "root module calls a module depends on (folder, module.<name> or <name>)",
+        "SELECT DISTINCT e.dst AS dependency, COALESCE(r.source, '') AS folder FROM module_edges e "
+        f"LEFT JOIN root_modules r ON r.name = e.dst WHERE e.src IN ({_CATALOG_TARGETS}) ORDER BY 1",
+    ),
+    "callers": (
+        "root module calls and files using a module folder (wildcards allowed)",
+        "SELECT name AS call, file, source AS folder FROM root_modules WHERE source GLOB ?1 ORDER BY 1",
+    ),
+}
+
+
+def default_catalog_path(cache_dir: str = "") -> str:
+    return os.path.join(cache_dir or gma.default_cache_dir(), CATALOG_FILENAME)
+
+
+class Catalog:
+    """Indexed SQLite copy of everything extracted from the repository, for ``query``.
+
+    Rows are keyed by the same module content hash as the incremental cache,
+    so ``update_modules()`` only rewrites modules whose ``.tf`` files changed.
+    """
+
+    def __init__(self, path: str):
+        import sqlite3
+
+        self.path = path
+        gma.ensure_dir(os.path.dirname(path) or ".")
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        try:
+            version = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.DatabaseError:
+            version = None
+        if version != (f"{CATALOG_VERSION}/{gma.GENERATOR_VERSION}",):
+            self._create()
+
+    def _create(self):
+        import sqlite3
+
+        self.db.close()
+        for suffix in ("", "-journal"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        with self.db:
+            self.db.executescript(CATALOG_SCHEMA)
+            self.db.execute("INSERT INTO meta VALUES ('version', ?)", (f"{CATALOG_VERSION}/{gma.GENERATOR_VERSION}",))
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def update_modules(self, entries: Dict[str, Dict[str, Any]], names: Optional[Set[str]] = None) -> int:
+        """Sync the module tables with ``{"category/module": {"key", "data"}}``; returns modules rewritten.
+
+        With ``names``, only those modules are rewritten or deleted; the rest are kept.
+        """
+        stored = dict(self.db.execute("SELECT name, key FROM modules"))
+        changed = 0
+        with self.db:
+            for name in (stored.keys() - entries.keys()) & (stored.keys() if names is None else names):
+                self.db.execute("DELETE FROM modules WHERE name = ?", (name,))
+            for name, entry in sorted(entries.items()):
+                if stored.get(name) == entry["key"]:
+                    continue
+                data = entry["data"]
+                self.db.execute("DELETE FROM modules WHERE name = ?", (name,))
+                module_id = self.db.execute(
+                    "INSERT INTO modules (name, category, path, key) VALUES (?, ?, ?, ?)",
+                    (name, name.split("/")[0], f"modules/{name}", entry["key"]),
+                ).lastrowid
+                self.db.executemany("INSERT INTO resources VALUES (?, ?)",
+                                    [(module_id, t) for t in data["resource_types"]])
+                self.db.executemany("INSERT INTO variables VALUES (?, ?, ?, ?, ?, ?)", [
+                    (module_id, v.name, v.type, v.default, v.required, v.description)
+                    for v in data["variables"]
+                ])
+                self.db.executemany("INSERT INTO outputs VALUES (?, ?, ?, ?, ?)", [
+                    (module_id, o.name, o.value, o.sensitive, o.description) for o in data["outputs"]
+                ])
+                self.db.executemany("INSERT INTO edges VALUES (?, ?, ?)", [(module_id, s, d) for s, d in data["edges"]])
+                self.db.executemany("INSERT INTO remote_objects VALUES (?, ?)",
+                                    [(module_id, key) for key in data["remote_objects"]])
+                changed += 1
+        return changed
+
+    def update_root(self, dot_file: str) -> bool:
+        """Refresh root module calls and module-level edges when root files or graph.dot changed."""
+        root_key = gma.content_hash([os.path.join(gma.REPO_ROOT, fn) for fn in gma.root_tf_files()])
+        try:
+            st = os.stat(dot_file)
+            dot_key = f"{st.st_size}:{st.st_mtime_ns}"
+        except FileNotFoundError:
+            dot_key = ""
+        if (self._meta("root_key"), self._meta("dot_key")) == (root_key, dot_key):
+            return False
+        with self.db:
+            if self._meta("root_key") != root_key:
+                self.db.execute("DELETE FROM root_modules")
+                self.db.executemany("INSERT INTO root_modules VALUES (?, ?, ?)", [
+                    (name, fn, source) for name, (fn, source) in sorted(gma.root_module_sources().items())
+                ])
+            if self._meta("dot_key") != dot_key:
+                self.db.execute("DELETE FROM module_edges")
+                if dot_key:
+                    _, mod_edges = gma.aggregate_module_edges(gma.iter_dot_file_edges(dot_file))
+                    self.db.executemany("INSERT INTO module_edges VALUES (?, ?)", mod_edges)
+            self.db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                [("root_key", root_key), ("dot_key", dot_key)])
+        return True
+
+    def close(self):
+        self.db.close()
+
+
+def run_catalog_query(db: "sqlite3.Connection", kind: str, term: str) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+    """Run a CATALOG_QUERIES entry (or raw SQL for ``kind == "sql"``); returns ``(columns, rows)``."""
+    statement, params = (term, ()) if kind == "sql" else (CATALOG_QUERIES[kind][1], (term,))
+    cursor = db.execute(statement, params)
+    return [column[0] for column in cursor.description or ()], cursor.fetchall()
+
+
+def format_rows(columns: List[str], rows: List[Tuple[Any, ...]], max_width: int = 60) -> str:
+    """Plain-text table with one line per row; long or multi-line cells are shortened."""
+    def cell(value: Any) -> str:
+        text = " ".join(str("" if value is None else value).split())
+        return text if len(text) <= max_width else text[:max_width - 1] + "…"
+
+    table = [columns] + [[cell(value) for value in row] for row in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(line, widths)).rstrip() for line in table]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def query_main(argv: List[str]) -> int:
+    """``query`` subcommand: answer questions from the catalog without parsing the repository."""
+    parser = argparse.ArgumentParser(
+        prog="generate_mkdocs_auto.py query",
+        description="Query the catalog written by the last generator run",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="queries:\n" + "\n".join(f"  {name:<15} {text}" for name, (text, _) in sorted(CATALOG_QUERIES.items()))
+        + "\n  sql             a read-only SQL statement (tables: " + ", ".join(
+            re.findall(r"CREATE TABLE (\w+)", CATALOG_SCHEMA)) + ")",
+    )
+    parser.add_argument("kind", choices=sorted(CATALOG_QUERIES) + ["sql"], metavar="QUERY",
+                        help="One of: " + ", ".join(sorted(CATALOG_QUERIES) + ["sql"]))
+    parser.add_argument("term", help="Name or GLOB pattern to look up, or the SQL statement")
+    parser.add_argument("--catalog", default="",
+                        help=f"Catalog file (default: <repo>/{gma.CACHE_DIRNAME}/{CATALOG_FILENAME})")
+    parser.add_argument("--json", action="store_true", help="Print rows as a JSON list of objects")
+    args = parser.parse_args(argv)
+
+    path = args.catalog or default_catalog_path()
+    if not os.path.exists(path):
+        print(f"❌ No catalog at {path}; run the generator first", file=sys.stderr)
+        return 2
+    import sqlite3
+
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        columns, rows = run_catalog_query(db, args.kind, args.term)
+    except sqlite3.Error as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 2
+    finally:
+        db.close()
+    if args.json:
+        print(json.dumps([dict(zip(columns, row)) for row in rows], indent=2))
+    elif rows:
+        print(format_rows(columns, rows))
+    else:
+        print("No matches.", file=sys.stderr)
+    return 0 if rows else 1
@@ -1,18 +1,23 @@
 
 import argparse
+import contextlib
+import functools
+import hashlib
+import importlib.util
 import json
+import marshal
 import os
 import re
 import sys
-import subprocess
-from typing import List, Tuple, Dict, Any
+import threading
+import time
+import zlib
+from typing import TYPE_CHECKING, List, Tuple, Dict, Any, Container, Iterable, Iterator, NamedTuple, Optional, Set
 
-try:
-    import hcl2
-except ImportError as exc:  # pragma: no cover - import guard
-    raise SystemExit(
-        "python-hcl2 is required. Install it with 'pip install python-hcl2'."
-    ) from exc
+if TYPE_CHECKING:  # Feature modules import this one; the generator imports them where they are used
+    from scripts.deepwiki.catalog import Catalog
+    from scripts.deepwiki.remote_objects import RemoteObjectsIndex
+    from scripts.deepwiki.search_index import SearchIndex
 
 
 # -----------------------------
@@ -30,10 +35,48 @@ def ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
-def write(path: str, text: str):
-    ensure_dir(os.path.dirname(path))
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(text)
+# Per-run bookkeeping for write(): status counts and every path produced this run
+WRITE_STATS: Dict[str, int] = {"created": 0, "updated": 0, "unchanged": 0, "removed": 0}
+WRITTEN_PATHS: set = set()
+
+
+def reset_write_stats():
+    for key in WRITE_STATS:
+        WRITE_STATS[key] = 0
+    WRITTEN_PATHS.clear()
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def write(path: str, text: str) -> str:
+    """Write ``text`` only if it differs from what is on disk.
+
+    Leaving identical files untouched keeps their mtime, so MkDocs dirty
+    builds and ``mkdocs serve`` only rebuild pages that really changed.
+    Returns the status: "created", "updated" or "unchanged".
+    """
+    data = text.encode("utf-8")
+    WRITTEN_PATHS.add(os.path.abspath(path))
+    with span("write", "io", path=path):
+        try:
+            size = os.stat(path).st_size
+        except FileNotFoundError:
+            status = "created"
+        else:
+            if size == len(data) and _file_digest(path) == hashlib.sha256(data).hexdigest():
+                status = "unchanged"
+            else:
+                status = "updated"
+        if status != "unchanged":
+            ensure_dir(os.path.dirname(path))
+            with open(path, "wb") as f:
+                f.write(data)
+    WRITE_STATS[status] += 1
+    return status
+
 
 def write_if_absent(path: str, text: str):
     """Write file only if it doesn't already exist (preserve manual edits)."""
@@ -41,6 +84,49 @@ def write_if_absent(path: str, text: str):
         write(path, text)
 
 
+def remove_stale_pages(directory: str, recursive: bool = True, keep: Tuple[str, ...] = (),
+                       suffix: str = ".md") -> List[str]:
+    """Delete generated pages (files ending in ``suffix``) under ``directory`` not written this run.
+
+    Used after a phase has written its complete page set, so pages of deleted
+    modules or root files disappear. Names in ``keep`` are left alone.
+    The walk is bottom-up so folders left empty are removed all the way up.
+    Returns the removed paths.
+    """
+    removed: List[str] = []
+    walk = os.walk(directory, topdown=False) if recursive else [next(os.walk(directory), (directory, [], []))]
+    for root, _dirs, files in walk:
+        for fn in sorted(files):
+            fp = os.path.abspath(os.path.join(root, fn))
+            if fn.endswith(suffix) and fn not in keep and fp not in WRITTEN_PATHS:
+                os.remove(fp)
+                removed.append(fp)
+        if recursive and root != directory and not os.listdir(root):
+            os.rmdir(root)
+    WRITE_STATS["removed"] += len(removed)
+    return removed
+
+
+def remove_page(path: str):
+    """Delete one generated page, and its folders up to ``DOCS_ROOT`` once empty."""
+    if os.path.exists(path):
+        os.remove(path)
+        WRITE_STATS["removed"] += 1
+        folder = os.path.dirname(os.path.abspath(path))
+        docs_root = os.path.abspath(DOCS_ROOT)
+        with contextlib.suppress(OSError):
+            while folder.startswith(docs_root + os.sep):
+                os.rmdir(folder)
+                folder = os.path.dirname(folder)
+
+
+def write_summary() -> str:
+    return (
+        f"Output: {WRITE_STATS['created']} created, {WRITE_STATS['updated']} updated, "
+        f"{WRITE_STATS['unchanged']} unchanged, {WRITE_STATS['removed']} removed"
+    )
+
+
 def clean_module_dot_files(modules_root: str) -> int:
     """
     Remove legacy per-module graph.dot files under modules/**/graph.dot.
@@ -60,122 +146,383 @@ def clean_module_dot_files(modules_root: str) -> int:
     return deleted
 
 
+# -----------------------------
+# Instrumentation (--profile)
+# -----------------------------
+
+DEFAULT_PROFILE_TOP = 10
+
+
+class Tracer:
+    """Collects Chrome trace events ("X" complete events) for ``--profile``.
+
+    Open the exported JSON in chrome://tracing or https://ui.perfetto.dev.
+    Timestamps come from ``time.perf_counter_ns`` (the monotonic clock on
+    Linux), so spans recorded by pool workers line up with the parent's.
+    """
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str, tid: Optional[int], args: Dict[str, Any]):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self.events.append({
+                "name": name, "cat": cat, "ph": "X", "ts": start // 1000, "dur": (end - start) // 1000,
+                "pid": os.getpid(), "tid": threading.get_native_id() if tid is None else tid, "args": args,
+            })
+
+    def drain(self) -> List[Dict[str, Any]]:
+        events, self.events = self.events, []
+        return events
+
+    def extend(self, events: Iterable[Dict[str, Any]]):
+        self.events.extend(events)
+
+    def export(self, path: str):
+        ensure_dir(os.path.dirname(path) or ".")
+        names = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+             "args": {"name": "generator" if pid == os.getpid() else f"worker {pid}"}}
+            for pid in sorted({event["pid"] for event in self.events})
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": names + sorted(self.events, key=lambda e: e["ts"]),
+                       "displayTimeUnit": "ms"}, f)
+
+    def summary(self, top: int = DEFAULT_PROFILE_TOP) -> str:
+        """Phase timings plus the ``top`` modules with the most time spent on them, by step.
+
+        Module time is the sum of its leaf spans ("step" and "subprocess"), so
+        work done in pool workers and on the event loop counts too.
+        """
+        phases = [event for event in self.events if event["cat"] == "phase"]
+        per_module: Dict[str, Dict[str, int]] = {}
+        for event in self.events:
+            module = event["args"].get("module")
+            if module and event["cat"] in ("step", "subprocess"):
+                steps = per_module.setdefault(module, {})
+                steps[event["name"]] = steps.get(event["name"], 0) + event["dur"]
+        lines = ["Phases:"]
+        for event in sorted(phases, key=lambda e: e["ts"]):
+            lines.append(f"  {event['dur'] / 1000:10.1f} ms  {event['name']}")
+        ranked = sorted(per_module.items(), key=lambda item: (-sum(item[1].values()), item[0]))[:top]
+        lines.append(f"Slowest modules (top {len(ranked)} of {len(per_module)}):")
+        for module, steps in ranked:
+            slowest = sorted(steps.items(), key=lambda s: -s[1])[:3]
+            detail = ", ".join(f"{name} {dur / 1000:.1f}" for name, dur in slowest)
+            lines.append(f"  {sum(steps.values()) / 1000:10.1f} ms  {module}  ({detail})")
+        return "\n".join(lines)
+
+
+# Process-wide tracer; None (the default) turns every span into a shared no-op
+_TRACER: Optional[Tracer] = None
+_NO_SPAN = contextlib.nullcontext()
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """Install the tracer used by span() and return the previous one."""
+    global _TRACER
+    previous, _TRACER = _TRACER, tracer
+    return previous
+
+
+def span(name: str, cat: str = "phase", tid: Optional[int] = None, **args):
+    """Time the enclosed block when profiling; otherwise costs one global lookup."""
+    if _TRACER is None:
+        return _NO_SPAN
+    return _TRACER.span(name, cat, tid, args)
+
+
 # -----------------------------
 # Parsing Terraform to a simple graph
 # -----------------------------
 
+def _read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
 def read_tf_from_folder(folder: str) -> str:
-    content = ""
-    for fn in sorted(os.listdir(folder)):
-        if fn.endswith(".tf"):
-            with open(os.path.join(folder, fn), "r", encoding="utf-8", errors="ignore") as f:
-                content += "\n" + f.read()
-    return content
-
-
-def _find_block_body(content: str, start: int) -> Tuple[str, int]:
-    depth = 1
-    i = start
-    while i < len(content):
-        char = content[i]
-        if char == '{':
-            depth += 1
-        elif char == '}':
-            depth -= 1
-            if depth == 0:
-                return content[start:i], i + 1
-        i += 1
-    return content[start:], len(content)
-
-
-def _extract_blocks(content: str) -> List[Dict[str, str]]:
-    pattern = re.compile(r'(resource|module|data)\s+"([^"]+)"(?:\s+"([^"]+)")?\s*\{', re.MULTILINE)
-    blocks: List[Dict[str, str]] = []
-    idx = 0
-    while True:
-        match = pattern.search(content, idx)
-        if not match:
+    return "".join("\n" + _read_text(os.path.join(folder, fn)) for fn in sorted(os.listdir(folder)) if fn.endswith(".tf"))
+
+
+# -----------------------------
+# Single-pass HCL lexer (top-level block spans)
+# -----------------------------
+
+_CODE_SPECIAL = re.compile(r'[{}"#/<]')
+_STRING_SPECIAL = re.compile(r'["\\$%]')
+_PLAIN_STRING = re.compile(r'"[^"\\$%\n]*"')
+_HEREDOC_START = re.compile(r'<<-?([A-Za-z_][A-Za-z0-9_-]*)[ \t]*\r?\n')
+_BLOCK_HEADER = re.compile(
+    r'\s*([A-Za-z_][A-Za-z0-9_-]*)((?:\s*(?:"(?:[^"\\\n]|\\.)*"|[A-Za-z_][A-Za-z0-9_-]*))*)\s*\Z'
+)
+_BLOCK_LABEL = re.compile(r'"((?:[^"\\\n]|\\.)*)"|([A-Za-z_][A-Za-z0-9_-]*)')
+_HEREDOC_END_CACHE: Dict[str, "re.Pattern[str]"] = {}
+
+
+def _heredoc_end(marker: str) -> "re.Pattern[str]":
+    pattern = _HEREDOC_END_CACHE.get(marker)
+    if pattern is None:
+        pattern = re.compile(r'^[ \t]*' + re.escape(marker) + r'[ \t]*\r?$', re.MULTILINE)
+        _HEREDOC_END_CACHE[marker] = pattern
+    return pattern
+
+
+def scan_hcl_blocks(content: str) -> List[Tuple[str, Tuple[str, ...], int, int]]:
+    """Return ``(kind, labels, body_start, body_end)`` for every top-level HCL block.
+
+    One linear pass that jumps between significant characters with a regex.
+    Braces inside string literals, ``${...}``/``%{...}`` templates (including
+    nested strings), heredocs and ``#``, ``//`` and ``/* */`` comments never
+    affect block nesting. ``content[body_start:body_end]`` is the text between
+    the block's braces; an unterminated block runs to the end of the content.
+    """
+    blocks: List[Tuple[str, Tuple[str, ...], int, int]] = []
+    n = len(content)
+    i = 0
+    depth = 0  # brace depth of the current code frame
+    frames: List[int] = []  # saved depths of code frames suspended by ${ / %{ templates
+    in_string = False
+    stmt_start = 0  # start of the current top-level statement header
+    header: Tuple[str, Tuple[str, ...]] = ("", ())
+    body_start = -1
+
+    while i < n:
+        if in_string:
+            m = _STRING_SPECIAL.search(content, i)
+            if m is None:
+                break
+            j = m.start()
+            c = content[j]
+            if c == '"':
+                in_string = False
+                i = j + 1
+            elif c == '\\':
+                i = j + 2
+            elif content.startswith(c, j + 1):  # $$ / %% escapes
+                i = j + 2
+            elif content.startswith('{', j + 1):
+                frames.append(depth)
+                depth = 0
+                in_string = False
+                i = j + 2
+            else:
+                i = j + 1
+            continue
+
+        m = _CODE_SPECIAL.search(content, i)
+        if m is None:
             break
-        kind = match.group(1)
-        primary = match.group(2)
-        secondary = match.group(3)
-        body, end_idx = _find_block_body(content, match.end())
-
-        if kind == "resource":
-            if not secondary:
-                idx = end_idx
-                continue
-            node = f"{primary}.{secondary}"
-        elif kind == "data":
-            if not secondary:
-                idx = end_idx
-                continue
-            node = f"data.{primary}.{secondary}"
-        else:  # module
-            node = f"module.{primary}"
+        j = m.start()
+        c = content[j]
+        top = depth == 0 and not frames
+        if c == '{':
+            if top:
+                hm = _BLOCK_HEADER.match(content, stmt_start, j)
+                if hm:
+                    labels = tuple(a or b for a, b in _BLOCK_LABEL.findall(hm.group(2)))
+                    header = (hm.group(1), labels)
+                else:
+                    header = ("", ())
+                body_start = j + 1
+            depth += 1
+            i = j + 1
+        elif c == '}':
+            if depth == 0 and frames:
+                depth = frames.pop()
+                in_string = True
+            elif depth > 0:
+                depth -= 1
+                if depth == 0 and not frames:
+                    if header[0]:
+                        blocks.append((header[0], header[1], body_start, j))
+                    stmt_start = j + 1
+            i = j + 1
+        elif c == '"':
+            sm = _PLAIN_STRING.match(content, j)
+            if sm:  # fast path: no escapes or templates
+                i = sm.end()
+            else:
+                in_string = True
+                i = j + 1
+        elif c == '#' or content.startswith('//', j):
+            nl = content.find('\n', j)
+            i = n if nl < 0 else nl + 1
+            if top:
+                stmt_start = i
+        elif content.startswith('/*', j):
+            close = content.find('*/', j + 2)
+            i = n if close < 0 else close + 2
+            if top:
+                stmt_start = i
+        elif c == '<':
+            hm = _HEREDOC_START.match(content, j)
+            if hm:
+                em = _heredoc_end(hm.group(1)).search(content, hm.end())
+                i = n if em is None else em.end()
+            else:
+                i = j + 1
+        else:
+            i = j + 1
+
+    if depth > 0 and not frames and body_start >= 0 and header[0]:
+        blocks.append((header[0], header[1], body_start, n))
+    return blocks
+
+
+class Block(NamedTuple):
+    """A resource/data/module block that becomes a dependency graph node.
+
+    The body is not copied out of the file: ``source[start:end]`` is the text
+    between the block's braces, and the whole file stays shared by its blocks.
+    """
+
+    kind: str
+    node: str
+    source: str
+    start: int
+    end: int
 
-        blocks.append({"kind": kind, "node": node, "body": body})
-        idx = end_idx
+    @property
+    def body(self) -> str:
+        return self.source[self.start:self.end]
 
+
+def _extract_blocks(content: str) -> List[Block]:
+    return _blocks_from_spans(content, scan_hcl_blocks(content))
+
+
+def _blocks_from_spans(content: str, spans: List[Tuple[str, Tuple[str, ...], int, int]]) -> List[Block]:
+    """Keep the resource/data/module spans that become dependency graph nodes."""
+    blocks: List[Block] = []
+    for kind, labels, body_start, body_end in spans:
+        if kind == "resource" and len(labels) >= 2:
+            node = f"{labels[0]}.{labels[1]}"
+        elif kind == "data" and len(labels) >= 2:
+            node = f"data.{labels[0]}.{labels[1]}"
+        elif kind == "module" and labels:
+            node = f"module.{labels[0]}"
+        else:
+            continue
+        blocks.append(Block(sys.intern(kind), sys.intern(node), content, body_start, body_end))
     return blocks
 
 
 def extract_dependencies_from_content(content: str):
-    blocks = _extract_blocks(content)
-    nodes = {block["node"] for block in blocks}
+    return extract_dependencies_from_blocks(_extract_blocks(content))
+
+
+# Start of a reference traversal: first three dotted parts, not preceded by an identifier or dot
+_REFERENCE = re.compile(r'(?<![A-Za-z0-9_.])([A-Za-z0-9_]+)\.([A-Za-z0-9_]+)(?:\.([A-Za-z0-9_]+))?')
+_NON_RESOURCE_ROOTS = frozenset({"var", "local", "each", "toset", "try", "coalesce", "path", "lookup", "length"})
+
+
+def extract_dependencies_from_blocks(blocks: List[Block]):
+    """Resolve references between blocks in one tokenized pass per block body.
+
+    Each traversal (``module.x``, ``data.t.n``, ``type.name``,
+    ``var.remote_objects.key``) is looked up in the node index directly, and
+    remote_objects edges are collected in the same pass, so the cost is linear
+    in the total body size regardless of how many nodes or remotes exist.
+    Bodies are scanned in place in the file text, and edges reuse the node
+    strings instead of the ones built for each lookup.
+    """
+    nodes = {block.node: block.node for block in blocks}
     edges = set()
-    
     # Track remote_objects dependencies (external/implicit)
-    remote_deps = set()
+    remote_nodes = set()
 
     for block in blocks:
-        body = block["body"]
-        source = block["node"]
-
-        # Module references
-        for module_name in re.findall(r'module\.([A-Za-z0-9_]+)', body):
-            target = f"module.{module_name}"
-            if target in nodes and target != source:
-                edges.add((source, target))
-
-        # Data source references
-        for data_type, data_name in re.findall(r'data\.([A-Za-z0-9_]+)\.([A-Za-z0-9_]+)', body):
-            target = f"data.{data_type}.{data_name}"
-            if target in nodes and target != source:
+        source = block.node
+        for root, second, third in _REFERENCE.findall(block.source, block.start, block.end):
+            if root == "var":
+                # Remote objects dependencies (CAF pattern): var.remote_objects.<key>
+                if second == "remote_objects" and third:
+                    target = sys.intern(f"remote:{third}")
+                    remote_nodes.add(target)
+                    edges.add((source, target))
+                continue
+            if root in _NON_RESOURCE_ROOTS:
+                continue
+            if root == "data":
+                target = nodes.get(f"data.{second}.{third}") if third else None
+            else:
+                # Covers module.<name> as well as <resource_type>.<name>
+                target = nodes.get(f"{root}.{second}")
+            if target is not None and target != source:
                 edges.add((source, target))
 
-        # Resource references
-        for res_type, res_name in re.findall(r'([A-Za-z0-9_]+)\.([A-Za-z0-9_]+)', body):
-            if res_type in {"var", "local", "each", "toset", "try", "coalesce", "path", "lookup", "length"}:
-                continue
-            candidate = f"{res_type}.{res_name}"
-            if candidate in nodes and candidate != source:
-                edges.add((source, candidate))
-        
-        # Remote objects dependencies (CAF pattern)
-        # Captures: var.remote_objects.resource_type or var.remote_objects.resource_types
-        for remote_obj in re.findall(r'var\.remote_objects\.([A-Za-z0-9_]+)', body):
-            remote_deps.add(f"remote:{remote_obj}")
-    
-    # Add remote_objects as virtual nodes if any dependencies found
-    if remote_deps:
-        nodes = nodes.union(remote_deps)
-        for remote_node in remote_deps:
-            # Find all sources that reference this remote object
-            for block in blocks:
-                if f"var.remote_objects.{remote_node[7:]}" in block["body"]:
-                    edges.add((block["node"], remote_node))
-
-    return nodes, sorted(edges)
+    return set(nodes) | remote_nodes, sorted(edges)
 
 
 def extract_dependencies_path(path: str):
     if os.path.isdir(path):
-        content = read_tf_from_folder(path)
-    else:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
-    return extract_dependencies_from_content(content)
+        return ModuleScan(path).dependencies()
+    return extract_dependencies_from_content(_read_text(path))
+
+
+_REMOTE_OBJECT_KEY = re.compile(r"\bremote_objects\.([A-Za-z_][\w-]*)")
+
+
+class ModuleScan:
+    """One module folder, read once and shared by every extractor.
+
+    Each top-level ``.tf`` file is read exactly once and lexed into block spans
+    lazily; dependencies, resource types, variables, outputs and the source
+    listing are all served from that single scan.
+    """
+
+    OUTPUT_FILES = ("outputs.tf", "output.tf")
+
+    def __init__(self, path: str):
+        self.path = path
+        with os.scandir(path) as entries:
+            names = sorted(e.name for e in entries if e.name.endswith(".tf") and e.is_file())
+        self.files: Dict[str, str] = {fn: _read_text(os.path.join(path, fn)) for fn in names}
+        self._spans: Dict[str, List[Tuple[str, Tuple[str, ...], int, int]]] = {}
+
+    def sources(self) -> List[str]:
+        return list(self.files)
+
+    def spans(self, fn: str) -> List[Tuple[str, Tuple[str, ...], int, int]]:
+        spans = self._spans.get(fn)
+        if spans is None:
+            spans = self._spans[fn] = scan_hcl_blocks(self.files[fn])
+        return spans
+
+    def dependencies(self):
+        blocks: List[Block] = []
+        for fn, text in self.files.items():
+            blocks.extend(_blocks_from_spans(text, self.spans(fn)))
+        return extract_dependencies_from_blocks(blocks)
+
+    def resource_types(self) -> List[str]:
+        types = set()
+        for fn in self.files:
+            for kind, labels, _, _ in self.spans(fn):
+                if kind == "resource" and len(labels) >= 2:
+                    types.add(sys.intern(labels[0]))
+        return sorted(types)
+
+    def variables(self) -> List["Variable"]:
+        text = self.files.get("variables.tf")
+        return parse_variables(text) if text is not None else []
+
+    def outputs(self) -> List["Output"]:
+        for fn in self.OUTPUT_FILES:
+            if fn in self.files:
+                return parse_outputs(self.files[fn])
+        return []
+
+    def remote_objects(self) -> List[str]:
+        """Keys of ``var.remote_objects`` the module reads (``remote_objects.<key>``)."""
+        return sorted({key for text in self.files.values() for key in _REMOTE_OBJECT_KEY.findall(text)})
 
 
 def mermaid_block(nodes, edges):
@@ -188,44 +535,613 @@ def mermaid_block(nodes, edges):
     return lines
 
 
+_MODULE_ADDRESS = re.compile(r"(module\.[a-zA-Z0-9_]+)(?:\..*)?")
+
+
 def _module_of_address(address: str) -> str:
     """Return top-level module path for a Terraform address or 'root' if none.
     Examples:
       module.frontend.module.routes.azurerm_cdn_frontdoor_route.r -> module.frontend
       azurerm_resource_group.rg -> root
     """
-    m = re.match(r"(module\.[a-zA-Z0-9_]+)(?:\..*)?", address)
+    m = _MODULE_ADDRESS.match(address)
     return m.group(1) if m else "root"
 
 
-def parse_dot_module_edges(dot_text: str) -> Tuple[List[str], List[Tuple[str, str]]]:
-    """Aggregate Terraform DOT graph edges to module-level dependencies.
-    Returns (modules, edges) where modules is a sorted unique list and edges a unique list of tuples.
+# Terraform DOT edge statement: "src" -> "dst" at the start of a line (attributes ignored)
+_DOT_EDGE = re.compile(rb'^[^\S\n]*"([^"\n]+)"[^\S\n]*->[^\S\n]*"([^"\n]+)"', re.MULTILINE)
+
+DEFAULT_PAGE_BUDGET_KB = 256
+DEFAULT_NEIGHBORHOOD_HOPS = 1
+# Mermaid's default maxEdges; larger flowcharts are not rendered at all
+MERMAID_MAX_EDGES = 500
+# The two roles of the aggregated "root" node in module diagrams (see split_root)
+ROOT_CONSUMERS = "root (consumers)"
+ROOT_PROVIDERS = "root (providers)"
+
+
+def iter_dot_edges(buffer) -> Iterator[Tuple[str, str]]:
+    """Yield ``(src, dst)`` node addresses for every edge in a DOT bytes-like buffer."""
+    for m in _DOT_EDGE.finditer(buffer):
+        yield m.group(1).decode("utf-8", "ignore"), m.group(2).decode("utf-8", "ignore")
+
+
+def iter_dot_file_edges(path: str) -> Iterator[Tuple[str, str]]:
+    """Stream the edges of a DOT file through a read-only memory map."""
+    import mmap
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from iter_dot_edges(buffer)
+
+
+def aggregate_module_edges(
+    edges: Iterable[Tuple[str, str]], subgraphs: Optional[Dict[str, List[Tuple[str, str]]]] = None
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Collapse resource-level edges to module-level ones.
+
+    When ``subgraphs`` is given, every resource edge is also appended to the
+    list of each module it touches.
     """
-    node_edge_re = re.compile(r'\s*"([^"]+)"\s*->\s*"([^"]+)"')
     modules: set[str] = set()
     mod_edges: set[Tuple[str, str]] = set()
+    module_of: Dict[str, str] = {}
 
-    for line in dot_text.splitlines():
-        m = node_edge_re.match(line)
-        if not m:
-            continue
-        src_addr, dst_addr = m.group(1), m.group(2)
-        src_mod = _module_of_address(src_addr)
-        dst_mod = _module_of_address(dst_addr)
+    for src_addr, dst_addr in edges:
+        src_mod = module_of.get(src_addr) or module_of.setdefault(src_addr, _module_of_address(src_addr))
+        dst_mod = module_of.get(dst_addr) or module_of.setdefault(dst_addr, _module_of_address(dst_addr))
         modules.add(src_mod)
         modules.add(dst_mod)
         if src_mod != dst_mod:
             mod_edges.add((src_mod, dst_mod))
+        if subgraphs is not None:
+            subgraphs.setdefault(src_mod, []).append((src_addr, dst_addr))
+            if dst_mod != src_mod:
+                subgraphs.setdefault(dst_mod, []).append((src_addr, dst_addr))
 
     # Ensure stable ordering
     return sorted(modules), sorted(mod_edges)
 
 
-def generate_root_dependency_map(create_dot: bool = False, update_dot: bool = False) -> Tuple[str, str]:
+def parse_dot_module_edges(dot_text: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Aggregate Terraform DOT graph edges to module-level dependencies.
+    Returns (modules, edges) where modules is a sorted unique list and edges a unique list of tuples.
+    """
+    return aggregate_module_edges(iter_dot_edges(dot_text.encode("utf-8")))
+
+
+# -----------------------------
+# Graph reduction (module dependency diagrams)
+# -----------------------------
+
+def strongly_connected_components(nodes: Iterable[str], successors: Dict[str, List[str]]) -> List[List[str]]:
+    """Tarjan's algorithm, iterative; components come out in reverse topological order (sinks first)."""
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: set = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors.get(root, ())))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors.get(child, ()))))
+                    break
+                if child in on_stack and index[child] < lowlink[node]:
+                    lowlink[node] = index[child]
+            else:
+                work.pop()
+                if work and lowlink[node] < lowlink[work[-1][0]]:
+                    lowlink[work[-1][0]] = lowlink[node]
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+    return components
+
+
+def reduce_graph(nodes: Iterable[str], edges: Iterable[Tuple[str, str]]
+                 ) -> Tuple[Dict[str, List[str]], List[Tuple[str, str]]]:
+    """Condense cycles and drop transitively implied edges.
+
+    Strongly connected components become single nodes, and of the resulting
+    DAG only the edges not implied by a longer path are kept. Returns
+    ``(members, edges)``: ``members`` maps every reduced node label to the
+    original nodes it stands for.
+    """
+    edges = list(edges)
+    all_nodes = sorted(set(nodes).union(*edges))
+    successors: Dict[str, List[str]] = {}
+    for src, dst in edges:
+        if src != dst:
+            successors.setdefault(src, []).append(dst)
+
+    components = strongly_connected_components(all_nodes, successors)
+    # Topological position of every component; bit i of a reach mask stands for component i
+    topo = len(components) - 1
+    position: Dict[str, int] = {}
+    labels = ["" for _ in components]
+    members: Dict[str, List[str]] = {}
+    for i, component in enumerate(components):
+        for node in component:
+            position[node] = topo - i
+        label = " + ".join(component) if len(component) <= 3 else f"{component[0]} + …"
+        labels[topo - i] = label
+        members[label] = component
+
+    children: List[set] = [set() for _ in components]
+    for src, targets in successors.items():
+        for dst in targets:
+            if position[src] != position[dst]:
+                children[position[src]].add(position[dst])
+
+    # Reachability bitsets, sinks first; an edge u -> v is kept only if no
+    # closer child of u already reaches v (children visited in topological order)
+    reach = [0] * len(components)
+    reduced: List[Tuple[str, str]] = []
+    for u in range(len(components) - 1, -1, -1):
+        covered = 0
+        for v in sorted(children[u]):
+            if not (covered >> v) & 1:
+                reduced.append((labels[u], labels[v]))
+            covered |= (1 << v) | reach[v]
+        reach[u] = covered
+    return members, sorted(reduced)
+
+
+def group_graph(members: Dict[str, List[str]], edges: Iterable[Tuple[str, str]], groups: Dict[str, str]
+                ) -> Tuple[Dict[str, List[str]], List[Tuple[str, str]]]:
+    """Collapse a reduced graph onto ``groups`` (node -> group name).
+
+    A reduced node joins a group when all its members belong to it. Edges
+    between groups are kept even when they form cycles; edges inside a group
+    disappear.
+    """
+    group_of: Dict[str, str] = {}
+    grouped: Dict[str, List[str]] = {}
+    for label, nodes in members.items():
+        names = {groups.get(node) for node in nodes}
+        group = names.pop() if len(names) == 1 and None not in names else None
+        group_of[label] = group or label
+        grouped.setdefault(group_of[label], []).extend(nodes)
+    grouped_edges = {(group_of[src], group_of[dst]) for src, dst in edges}
+    return ({label: sorted(nodes) for label, nodes in grouped.items()},
+            sorted((src, dst) for src, dst in grouped_edges if src != dst))
+
+
+def split_root(edges: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Give the aggregated ``root`` node separate consumer and provider sides.
+
+    Top-level resources both use module outputs and feed module inputs; as a
+    single node they close a cycle through most modules, which condensation
+    would merge into one.
+    """
+    return [(ROOT_CONSUMERS if src == "root" else src, ROOT_PROVIDERS if dst == "root" else dst)
+            for src, dst in edges]
+
+
+def adjacency(edges: Iterable[Tuple[str, str]]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """``(successors, predecessors)`` maps of an edge list."""
+    successors: Dict[str, List[str]] = {}
+    predecessors: Dict[str, List[str]] = {}
+    for src, dst in edges:
+        successors.setdefault(src, []).append(dst)
+        predecessors.setdefault(dst, []).append(src)
+    return successors, predecessors
+
+
+def neighborhood(starts: Iterable[str], graph: Tuple[Dict[str, List[str]], Dict[str, List[str]]], hops: int = 1
+                 ) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Nodes within ``hops`` steps upstream or downstream of ``starts`` and the edges among them.
+
+    ``graph`` comes from ``adjacency()`` so it is built once for all modules.
+    """
+    successors, predecessors = graph
+    selected = set(starts)
+    for neighbors in (successors, predecessors):
+        frontier = set(starts)
+        for _ in range(hops):
+            frontier = {n for f in frontier for n in neighbors.get(f, ())} - selected
+            selected |= frontier
+    nodes = sorted(selected)
+    return nodes, [(src, dst) for src in nodes for dst in successors.get(src, ()) if dst in selected]
+
+
+_MERMAID_UNSAFE = re.compile(r"[^a-zA-Z0-9_]")
+
+
+@functools.lru_cache(maxsize=None)
+def safe_mermaid_id(name: str) -> str:
+    # Replace disallowed characters for Mermaid identifiers
+    ident = _MERMAID_UNSAFE.sub("_", name)
+    # Ensure it doesn't start with a digit
+    if re.match(r"^[0-9]", ident):
+        ident = f"n_{ident}"
+    return ident or "root"
+
+
+def reduced_mermaid(members: Dict[str, List[str]], edges: List[Tuple[str, str]], focus: Iterable[str] = ()) -> str:
+    """Mermaid flowchart of a reduced graph; nodes standing for several modules show their count."""
+    lines = ["```mermaid", "graph LR"]
+    for label, text in _reduced_node_texts(members).items():
+        lines.append(f'    {safe_mermaid_id(label)}["{text}"]')
+    for src, dst in edges:
+        lines.append(f"    {safe_mermaid_id(src)} --> {safe_mermaid_id(dst)}")
+    for label in _focused(members, focus):
+        lines.append(f"    style {safe_mermaid_id(label)} stroke-width:3px")
+    lines.append("```")
+    return "\n".join(lines)
+
+
+def reduced_diagram(page: str, members: Dict[str, List[str]], edges: List[Tuple[str, str]],
+                    focus: Iterable[str] = ()) -> str:
+    """Markdown for a reduced graph on ``page``: inline Mermaid or, with --prerender, an SVG."""
+    focus = list(focus)
+    return embed_diagram(page, reduced_mermaid(members, edges, focus), _reduced_node_texts(members), edges,
+                         direction="LR", focus=_focused(members, focus))
+
+
+def _reduced_node_texts(members: Dict[str, List[str]]) -> Dict[str, str]:
+    return {label: label if len(nodes) == 1 else f"{label} ({len(nodes)})" for label, nodes in sorted(members.items())}
+
+
+def _focused(members: Dict[str, List[str]], focus: Iterable[str]) -> List[str]:
+    focus = set(focus)
+    return [label for label, nodes in sorted(members.items()) if focus.intersection(nodes)]
+
+
+_ROOT_MODULE_SOURCE = re.compile(r'^\s*source\s*=\s*"\./modules/([^"]+?)/?"', re.MULTILINE)
+
+
+def root_module_sources() -> Dict[str, Tuple[str, str]]:
+    """Map root module calls (``module.<name>``) to ``(root file, folder under modules/)``."""
+    sources: Dict[str, Tuple[str, str]] = {}
+    for fn in sorted(os.listdir(REPO_ROOT)):
+        if not fn.endswith(".tf"):
+            continue
+        content = _read_text(os.path.join(REPO_ROOT, fn))
+        for kind, labels, start, end in scan_hcl_blocks(content):
+            if kind == "module" and labels:
+                m = _ROOT_MODULE_SOURCE.search(content, start, end)
+                if m:
+                    sources[f"module.{labels[0]}"] = (fn, m.group(1))
+    return sources
+
+
+def root_module_categories() -> Dict[str, str]:
+    """Map root module calls (``module.<name>``) to their ``modules/<category>`` folder."""
+    return {name: source.split("/")[0] for name, (_, source) in root_module_sources().items()}
+
+
+# -----------------------------
+# HCL attributes and references
+# -----------------------------
+
+_HCL_ATTRIBUTE = re.compile(r'[ \t]*([A-Za-z_][A-Za-z0-9_-]*)[ \t]*=(?!=)')
+_LINE_STRING = re.compile(r'"(?:[^"\\\n]|\\.)*"')
+_LINE_COMMENT = re.compile(r'(?:#|//).*')
+_HCL_COMMENT = re.compile(r'"(?:[^"\\\n]|\\.)*"|(?:#|//)[^\n]*|/\*.*?\*/', re.DOTALL)
+# A traversal's index brackets (one nesting level), as in module.x[each.key].out
+_INDEX = r'(?:\[[^\[\]]*(?:\[[^\[\]]*\][^\[\]]*)*\])?'
+_WIRING_REFERENCE = re.compile(
+    r'(?<![\w.])(module|local|var|data)\.([\w-]+)' + _INDEX + r'(?:\.([\w-]+))?'
+    r'|(?<![\w.])([A-Za-z][\w-]*)\.([\w-]+)'
+)
+
+
+def hcl_attributes(body: str) -> Dict[str, str]:
+    """Top-level ``name = expression`` attributes of a block body (nested blocks are skipped).
+
+    Works line by line, tracking bracket depth outside strings, comments and
+    heredocs, so multi-line expressions stay with their attribute.
+    """
+    attributes: Dict[str, str] = {}
+    name: Optional[str] = None
+    value: List[str] = []
+    depth = 0
+    heredoc = None
+    for line in body.split("\n"):
+        if heredoc is not None:
+            value.append(line)
+            if heredoc.match(line):
+                heredoc = None
+            continue
+        code = _LINE_COMMENT.sub("", _LINE_STRING.sub('""', line))
+        if depth == 0:
+            m = _HCL_ATTRIBUTE.match(code)
+            if name is not None and (m or code.strip()):
+                attributes[name] = "\n".join(value)
+                name = None
+            if m:
+                name, value = m.group(1), [line[m.end():]]
+        elif name is not None:
+            value.append(line)
+        hm = _HEREDOC_START.search(code + "\n")
+        if hm:
+            heredoc = _heredoc_end(hm.group(1))
+        depth = max(0, depth + sum(map(code.count, "([{")) - sum(map(code.count, ")]}")))
+    if name is not None:
+        attributes[name] = "\n".join(value)
+    return attributes
+
+
+def _strip_hcl_comments(text: str) -> str:
+    return _HCL_COMMENT.sub(lambda m: m.group(0) if m.group(0)[0] == '"' else "", text)
+
+
+def wiring_references(text: str, declared: Set[str], whole_modules: bool = False) -> Set[Tuple[str, ...]]:
+    """References in an expression: ``("var"|"local", name)``, ``("resource", address)``,
+    ``("output", call, output)`` and ``("module", call)`` for a whole module call.
+
+    ``declared`` holds the resource and data addresses of the scope; other
+    ``a.b`` traversals (``each.value``, ``path.module``) are ignored. With
+    ``whole_modules`` (``depends_on``) every module reference means the whole call.
+    """
+    references: Set[Tuple[str, ...]] = set()
+    for m in _WIRING_REFERENCE.finditer(_strip_hcl_comments(text)):
+        kind, name, attribute = m.group(1, 2, 3)
+        if kind == "module":
+            references.add(("output", name, attribute) if attribute and not whole_modules else ("module", name))
+        elif kind in ("var", "local"):
+            references.add((kind, name))
+        else:
+            address = (f"data.{name}.{attribute}" if attribute else "") if kind else f"{m.group(4)}.{m.group(5)}"
+            if address in declared:
+                references.add(("resource", address))
+    return references
+
+
+# -----------------------------
+# Optional SVG pre-rendering (--prerender)
+# -----------------------------
+
+DIAGRAMS_DIRNAME = os.path.join("assets", "diagrams")
+DEFAULT_RENDER_TIMEOUT = 60.0
+
+
+def dot_source(nodes: Dict[str, str], edges: Iterable[Tuple[str, str]], direction: str = "TB",
+               focus: Iterable[str] = ()) -> str:
+    """Graphviz DOT for a diagram given as ``{node id: label}`` and id edges."""
+    def quote(text: str) -> str:
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    focus = set(focus)
+    lines = [
+        "digraph G {",
+        f"  rankdir = {direction};",
+        '  node [shape = rect, fontname = "sans-serif"];',
+    ]
+    for node, label in nodes.items():
+        style = ", penwidth = 3" if node in focus else ""
+        lines.append(f"  {quote(node)} [label = {quote(label)}{style}];")
+    for src, dst in edges:
+        lines.append(f"  {quote(src)} -> {quote(dst)};")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+class DiagramRenderer:
+    """Pre-renders diagrams to SVG with Graphviz ``dot`` through a content-hash cache.
+
+    Pages call ``embed()`` while they are generated and get an image reference
+    back; ``finish()`` then renders every new diagram in parallel, copies the
+    SVGs into ``docs/assets/diagrams/`` and puts the inline Mermaid back on
+    pages whose diagram failed to render.
+    """
+
+    def __init__(self, binary: str, version: str, cache_dir: str, jobs: int = 1,
+                 timeout: float = DEFAULT_RENDER_TIMEOUT):
+        self.binary = binary
+        self.version = version
+        self.cache_dir = cache_dir
+        self.jobs = max(1, jobs)
+        self.timeout = timeout
+        self.sources: Dict[str, str] = {}
+        self.embeds: List[Tuple[str, str, str, str]] = []  # (page path, key, image markdown, inline fallback)
+
+    @classmethod
+    def detect(cls, cache_dir: str, jobs: int = 1, binary: str = "dot") -> Optional["DiagramRenderer"]:
+        """Return a renderer if Graphviz is installed, else None."""
+        import shutil
+        import subprocess
+
+        path = shutil.which(binary)
+        if not path:
+            return None
+        try:
+            proc = subprocess.run([path, "-V"], capture_output=True, timeout=DEFAULT_RENDER_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        version = (proc.stderr or proc.stdout).decode("utf-8", "ignore").strip()
+        return cls(path, version, cache_dir, jobs)
+
+    def output_dir(self) -> str:
+        return os.path.join(DOCS_ROOT, DIAGRAMS_DIRNAME)
+
+    def embed(self, page: str, source: str, fallback: str, alt: str = "Dependency diagram") -> str:
+        key = hashlib.sha256(f"{self.version}\0{source}".encode("utf-8")).hexdigest()[:32]
+        self.sources[key] = source
+        svg = os.path.join(self.output_dir(), f"{key}.svg")
+        image = f"![{alt}]({os.path.relpath(svg, os.path.dirname(page)).replace(os.sep, '/')})"
+        self.embeds.append((page, key, image, fallback))
+        return image
+
+    def _render(self, key: str) -> str:
+        """Render one diagram into the cache; returns an error message or ''."""
+        import subprocess
+
+        try:
+            with span("dot -Tsvg", "subprocess", key=key):
+                proc = subprocess.run([self.binary, "-Tsvg"], input=self.sources[key].encode("utf-8"),
+                                      capture_output=True, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            return f"timed out after {self.timeout:g}s"
+        except OSError as exc:
+            return str(exc)
+        if proc.returncode != 0:
+            return proc.stderr.decode("utf-8", "ignore").strip()[-500:] or f"exit code {proc.returncode}"
+        path = os.path.join(self.cache_dir, f"{key}.svg")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        ensure_dir(self.cache_dir)
+        with open(tmp_path, "wb") as f:
+            f.write(proc.stdout)
+        os.replace(tmp_path, path)
+        return ""
+
+    def finish(self) -> Dict[str, str]:
+        """Render missing diagrams, publish all SVGs and return ``{key: error}`` for failures."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        missing = sorted(key for key in self.sources if not os.path.exists(os.path.join(self.cache_dir, f"{key}.svg")))
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            errors = dict(zip(missing, executor.map(self._render, missing)))
+        failures = {key: error for key, error in errors.items() if error}
+
+        for key in sorted(self.sources):
+            if key not in failures:
+                write(os.path.join(self.output_dir(), f"{key}.svg"),
+                      _read_text(os.path.join(self.cache_dir, f"{key}.svg")))
+        # Pages whose diagram could not be rendered keep the inline Mermaid block
+        for page, key, image, fallback in self.embeds:
+            if key in failures:
+                write(page, _read_text(page).replace(image, fallback))
+
+        print(f"Diagrams: {len(missing) - len(failures)} rendered, {len(self.sources) - len(missing)} cached, "
+              f"{len(failures)} failed")
+        for key, error in sorted(failures.items()):
+            print(f"  ❌ {key}: {error.splitlines()[-1] if error else ''}")
+        return failures
+
+
+# Renderer used by embed_diagram(); None keeps diagrams as inline Mermaid
+_RENDERER: Optional[DiagramRenderer] = None
+
+
+def set_diagram_renderer(renderer: Optional[DiagramRenderer]) -> Optional[DiagramRenderer]:
+    """Install the renderer used by embed_diagram(); returns the previous one."""
+    global _RENDERER
+    previous, _RENDERER = _RENDERER, renderer
+    return previous
+
+
+def embed_diagram(page: str, mermaid: str, nodes: Dict[str, str], edges: Iterable[Tuple[str, str]],
+                  direction: str = "TB", focus: Iterable[str] = ()) -> str:
+    """Markdown for a diagram on ``page`` (an absolute path under docs/).
+
+    Returns ``mermaid`` unchanged unless a renderer is installed, in which case
+    the diagram is queued for SVG rendering and an image reference is returned.
+    """
+    if _RENDERER is None:
+        return mermaid
+    return _RENDERER.embed(page, dot_source(nodes, edges, direction, focus), mermaid)
+
+
+def finish_diagrams(prune: bool = True) -> Dict[str, str]:
+    """Render queued diagrams and, with ``prune``, drop SVGs no page references anymore."""
+    failures = _RENDERER.finish() if _RENDERER is not None else {}
+    diagrams_dir = os.path.join(DOCS_ROOT, DIAGRAMS_DIRNAME)
+    if prune and os.path.isdir(diagrams_dir):
+        remove_stale_pages(diagrams_dir, suffix=".svg")
+    return failures
+
+
+def _subgraph_page_name(module: str, part: int) -> str:
+    return f"{module}.md" if part == 1 else f"{module}.part{part}.md"
+
+
+def render_subgraph_pages(module: str, edges: List[Tuple[str, str]], depends_on: List[str], used_by: List[str],
+                          budget: int, diagram: str = "") -> List[Tuple[str, str]]:
+    """Render the DOT subgraph of one module as ``[(file name, markdown)]`` pages.
+
+    Edges are spread over as many parts as needed to keep each page within
+    ``budget`` bytes; every part links to the next one.
+    """
+    def links(names: List[str]) -> str:
+        return "\n".join(f"- [{n}]({_subgraph_page_name(n, 1)})" for n in names) if names else "None."
+
+    first_header = [
+        f"# {module}",
+        "",
+        "[Root dependency map](../dependency_map.md) · [Download the full graph (DOT)](../graph.dot)",
+        "",
+        "## Depends on",
+        links(depends_on),
+        "",
+        "## Used by",
+        links(used_by),
+        "",
+    ]
+    if diagram:
+        first_header += ["## Neighborhood", diagram, ""]
+    first_header += [f"## Terraform graph edges ({len(edges)})"]
+    lines = [f'  "{src}" -> "{dst}";' for src, dst in sorted(edges)]
+
+    # Fixed cost of a page besides its edge lines: header, code fence, digraph wrapper and next-part link
+    footer_reserve = 2 * len(module) + 128
+    pages: List[Tuple[str, str]] = []
+    i = 0
+    while i < len(lines) or not pages:
+        part = len(pages) + 1
+        header = first_header if part == 1 else [
+            f"# {module} (part {part})",
+            "",
+            f"[First part]({_subgraph_page_name(module, 1)}) · [Root dependency map](../dependency_map.md)",
+            "",
+        ]
+        body = ["```dot", f'digraph "{module}" {{']
+        size = len("\n".join(header + body).encode("utf-8")) + footer_reserve
+        start = i
+        while i < len(lines):
+            line_size = len(lines[i].encode("utf-8")) + 1
+            if i > start and size + line_size > budget:
+                break
+            size += line_size
+            i += 1
+        body += lines[start:i] + ["}", "```"]
+        if i < len(lines):
+            body += ["", f"Continued in [part {part + 1}]({_subgraph_page_name(module, part + 1)})."]
+        pages.append((_subgraph_page_name(module, part), "\n".join(header + body) + "\n"))
+    return pages
+
+
+def generate_root_dependency_map(create_dot: bool = False, update_dot: bool = False,
+                                 page_budget: int = DEFAULT_PAGE_BUDGET_KB * 1024,
+                                 collapse_categories: bool = False,
+                                 hops: int = DEFAULT_NEIGHBORHOOD_HOPS,
+                                 static_graph: bool = False) -> Tuple[str, str]:
     """Create root-level terraform graph and a module dependency Mermaid diagram.
-    Returns tuple of (dot_md_block, mermaid_md_block) to embed in a page.
+
+    The DOT file is streamed rather than loaded; instead of being inlined, it is
+    linked as a download and split into per-module subgraph pages under
+    ``docs/root/dependency_map/``, each kept within ``page_budget`` bytes.
+    The overview diagram is reduced (cycles condensed, transitive edges
+    dropped, optionally one node per ``modules/<category>``); each module
+    page gets a reduced diagram of its ``hops``-step neighborhood.
+    With ``static_graph``, or when the DOT file is due but no terraform
+    binary is installed, it is derived by ``static_graph.static_resource_edges()`` instead.
+    Returns tuple of (dot_md_block, mermaid_md_block) embedded in the page.
     """
+    import shutil
+    import subprocess
+
     # Ensure terraform init at repo root when needed
     def ensure_root_init(path: str):
         if not os.path.exists(os.path.join(path, ".terraform")):
@@ -236,65 +1152,388 @@ def generate_root_dependency_map(create_dot: bool = False, update_dot: bool = Fa
                 print(f"Failed to run 'terraform init' at root: {e}")
 
     dot_file = os.path.join(DOCS_ROOT, "root", "graph.dot")
+    subgraph_dir = os.path.join(DOCS_ROOT, "root", "dependency_map")
     ensure_dir(os.path.dirname(dot_file))
     need_graph = update_dot or (create_dot and not os.path.exists(dot_file)) or not os.path.exists(dot_file)
 
-    dot_content = ""
-    if need_graph:
-        ensure_root_init(REPO_ROOT)
-        try:
-            # Write directly to file for traceability
-            subprocess.run("terraform graph -draw-cycles > " + dot_file, cwd=REPO_ROOT, shell=True, check=True)
-        except Exception as e:
-            print(f"Failed to create root graph.dot: {e}")
-
-    # Read DOT content if present
-    if os.path.exists(dot_file):
-        with open(dot_file, "r", encoding="utf-8", errors="ignore") as f:
-            dot_content = f.read().strip()
-
-    dot_block = "\n".join(["```dot", dot_content, "```"]) if dot_content else "No DOT graph available."
-
-    # Build module Mermaid diagram
-    modules, mod_edges = parse_dot_module_edges(dot_content) if dot_content else ([], [])
-
-    def safe_mermaid_id(name: str) -> str:
-        # Replace disallowed characters for Mermaid identifiers
-        ident = re.sub(r"[^a-zA-Z0-9_]", "_", name)
-        # Ensure it doesn't start with a digit
-        if re.match(r"^[0-9]", ident):
-            ident = f"n_{ident}"
-        return ident or "root"
-
-    # Map module names to Mermaid-safe ids
-    id_map = {m: safe_mermaid_id(m) for m in modules}
-
-    mer_lines = ["```mermaid", "graph LR"]
-    for mname in modules:
-        mid = id_map[mname]
-        mer_lines.append(f'    {mid}["{mname}"]')
+    if need_graph and not static_graph and shutil.which("terraform") is None:
+        print("terraform not found; deriving the root graph.dot statically")
+        static_graph = True
+
+    if static_graph:
+        from scripts.deepwiki.static_graph import static_graph_dot, static_resource_edges
+
+        with span("static graph", "stage"):
+            write(dot_file, static_graph_dot(*static_resource_edges()))
+    elif need_graph:
+        with span("terraform graph (root)", "subprocess"):
+            ensure_root_init(REPO_ROOT)
+            try:
+                # Write directly to file for traceability
+                subprocess.run("terraform graph -draw-cycles > " + dot_file, cwd=REPO_ROOT, shell=True, check=True)
+            except Exception as e:
+                print(f"Failed to create root graph.dot: {e}")
+
+    # Stream the DOT file into module-level edges plus per-module resource subgraphs
+    subgraphs: Dict[str, List[Tuple[str, str]]] = {}
+    with span("parse graph.dot", "stage"):
+        modules, mod_edges = (
+            aggregate_module_edges(iter_dot_file_edges(dot_file), subgraphs) if os.path.exists(dot_file) else ([], [])
+        )
+
+    depends_on: Dict[str, List[str]] = {}
+    used_by: Dict[str, List[str]] = {}
     for s, d in mod_edges:
-        sid = id_map[s]
-        did = id_map[d]
-        mer_lines.append(f"    {sid} --> {did}")
-    mer_lines.append("```")
-    mermaid_block_md = "\n".join(mer_lines) if modules else "No module dependencies detected."
+        depends_on.setdefault(s, []).append(d)
+        used_by.setdefault(d, []).append(s)
+    categories: Dict[str, str] = {}
+
+    def diagram_graph(nodes, edges, collapse=False):
+        """Reduced graph, grouped by category when asked or when Mermaid could not draw it otherwise."""
+        members, reduced_edges = reduce_graph(nodes, edges)
+        if not (collapse or len(reduced_edges) > MERMAID_MAX_EDGES):
+            return members, reduced_edges, False
+        if not categories:
+            categories.update(root_module_categories())
+        return group_graph(members, reduced_edges, categories) + (True,)
+
+    diagram_edges = split_root(mod_edges)
+    diagram_adjacency = adjacency(diagram_edges)
+    with span("subgraph pages", "stage", modules=len(modules)):
+        for mname in modules:
+            with span("neighborhood", "step", module=mname):
+                starts = (ROOT_CONSUMERS, ROOT_PROVIDERS) if mname == "root" else (mname,)
+                near_members, near_reduced, _ = diagram_graph(*neighborhood(starts, diagram_adjacency, hops))
+                page = os.path.join(subgraph_dir, _subgraph_page_name(mname, 1))
+                diagram = reduced_diagram(page, near_members, near_reduced, focus=starts) if near_reduced else ""
+            with span("subgraph", "step", module=mname):
+                for filename, page in render_subgraph_pages(
+                    mname, subgraphs.get(mname, []), depends_on.get(mname, []), used_by.get(mname, []), page_budget,
+                    diagram=diagram,
+                ):
+                    write(os.path.join(subgraph_dir, filename), page)
+        if os.path.isdir(subgraph_dir):
+            remove_stale_pages(subgraph_dir)
+
+    if modules:
+        dot_lines = [
+            f"The complete graph is available as a download: [graph.dot](graph.dot) "
+            f"({os.path.getsize(dot_file) / 1e6:.1f} MB).",
+            "",
+            "Resource-level edges per module:",
+            "",
+        ]
+        dot_lines += [
+            f"- [{mname}](dependency_map/{_subgraph_page_name(mname, 1)}) ({len(subgraphs.get(mname, []))} edges)"
+            for mname in modules
+        ]
+        dot_block = "\n".join(dot_lines)
+    else:
+        dot_block = "No DOT graph available."
+
+    with span("reduce overview", "stage"):
+        members, reduced_edges, grouped = diagram_graph([], diagram_edges, collapse_categories)
+    if modules:
+        lines = [
+            reduced_diagram(os.path.join(DOCS_ROOT, "root", "dependency_map.md"), members, reduced_edges),
+            "",
+            f"Reduced from {len(modules)} modules and {len(mod_edges)} edges to {len(members)} nodes and "
+            f"{len(reduced_edges)} edges: dependency cycles are merged into one node and edges implied by "
+            "a longer path are omitted"
+            + (", then modules are grouped by `modules/<category>`." if grouped else "."),
+        ]
+        merged = [(label, nodes) for label, nodes in sorted(members.items()) if len(nodes) > 1]
+        if merged:
+            lines += ["", "Merged nodes:", ""]
+            lines += [f"- **{label}**: " + ", ".join(nodes) for label, nodes in merged]
+        mermaid_block_md = "\n".join(lines)
+    else:
+        mermaid_block_md = "No module dependencies detected."
 
     # Write a consolidated page
-    page = [
-        "# Root dependency map",
-        "",
-        "## Module dependency diagram (Mermaid)",
-        mermaid_block_md,
-        "",
-        "## Full Terraform graph (DOT)",
-        dot_block,
-    ]
-    write(os.path.join(DOCS_ROOT, "root", "dependency_map.md"), "\n".join(page) + "\n")
+    def render(diagram: str) -> str:
+        page = [
+            "# Root dependency map",
+            "",
+            "## Module dependency diagram (Mermaid)",
+            diagram,
+            "",
+            "## Full Terraform graph (DOT)",
+            dot_block,
+        ]
+        return "\n".join(page) + "\n"
+
+    text = render(mermaid_block_md)
+    if len(text.encode("utf-8")) > page_budget:
+        mermaid_block_md = (
+            f"The reduced diagram ({len(members)} nodes, {len(reduced_edges)} edges) exceeds the page size budget; "
+            "follow the per-module pages below."
+        )
+        text = render(mermaid_block_md)
+    write(os.path.join(DOCS_ROOT, "root", "dependency_map.md"), text)
 
     return dot_block, mermaid_block_md
 
 
+# -----------------------------
+# Fast-path variable/output loader (hcl2-compatible subset)
+# -----------------------------
+
+class UnsupportedHcl(Exception):
+    """Raised by the fast path for syntax outside its subset; callers fall back to hcl2."""
+
+
+_FAST_TOKEN = re.compile(
+    r"""
+    (?P<ws>[ \t\r\n]+|\#[^\n]*|//[^\n]*|/\*.*?\*/)
+    |(?P<str>"(?:[^"\\\n$%]|\\.|[$%](?!\{)|[$%]\{[^{}"\n]*\})*")
+    |(?P<heredoc><<(?P<trim>-?)(?P<marker>[a-zA-Z][a-zA-Z0-9._-]+)\n(?P<doc>.*?)(?P=marker))
+    |(?P<num>[0-9]+(?:\.[0-9]+)?(?![A-Za-z0-9_]))
+    |(?P<ident>[A-Za-z_][A-Za-z0-9_-]*)
+    |(?P<punct>[{}\[\]().,:*]|=(?![=>]))
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_FAST_LITERALS = {"true": True, "false": False, "null": None}
+
+# Fast-path usage counters, reported by the benchmark ("cached" = hcl2 result served by HclParseCache)
+FAST_HCL_STATS: Dict[str, int] = {"fast": 0, "fallback": 0, "cached": 0}
+
+
+def _fast_tokens(text: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    pos, n = 0, len(text)
+    while pos < n:
+        m = _FAST_TOKEN.match(text, pos)
+        if m is None:
+            raise UnsupportedHcl(f"unsupported syntax at offset {pos}: {text[pos:pos + 20]!r}")
+        kind = m.lastgroup
+        if kind == "heredoc":
+            tokens.append(("heredoc", _heredoc_value(m.group("doc"), bool(m.group("trim")))))
+        elif kind != "ws":
+            tokens.append((kind, m.group()))
+        pos = m.end()
+    return tokens
+
+
+def _heredoc_value(doc: str, trim: bool) -> str:
+    # Same normalisation as python-hcl2: drop trailing blank space and, for <<-, the common indent
+    text = doc.rstrip("\n\t ")
+    if not trim:
+        return text
+    lines = text.split("\n")
+    indent = min(len(line) - len(line.lstrip(" ")) for line in lines)
+    return "\n".join(line[indent:] for line in lines)
+
+
+class _FastHclParser:
+    """Recursive-descent parser for the attribute subset used by CAF variables/outputs.
+
+    Produces exactly what ``hcl2.loads`` (python-hcl2 4.x) returns for that
+    subset: literals become Python values, and traversals and function calls
+    become ``${...}`` strings rendered the way hcl2 reconstructs them.
+    Operators, conditionals, for-expressions and templates raise
+    :class:`UnsupportedHcl`.
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _fast_tokens(text)
+        self.pos = 0
+
+    def _peek(self, offset: int = 0) -> Tuple[str, str]:
+        idx = self.pos + offset
+        return self.tokens[idx] if idx < len(self.tokens) else ("eof", "")
+
+    def _take(self, expected: str = "") -> Tuple[str, str]:
+        tok = self._peek()
+        if tok[0] == "eof" or (expected and tok[1] != expected):
+            raise UnsupportedHcl(f"expected {expected or 'token'}, got {tok[1]!r}")
+        self.pos += 1
+        return tok
+
+    def body(self) -> Dict[str, Any]:
+        attrs: Dict[str, Any] = {}
+        while self._peek()[0] != "eof":
+            kind, name = self._take()
+            if kind != "ident":
+                raise UnsupportedHcl(f"unexpected {name!r} in body")
+            nxt = self._take()[1]
+            if nxt == "=":
+                attrs[name] = self._value(self._expr())
+            elif nxt == "{":
+                start = self.pos
+                depth = 1
+                while depth:
+                    tok = self._take()[1]
+                    depth += {"{": 1, "}": -1}.get(tok, 0)
+                nested = _FastHclParser.__new__(_FastHclParser)
+                nested.tokens, nested.pos = self.tokens[start:self.pos - 1], 0
+                attrs.setdefault(name, []).append(nested.body())
+            else:
+                raise UnsupportedHcl(f"unexpected {nxt!r} after {name!r}")
+        return attrs
+
+    # Expression nodes: ("str", raw) | ("lit", value) | ("obj", pairs) | ("list", items) | ("expr", text)
+    def _expr(self):
+        kind, tok = self._take()
+        if kind == "str":
+            return ("str", tok[1:-1])
+        if kind == "heredoc":
+            return ("str", tok)
+        if kind == "num":
+            return ("lit", float(tok) if "." in tok else int(tok))
+        if tok == "{":
+            pairs = []
+            while self._peek()[1] != "}":
+                key_kind, key = self._take()
+                if key_kind not in ("ident", "str"):
+                    raise UnsupportedHcl(f"unsupported object key {key!r}")
+                if self._take()[1] not in ("=", ":"):
+                    raise UnsupportedHcl("expected '=' in object")
+                pairs.append((key.strip('"') if key_kind == "str" else key, self._expr()))
+                if self._peek()[1] == ",":
+                    self.pos += 1
+            self._take("}")
+            return ("obj", pairs)
+        if tok == "[":
+            items = []
+            while self._peek()[1] != "]":
+                items.append(self._expr())
+                if self._peek()[1] == ",":
+                    self.pos += 1
+            self._take("]")
+            return ("list", items)
+        if kind != "ident":
+            raise UnsupportedHcl(f"unsupported expression start {tok!r}")
+        if tok in _FAST_LITERALS and self._peek()[1] not in (".", "[", "("):
+            return ("lit", _FAST_LITERALS[tok])
+        text = tok
+        if self._peek()[1] == "(":
+            self.pos += 1
+            args = []
+            while self._peek()[1] != ")":
+                args.append(self._arg_text(self._expr()))
+                if self._peek()[1] == ",":
+                    self.pos += 1
+            self._take(")")
+            text = f"{tok}({', '.join(args)})"
+        return ("expr", text + self._suffixes())
+
+    def _suffixes(self) -> str:
+        parts: List[str] = []
+        while True:
+            tok = self._peek()[1]
+            if tok == ".":
+                self.pos += 1
+                kind, name = self._take()
+                if kind == "ident" or name == "*":
+                    parts.append(f".{name}")
+                elif kind == "num" and name.isdigit():
+                    parts.append(f"[{name}]")  # legacy a.0 index syntax
+                else:
+                    raise UnsupportedHcl(f"unsupported attribute {name!r}")
+            elif tok == "[":
+                self.pos += 1
+                if self._peek()[1] == "*":
+                    self.pos += 1
+                    parts.append("[*]")
+                else:
+                    parts.append(f"[{self._arg_text(self._expr())}]")
+                self._take("]")
+            else:
+                return "".join(parts)
+
+    @classmethod
+    def _value(cls, node) -> Any:
+        kind, payload = node
+        if kind == "str" or kind == "lit":
+            return payload
+        if kind == "obj":
+            return {key: cls._value(value) for key, value in payload}
+        if kind == "list":
+            return [cls._value(item) for item in payload]
+        return "${" + payload + "}"
+
+    @classmethod
+    def _arg_text(cls, node) -> str:
+        kind, payload = node
+        if kind == "str":
+            return f'"{payload}"'
+        if kind == "expr":
+            return payload
+        return str(cls._value(node))
+
+
+def load_hcl_fast(text: str, kinds: Tuple[str, ...] = ("variable", "output")) -> Dict[str, List[Dict[str, Any]]]:
+    """``hcl2.loads``-compatible result for the ``kinds`` blocks of ``text``.
+
+    Raises :class:`UnsupportedHcl` when any of those blocks uses syntax outside
+    the fast path, so the caller can parse the whole file with hcl2 instead.
+    """
+    data: Dict[str, List[Dict[str, Any]]] = {}
+    for kind, labels, body_start, body_end in scan_hcl_blocks(text):
+        if body_end >= len(text):
+            raise UnsupportedHcl("unterminated block")
+        if kind not in kinds:
+            continue
+        if len(labels) != 1:
+            raise UnsupportedHcl(f"{kind} block with labels {labels!r}")
+        data.setdefault(kind, []).append({labels[0]: _FastHclParser(text[body_start:body_end]).body()})
+    return data
+
+
+def _hcl2():
+    """python-hcl2, imported on first use: building its Lark parser costs more than a nav-only run."""
+    try:
+        import hcl2
+    except ImportError as exc:  # pragma: no cover - import guard
+        raise SystemExit(
+            "python-hcl2 is required. Install it with 'pip install python-hcl2'."
+        ) from exc
+    return hcl2
+
+
+@functools.lru_cache(maxsize=None)
+def hcl2_version() -> str:
+    """Installed python-hcl2 version, read from its version.py without importing the package."""
+    if "hcl2" in sys.modules:
+        return getattr(sys.modules["hcl2"], "__version__", "unknown")
+    spec = importlib.util.find_spec("hcl2")
+    for location in (spec.submodule_search_locations or []) if spec else []:
+        try:
+            match = re.search(r"__version__\b.*?['\"]([^'\"]+)['\"]", _read_text(os.path.join(location, "version.py")))
+        except OSError:
+            continue
+        if match:
+            return match.group(1)
+    return "unknown"
+
+
+def load_hcl(text: str) -> Dict[str, Any]:
+    """Parse variable/output definitions, preferring the fast path over python-hcl2."""
+    try:
+        data = load_hcl_fast(text)
+    except UnsupportedHcl:
+        return _load_hcl2(text)
+    FAST_HCL_STATS["fast"] += 1
+    return data
+
+
+def _load_hcl2(text: str) -> Dict[str, Any]:
+    cache = _PARSE_CACHE
+    key = cache.key(text) if cache is not None else ""
+    data = cache.get(key) if cache is not None else None
+    if data is not None:
+        FAST_HCL_STATS["cached"] += 1
+        return data
+    FAST_HCL_STATS["fallback"] += 1
+    with span("hcl2.loads", "parse", bytes=len(text)):
+        data = _hcl2().loads(text)
+    if cache is not None:
+        cache.put(key, data)
+    return data
+
+
 def _strip_interpolation(value: Any) -> Any:
     if isinstance(value, str) and value.startswith("${") and value.endswith("}"):
         return value[2:-1].strip()
@@ -328,16 +1567,35 @@ def _flatten_block(block: Any) -> Dict[str, Any]:
     return {}
 
 
-def extract_variables(module_path: str) -> List[Dict[str, Any]]:
-    """Return variable metadata parsed via python-hcl2."""
-    var_file = os.path.join(module_path, "variables.tf")
-    variables: List[Dict[str, Any]] = []
+class Variable(NamedTuple):
+    """One ``variable`` block as shown in the Inputs table; cached as a JSON array."""
+
+    name: str
+    description: str
+    type: str
+    required: str
+    default: str
+    validation: str
 
-    if not os.path.exists(var_file):
-        return variables
 
-    with open(var_file, "r", encoding="utf-8", errors="ignore") as fp:
-        data = hcl2.load(fp)
+class Output(NamedTuple):
+    """One ``output`` block as shown in the Outputs table; cached as a JSON array."""
+
+    name: str
+    description: str
+    sensitive: str
+    value: str
+
+
+def extract_variables(module_path: str) -> List[Variable]:
+    """Return variable metadata from variables.tf (fast path, python-hcl2 fallback)."""
+    return ModuleScan(module_path).variables()
+
+
+def parse_variables(text: str) -> List[Variable]:
+    """Variable metadata from the text of a variables.tf file."""
+    variables: List[Variable] = []
+    data = load_hcl(text)
 
     for entry in data.get("variable", []):
         for name, attrs in entry.items():
@@ -363,62 +1621,56 @@ def extract_variables(module_path: str) -> List[Dict[str, Any]]:
                     validations.append(condition)
 
             variables.append(
-                {
-                    "name": name,
-                    "description": description,
-                    "type": var_type,
-                    "required": "no" if default_present else "yes",
-                    "default": default_value,
-                    "validation": "; ".join(validations) if validations else "",
-                }
+                Variable(
+                    name=name,
+                    description=description,
+                    type=var_type,
+                    required="no" if default_present else "yes",
+                    default=default_value,
+                    validation="; ".join(validations) if validations else "",
+                )
             )
 
     return variables
 
 
-def extract_outputs(module_path: str) -> List[Dict[str, Any]]:
+def extract_outputs(module_path: str) -> List[Output]:
     """Return outputs with descriptions from outputs.tf or output.tf."""
-    outputs: List[Dict[str, Any]] = []
+    return ModuleScan(module_path).outputs()
 
-    for filename in ["outputs.tf", "output.tf"]:
-        outputs_file = os.path.join(module_path, filename)
-        if not os.path.exists(outputs_file):
-            continue
 
-        with open(outputs_file, "r", encoding="utf-8", errors="ignore") as fp:
-            data = hcl2.load(fp)
+def parse_outputs(text: str) -> List[Output]:
+    """Output metadata from the text of an outputs.tf file."""
+    outputs: List[Output] = []
+    data = load_hcl(text)
 
-        for entry in data.get("output", []):
-            for name, attrs in entry.items():
-                block = _flatten_block(attrs)
-                description = _clean_multiline(
-                    _stringify_value(block.get("description"))
-                )
-                sensitive = _stringify_value(block.get("sensitive"))
-                value_expr = _clean_multiline(_stringify_value(block.get("value")))
-
-                outputs.append(
-                    {
-                        "name": name,
-                        "description": description,
-                        "sensitive": sensitive,
-                        "value": value_expr,
-                    }
+    for entry in data.get("output", []):
+        for name, attrs in entry.items():
+            block = _flatten_block(attrs)
+            description = _clean_multiline(
+                _stringify_value(block.get("description"))
+            )
+            sensitive = _stringify_value(block.get("sensitive"))
+            value_expr = _clean_multiline(_stringify_value(block.get("value")))
+
+            outputs.append(
+                Output(
+                    name=name,
+                    description=description,
+                    sensitive=sensitive,
+                    value=value_expr,
                 )
-        break
+            )
 
     return outputs
 
+
 def extract_resource_types(module_path: str):
     """Return a sorted list of unique Terraform resource types used in the module."""
-    contents = read_tf_from_folder(module_path)
-    types = set()
-    for m in re.finditer(r'\bresource\s+"([^"]+)"\s+"([^"]+)"', contents):
-        types.add(m.group(1))
-    return sorted(types)
+    return ModuleScan(module_path).resource_types()
 
 
-def format_inputs_table(inputs: list) -> str:
+def format_inputs_table(inputs: List[Variable]) -> str:
     """Format inputs as a Markdown table."""
     if not inputs:
         return "No inputs defined."
@@ -428,23 +1680,21 @@ def format_inputs_table(inputs: list) -> str:
         "|------|-------------|------|:--------:|---------|------------|",
     ]
     for inp in inputs:
-        name = inp.get("name", "")
-        desc = inp.get("description", "").replace("\n", " ").replace("|", "\\|")
+        desc = inp.description.replace("\n", " ").replace("|", "\\|")
         if len(desc) > 120:
             desc = desc[:117] + "..."
-        typ = inp.get("type", "any").replace("|", "\\|")
+        typ = inp.type.replace("|", "\\|")
         if len(typ) > 40:
             typ = typ[:37] + "..."
-        required = inp.get("required", "no")
-        default = (inp.get("default", "") or "-").replace("|", "\\|")
-        validation = (inp.get("validation", "") or "-").replace("|", "\\|")
+        default = (inp.default or "-").replace("|", "\\|")
+        validation = (inp.validation or "-").replace("|", "\\|")
 
-        lines.append(f"| `{name}` | {desc} | `{typ}` | {required} | `{default}` | {validation} |")
+        lines.append(f"| `{inp.name}` | {desc} | `{typ}` | {inp.required} | `{default}` | {validation} |")
 
     return "\n".join(lines)
 
 
-def format_outputs_table(outputs: list) -> str:
+def format_outputs_table(outputs: List[Output]) -> str:
     """Format outputs as a Markdown table."""
     if not outputs:
         return "No outputs defined."
@@ -454,161 +1704,929 @@ def format_outputs_table(outputs: list) -> str:
         "|------|-------------|-----------|-------|",
     ]
     for out in outputs:
-        name = out.get("name", "")
-        desc = out.get("description", "").replace("\n", " ").replace("|", "\\|")
+        desc = out.description.replace("\n", " ").replace("|", "\\|")
         if len(desc) > 120:
             desc = desc[:117] + "..."
-        sensitive = out.get("sensitive", "") or "-"
-        value_expr = (out.get("value", "") or "-").replace("|", "\\|")
-        lines.append(f"| `{name}` | {desc} | {sensitive} | `{value_expr}` |")
+        sensitive = out.sensitive or "-"
+        value_expr = (out.value or "-").replace("|", "\\|")
+        lines.append(f"| `{out.name}` | {desc} | {sensitive} | `{value_expr}` |")
 
     return "\n".join(lines)
 
 
 # -----------------------------
-# Generation
+# Module discovery (modules/**)
 # -----------------------------
 
-def generate_modules_docs(create_dot=False, update_dot=False):
-    nav_modules = {}
-    ensure_dir(DOCS_MODULES)
-    
-    # Count total modules for progress
-    total_modules = sum(1 for cat in os.listdir(MODULES_ROOT) 
-                       if os.path.isdir(os.path.join(MODULES_ROOT, cat))
-                       for mod in os.listdir(os.path.join(MODULES_ROOT, cat))
-                       if os.path.isdir(os.path.join(MODULES_ROOT, cat, mod)))
-    current = 0
+class ModuleEntry(NamedTuple):
+    """One folder under ``modules/`` holding ``.tf`` files, as recorded by ``discover_modules()``."""
+    category: str  # First folder below modules/
+    module: str  # Rest of the path, "/"-separated; "" for a module directly under modules/
+    path: str
+    files: Tuple[Tuple[str, int, int], ...]  # (name, size, mtime_ns) of each .tf file, by name
 
-    for category in sorted(os.listdir(MODULES_ROOT)):
-        cat_path = os.path.join(MODULES_ROOT, category)
-        if not os.path.isdir(cat_path):
-            continue
-        for mod in sorted(os.listdir(cat_path)):
-            mod_path = os.path.join(cat_path, mod)
-            if not os.path.isdir(mod_path):
-                continue
-            current += 1
-            print(f"[{current}/{total_modules}] Processing {category}/{mod}...", end='\r')
-
-            # DOT file logic
-            dot_path = os.path.join(mod_path, "graph.dot")
-            tf_files = [fn for fn in os.listdir(mod_path) if fn.endswith(".tf")]
-            # --create-dot: only create if missing
-            def ensure_terraform_init(path):
-                if not os.path.exists(os.path.join(path, ".terraform")):
-                    print(f"Running 'terraform init' in {path}...")
-                    try:
-                        subprocess.run("terraform init -input=false -no-color", cwd=path, shell=True, check=True)
-                    except Exception as e:
-                        print(f"Failed to run 'terraform init' in {path}: {e}")
-
-            if create_dot and not os.path.exists(dot_path) and tf_files:
-                ensure_terraform_init(mod_path)
-                try:
-                    subprocess.run("terraform graph -draw-cycles > graph.dot", cwd=mod_path, shell=True, check=True)
-                    print(f"Created DOT file for {category}/{mod}.")
-                except Exception as e:
-                    print(f"Failed to create DOT file for {category}/{mod}: {e}")
-            # --update-dot: always create/overwrite
-            if update_dot and tf_files:
-                ensure_terraform_init(mod_path)
-                try:
-                    subprocess.run("terraform graph -draw-cycles > graph.dot", cwd=mod_path, shell=True, check=True)
-                    print(f"Updated DOT file for {category}/{mod}.")
-                except Exception as e:
-                    print(f"Failed to update DOT file for {category}/{mod}: {e}")
-            nodes, edges = extract_dependencies_path(mod_path)
-            diagram = "\n".join(mermaid_block(nodes, edges)) if nodes else "No dependencies detected."
-
-            # Sources
-            sources = [f"`modules/{category}/{mod}/{fn}`" for fn in sorted(os.listdir(mod_path)) if fn.endswith('.tf')]
-            res_types = extract_resource_types(mod_path)
-            
-            # Extract variables and outputs (fast, no subprocess)
-            variables = extract_variables(mod_path)
-            outputs = extract_outputs(mod_path)
-
-            # Format tables
-            inputs_table = format_inputs_table(variables)
-            outputs_table = format_outputs_table(outputs)
-
-            md = [
-                f"# {category}/{mod}",
-                "",
-                "## Overview",
-                "This page documents the Terraform module implementation, key configuration surfaces, and how it integrates with CAF.",
-                "",
-                "## Dependency diagram (Mermaid)",
-                diagram,
-                "",
-                "## Module Reference",
-                f"**Category**: {category}  ",
-                f"**Path**: `modules/{category}/{mod}`  ",
-                ("**Azure Resources**: " + ", ".join([f'`{t}`' for t in res_types])) if res_types else "",
-                "",
-                "### Inputs",
-                "",
-                inputs_table,
-                "",
-                "### Outputs",
-                "",
-                outputs_table,
-                "",
-                "## Sources",
-                "\n".join([f"- {s}" for s in sources]) if sources else "No Terraform sources found.",
-            ]
-            
-            rel_md = os.path.join("modules", category, f"{mod}.md")
-            write(os.path.join(DOCS_ROOT, rel_md), "\n".join(md) + "\n")
-            nav_modules.setdefault(category, []).append((mod, rel_md.replace(os.sep, '/')))
-    
-    print(f"\n✅ Processed {current} modules across {len(nav_modules)} categories")
+    @property
+    def name(self) -> str:
+        return module_name(self.category, self.module)
 
-    # Modules index
-    idx = ["# Modules index", ""]
-    for cat, items in sorted(nav_modules.items()):
-        idx.append(f"## {cat}")
-        for title, relp in items:
-            idx.append(f"- [{title}]({relp})")
-        idx.append("")
-    write(os.path.join(DOCS_MODULES, "index.md"), "\n".join(idx) + "\n")
-    return nav_modules, current
 
+def module_name(category: str, mod: str) -> str:
+    """``category/module`` page name of a module; just the category for a module directly under modules/."""
+    return f"{category}/{mod}" if mod else category
 
-def generate_root_docs():
-    ensure_dir(DOCS_ROOT_AGG)
-    nav_root = []
-    for fn in sorted(os.listdir(REPO_ROOT)):
-        if not fn.endswith('.tf'):
-            continue
-        if fn in ("backend.azurerm",):
+
+def discover_modules() -> List[ModuleEntry]:
+    """The module manifest: one ``os.scandir`` walk of ``modules/``, sorted by path.
+
+    Every folder holding ``.tf`` files is a module, however deep it is nested,
+    and parents come before the modules nested in them. Hidden folders such as
+    ``.terraform`` are skipped. Later stages take file lists and stat info from
+    the manifest instead of listing the folders again.
+    """
+    manifest: List[ModuleEntry] = []
+
+    def walk(path: str, rel: str):
+        files: List[Tuple[str, int, int]] = []
+        folders: List[str] = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    folders.append(entry.name)
+                elif entry.name.endswith(".tf") and entry.is_file():
+                    st = entry.stat()
+                    files.append((entry.name, st.st_size, st.st_mtime_ns))
+        if files and rel:
+            category, _, mod = rel.partition("/")
+            manifest.append(ModuleEntry(category, mod, path, tuple(sorted(files))))
+        for folder in sorted(folders):
+            walk(os.path.join(path, folder), f"{rel}/{folder}" if rel else folder)
+
+    walk(MODULES_ROOT, "")
+    return manifest
+
+
+def owning_module(rel: str, names: Container[str]) -> Optional[str]:
+    """Deepest module of ``names`` whose folder holds ``rel``, a "/"-separated path below modules/."""
+    parts = rel.split("/")[:-1]
+    while parts:
+        name = "/".join(parts)
+        if name in names:
+            return name
+        parts.pop()
+    return None
+
+
+# -----------------------------
+# Incremental cache (.deepwiki-cache/)
+# -----------------------------
+
+# Bump whenever scan_module() output changes shape or content.
+GENERATOR_VERSION = "7"
+CACHE_DIRNAME = ".deepwiki-cache"
+
+
+def default_cache_dir() -> str:
+    return os.path.join(REPO_ROOT, CACHE_DIRNAME)
+
+
+def _cache_version() -> str:
+    return f"{GENERATOR_VERSION}/hcl2-{hcl2_version()}"
+
+
+def content_hash(paths: List[str]) -> str:
+    """Hash of the given files' names and contents plus the generator version."""
+    digest = hashlib.sha256(_cache_version().encode("utf-8"))
+    for path in paths:
+        with open(path, "rb") as f:
+            content = f.read()
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0" + str(len(content)).encode("ascii") + b"\0")
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def module_content_hash(mod_path: str, names: Optional[List[str]] = None) -> str:
+    """``content_hash()`` of a module's ``.tf`` files; ``names`` (from the manifest) saves listing the folder."""
+    if names is None:
+        names = sorted(fn for fn in os.listdir(mod_path) if fn.endswith(".tf"))
+    return content_hash([os.path.join(mod_path, fn) for fn in names])
+
+
+# A file modified this recently could change again within the filesystem's
+# timestamp granularity while keeping its size and mtime, so its stat is not trusted yet
+RACY_STAT_NS = 2_000_000_000
+
+
+def stat_key(files: Iterable[Tuple[str, int, int]]) -> str:
+    """Signature of a manifest file list's names, sizes and mtimes; "" while any file is too recent to trust."""
+    files = list(files)
+    settled = time.time_ns() - RACY_STAT_NS
+    if any(mtime >= settled for _, _, mtime in files):
+        return ""
+    return hashlib.sha256(json.dumps(files).encode("utf-8")).hexdigest()
+
+
+def load_cache(cache_dir: str, section: str) -> Dict[str, Dict[str, Any]]:
+    """Return ``{name: {"key": hash, "data": scan}}`` for a cache section; empty on miss or version change."""
+    path = os.path.join(cache_dir, f"{section}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if payload.get("version") != _cache_version():
+        return {}
+    return payload.get("entries", {})
+
+
+def save_cache(cache_dir: str, section: str, entries: Dict[str, Dict[str, Any]]):
+    ensure_dir(cache_dir)
+    path = os.path.join(cache_dir, f"{section}.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    payload = json.dumps({"version": _cache_version(), "entries": entries}, sort_keys=True, separators=(",", ":"))
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _intern_all(values: Iterable[str]) -> List[str]:
+    return [sys.intern(value) for value in values]
+
+
+def compact_scan(data: Dict[str, Any]) -> Dict[str, Any]:
+    """A module or root file scan as loaded from JSON, with records in place of arrays.
+
+    Variables and outputs become ``Variable``/``Output`` records and edges
+    tuples; node, resource type and field strings are interned, so the
+    copies ``json.loads`` makes for every module share one object each.
+    """
+    compact = dict(data)
+    for field in ("nodes", "resource_types", "remote_objects"):
+        if field in data:
+            compact[field] = _intern_all(data[field])
+    if "edges" in data:
+        compact["edges"] = [tuple(_intern_all(edge)) for edge in data["edges"]]
+    if "variables" in data:
+        compact["variables"] = [Variable(*_intern_all(v)) for v in data["variables"]]
+    if "outputs" in data:
+        compact["outputs"] = [Output(*_intern_all(o)) for o in data["outputs"]]
+    return compact
+
+
+def load_scans(cache_dir: str, section: str) -> Dict[str, Dict[str, Any]]:
+    """``load_cache()`` for the "modules" and "root" sections, with every scan compacted."""
+    return {name: dict(entry, data=compact_scan(entry["data"]))
+            for name, entry in load_cache(cache_dir, section).items() if "data" in entry}
+
+
+# -----------------------------
+# Persistent hcl2 parse cache (.deepwiki-cache/hcl2/)
+# -----------------------------
+
+DEFAULT_PARSE_CACHE_MB = 64
+
+
+class HclParseCache:
+    """Content-addressed store of ``hcl2.loads`` results, shared by concurrent runs.
+
+    Each entry is a zlib-compressed ``marshal`` blob named after the sha256 of
+    the parsed text, under one directory per hcl2 version and Python version
+    (the marshal format is only stable within one Python release). Entries are written
+    to a per-process temp file and moved into place with ``os.replace`` so
+    readers never observe partial data; a hit refreshes the entry's mtime,
+    which ``prune()`` uses to evict least-recently-used entries.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_PARSE_CACHE_MB * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        python = "py{}.{}".format(*sys.version_info[:2])
+        self.directory = os.path.join(root, f"hcl2-{hcl2_version()}-{python}-marshal{marshal.version}")
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = marshal.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError, zlib.error):
+            return None  # Unreadable entry: treated as a miss and overwritten by put()
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: Dict[str, Any]):
+        try:
+            blob = zlib.compress(marshal.dumps(data))
+        except ValueError:
+            return  # Not marshal-able; simply not cached
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            ensure_dir(os.path.dirname(path))
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def prune(self) -> int:
+        """Evict least-recently-used entries until the cache fits ``max_bytes``; returns the count removed."""
+        entries = []
+        total = 0
+        for dirpath, _dirs, files in os.walk(self.root):
+            for fn in files:
+                path = os.path.join(dirpath, fn)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue  # Evicted by another process meanwhile
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+# Cache consulted by load_hcl() when python-hcl2 is needed; None disables it
+_PARSE_CACHE: Optional[HclParseCache] = None
+
+
+def set_parse_cache(cache: Optional[HclParseCache]) -> Optional[HclParseCache]:
+    """Install the process-wide parse cache (also a process-pool initializer); returns the previous one."""
+    global _PARSE_CACHE
+    previous, _PARSE_CACHE = _PARSE_CACHE, cache
+    return previous
+
+
+# -----------------------------
+# Terraform subprocess scheduling (--create-dot / --update-dot)
+# -----------------------------
+
+DEFAULT_DOT_CONCURRENCY = 4
+DEFAULT_DOT_TIMEOUT = 600.0
+
+
+def default_plugin_cache_dir(cache_dir: str = "") -> str:
+    """Shared provider cache so each module's init links providers instead of downloading them.
+
+    Kept under the (git-ignored) generator cache unless ``TF_PLUGIN_CACHE_DIR`` is set.
+    """
+    return os.environ.get("TF_PLUGIN_CACHE_DIR") or os.path.join(cache_dir or default_cache_dir(), "plugin-cache")
+
+
+async def _run_terraform(args: List[str], cwd: str, env: Dict[str, str], timeout: float,
+                         stdout_path: str = "") -> Tuple[int, str]:
+    """Run ``terraform <args>`` in ``cwd``; return (returncode, stderr tail).
+
+    When ``stdout_path`` is set, stdout is written to a temporary file that is
+    renamed over ``stdout_path`` only on success, so a failed or timed-out
+    ``terraform graph`` never leaves a truncated DOT file behind.
+    """
+    import asyncio
+
+    tmp_path = stdout_path + ".tmp" if stdout_path else ""
+    out = open(tmp_path, "wb") if tmp_path else asyncio.subprocess.DEVNULL
+    rc, stderr_tail = -1, ""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "terraform", *args, cwd=cwd, env=env,
+            stdin=asyncio.subprocess.DEVNULL, stdout=out, stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, err = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            rc, stderr_tail = proc.returncode, err.decode("utf-8", errors="replace").strip()[-500:]
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            stderr_tail = f"timed out after {timeout:g}s"
+    except OSError as e:
+        rc, stderr_tail = 127, str(e)
+    finally:
+        if tmp_path:
+            out.close()
+            if rc == 0:
+                os.replace(tmp_path, stdout_path)
+            else:
+                os.remove(tmp_path)
+    return rc, stderr_tail
+
+
+async def _module_dot_job(label: str, mod_path: str, env: Dict[str, str], timeout: float) -> Tuple[str, str]:
+    """init (if needed) then graph for one module; returns (label, error or '')."""
+    if not os.path.exists(os.path.join(mod_path, ".terraform")):
+        rc, err = await _run_terraform(["init", "-input=false", "-no-color"], mod_path, env, timeout)
+        if rc != 0:
+            return label, f"terraform init failed ({rc}): {err}"
+    rc, err = await _run_terraform(
+        ["graph", "-draw-cycles"], mod_path, env, timeout, stdout_path=os.path.join(mod_path, "graph.dot")
+    )
+    if rc != 0:
+        return label, f"terraform graph failed ({rc}): {err}"
+    return label, ""
+
+
+async def _schedule_module_dots(jobs: List[Tuple[str, str]], concurrency: int, timeout: float,
+                                plugin_cache_dir: str) -> List[Tuple[str, str]]:
+    import asyncio
+
+    ensure_dir(plugin_cache_dir)
+    env = dict(os.environ, TF_PLUGIN_CACHE_DIR=plugin_cache_dir, TF_IN_AUTOMATION="1")
+    sem = asyncio.Semaphore(max(1, concurrency))
+    total = len(jobs)
+    done = 0
+    failures: List[Tuple[str, str]] = []
+    # Jobs interleave on the event loop thread; give each concurrency slot its own trace row
+    slots = list(range(max(1, concurrency), 0, -1))
+
+    async def bounded(label: str, mod_path: str):
+        nonlocal done
+        async with sem:
+            slot = slots.pop()
+            try:
+                with span("terraform", "subprocess", tid=slot, module=label):
+                    label, error = await _module_dot_job(label, mod_path, env, timeout)
+            finally:
+                slots.append(slot)
+        done += 1
+        if error:
+            failures.append((label, error))
+        print(f"[{done}/{total}] terraform graph {'FAILED' if error else 'ok'}: {label}")
+
+    # The plugin cache is not safe for concurrent first-time population, so the
+    # first module runs alone to fill it; the rest only link from the cache.
+    if jobs:
+        await bounded(*jobs[0])
+    await asyncio.gather(*(bounded(label, path) for label, path in jobs[1:]))
+    return sorted(failures)
+
+
+def run_module_dots(tasks: List[ModuleEntry], create_dot: bool = False, update_dot: bool = False,
+                    concurrency: int = DEFAULT_DOT_CONCURRENCY, timeout: float = DEFAULT_DOT_TIMEOUT,
+                    plugin_cache_dir: str = "") -> List[Tuple[str, str]]:
+    """Run terraform init/graph for the selected modules with bounded concurrency.
+
+    ``--create-dot`` only targets modules without a graph.dot, ``--update-dot``
+    targets every discovered module. Returns sorted (module, error) failures,
+    which are also printed together once all commands have finished.
+    """
+    jobs: List[Tuple[str, str]] = []
+    for category, mod, mod_path, *_ in tasks:
+        if update_dot or (create_dot and not os.path.exists(os.path.join(mod_path, "graph.dot"))):
+            jobs.append((module_name(category, mod), mod_path))
+    if not jobs:
+        return []
+
+    import asyncio
+
+    failures = asyncio.run(
+        _schedule_module_dots(jobs, concurrency, timeout, plugin_cache_dir or default_plugin_cache_dir())
+    )
+    print(f"DOT generation: {len(jobs) - len(failures)} succeeded, {len(failures)} failed")
+    for label, error in failures:
+        print(f"  - {label}: {error}")
+    return failures
+
+
+# -----------------------------
+# Examples index (examples/**/*.tfvars)
+# -----------------------------
+
+EXAMPLES_DIRNAME = "examples"
+# Wrapper that passes the example variables to the root module (module "example" { source = "../" ... })
+EXAMPLES_WRAPPER = "module.tf"
+EXAMPLES_PER_MODULE = 10
+# Below this many changed files a process pool costs more than it saves
+EXAMPLES_PARALLEL_MIN = 64
+_VARIABLE_PATH = re.compile(r'(?<![\w.])(var|local)\.([A-Za-z_][\w-]*)(?:\.([A-Za-z_][\w-]*))?')
+
+
+def _object_attributes(expr: str) -> Optional[Dict[str, str]]:
+    """Attributes of an object constructor ``{ a = ..., b = ... }``; None for any other expression."""
+    expr = _strip_hcl_comments(expr).strip()
+    if not (expr.startswith("{") and expr.endswith("}")):
+        return None
+    return hcl_attributes(expr[1:-1])
+
+
+def scan_tfvars(path: str) -> Dict[str, List[str]]:
+    """Top-level keys of a ``.tfvars`` file, each with the keys of its object value (empty otherwise)."""
+    return {key: sorted(_object_attributes(expr) or ()) for key, expr in hcl_attributes(_read_text(path)).items()}
+
+
+def example_variable_paths(examples_dir: str) -> Dict[str, Set[Tuple[str, ...]]]:
+    """Map example variables to the root module arguments they feed.
+
+    ``networking = { vnets = var.vnets }`` in the examples wrapper maps
+    ``vnets`` to ``("networking", "vnets")``; ``keyvaults = var.keyvaults``
+    maps ``keyvaults`` to ``("keyvaults",)``.
+    """
+    paths: Dict[str, Set[Tuple[str, ...]]] = {}
+    wrapper = os.path.join(examples_dir, EXAMPLES_WRAPPER)
+    if not os.path.isfile(wrapper):
+        return paths
+    content = _read_text(wrapper)
+    for kind, labels, start, end in scan_hcl_blocks(content):
+        if kind != "module":
             continue
+        for argument, expr in hcl_attributes(content[start:end]).items():
+            members = _object_attributes(expr)
+            for path, member_expr in ([((argument, key), e) for key, e in members.items()] if members
+                                      else [((argument,), expr)]):
+                for kind_, name, _ in _VARIABLE_PATH.findall(_strip_hcl_comments(member_expr)):
+                    if kind_ == "var":
+                        paths.setdefault(name, set()).add(path)
+    return paths
+
+
+def root_module_inputs() -> Dict[str, Set[Tuple[str, ...]]]:
+    """Map root module calls to the root variable paths their ``for_each``/``count`` iterate.
+
+    Locals are resolved one attribute deep, so ``for_each = local.compute.virtual_machines``
+    with ``compute = { virtual_machines = try(var.compute.virtual_machines, {}) }``
+    gives ``("compute", "virtual_machines")``.
+    """
+    scan = ModuleScan(REPO_ROOT)
+    local_exprs: Dict[Tuple[str, ...], str] = {}
+    calls: Dict[str, str] = {}
+    for fn, content in scan.files.items():
+        for kind, labels, start, end in scan.spans(fn):
+            if kind == "locals":
+                for name, expr in hcl_attributes(content[start:end]).items():
+                    local_exprs[(name,)] = expr
+                    for key, member_expr in (_object_attributes(expr) or {}).items():
+                        local_exprs[(name, key)] = member_expr
+            elif kind == "module" and labels:
+                attributes = hcl_attributes(content[start:end])
+                calls[labels[0]] = attributes.get("for_each", "") + "\n" + attributes.get("count", "")
+
+    resolved: Dict[Tuple[str, ...], Set[Tuple[str, ...]]] = {}
+
+    def variable_paths(expr: str, seen: frozenset) -> Set[Tuple[str, ...]]:
+        paths: Set[Tuple[str, ...]] = set()
+        for kind, name, key in _VARIABLE_PATH.findall(_strip_hcl_comments(expr)):
+            if kind == "var":
+                paths.add((name, key) if key else (name,))
+                continue
+            local = (name, key) if (name, key) in local_exprs else (name,)
+            if local in seen or local not in local_exprs:
+                continue
+            if local not in resolved:
+                resolved[local] = variable_paths(local_exprs[local], seen | {local})
+            paths |= resolved[local]
+        return paths
+
+    return {name: variable_paths(expr, frozenset()) for name, expr in calls.items()}
+
+
+def _example_files(examples_dir: str) -> List[str]:
+    found: List[str] = []
+    for root, dirs, files in os.walk(examples_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        found.extend(os.path.join(root, fn) for fn in sorted(files) if fn.endswith(".tfvars"))
+    return found
+
+
+def build_examples_index(jobs: int = 1, use_cache: bool = True, cache_dir: str = ""
+                         ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Map module folders (``category/module``) to the example scenarios that exercise them.
+
+    Every ``.tfvars`` file under ``examples/`` is reduced to its top-level keys
+    (cached by content hash; changed files are scanned in a process pool). A
+    key reaches a module when its path through the examples wrapper (or the
+    key itself, for root variables set directly) is a prefix of, or extends,
+    a path the module's root call iterates. Scenarios are the folders holding
+    the files, listed per module with the most focused ones (fewest modules)
+    first. Returns None when the repository has no ``examples/`` folder.
+    """
+    examples_dir = os.path.join(REPO_ROOT, EXAMPLES_DIRNAME)
+    if not os.path.isdir(examples_dir):
+        return None
+    cache_dir = cache_dir or default_cache_dir()
+    cached = load_cache(cache_dir, "examples") if use_cache else {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    pending: List[str] = []
+    for path in _example_files(examples_dir):
+        rel = os.path.relpath(path, REPO_ROOT).replace(os.sep, "/")
+        key = content_hash([path])
+        hit = cached.get(rel)
+        if hit and hit.get("key") == key:
+            entries[rel] = hit
+        else:
+            entries[rel] = {"key": key}
+            pending.append(rel)
+
+    with span("example scans", "stage", files=len(pending)):
+        paths = [os.path.join(REPO_ROOT, rel) for rel in pending]
+        jobs = max(1, min(jobs or default_jobs(), len(pending) // EXAMPLES_PARALLEL_MIN or 1))
+        if jobs == 1:
+            scans = [scan_tfvars(path) for path in paths]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                scans = list(executor.map(scan_tfvars, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    for rel, data in zip(pending, scans):
+        entries[rel]["data"] = data
+    if use_cache and (pending or entries.keys() != cached.keys()):
+        save_cache(cache_dir, "examples", entries)
+
+    # Root variable path -> module folders, indexed by the path's first element
+    sources = root_module_sources()
+    consumers: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+    for name, inputs in root_module_inputs().items():
+        folder = sources.get(f"module.{name}", ("", ""))[1]
+        for path in inputs if folder else ():
+            consumers.setdefault(path[0], []).append((path, folder))
+    variable_paths = example_variable_paths(examples_dir)
+
+    scenarios: Dict[str, Dict[str, Set[str]]] = {}  # scenario -> module folder -> keys
+    for rel, entry in entries.items():
+        exercised = scenarios.setdefault(rel.rsplit("/", 1)[0], {})
+        for key, members in entry["data"].items():
+            key_paths = variable_paths.get(key) or ({(key, member) for member in members} or {(key,)})
+            for key_path in key_paths:
+                for path, folder in consumers.get(key_path[0], ()):
+                    n = min(len(path), len(key_path))
+                    if path[:n] == key_path[:n]:
+                        exercised.setdefault(folder, set()).add(key)
+
+    index: Dict[str, List[Dict[str, Any]]] = {}
+    for scenario, exercised in sorted(scenarios.items()):
+        for folder, keys in exercised.items():
+            index.setdefault(folder, []).append({"scenario": scenario, "keys": sorted(keys), "modules": len(exercised)})
+    for examples in index.values():
+        examples.sort(key=lambda example: (example["modules"], example["scenario"]))
+    print(f"Examples: {len(entries)} files ({len(pending)} scanned), {len(index)} modules covered")
+    return index
+
+
+def format_examples(examples: List[Dict[str, Any]], limit: int = EXAMPLES_PER_MODULE) -> str:
+    if not examples:
+        return "No example configuration exercises this module."
+    lines = [f"- `{example['scenario']}` (" + ", ".join(f"`{key}`" for key in example["keys"]) + ")"
+             for example in examples[:limit]]
+    if len(examples) > limit:
+        lines.append(f"- … and {len(examples) - limit} more scenarios")
+    return "\n".join(lines)
+
+
+# -----------------------------
+# Generation
+# -----------------------------
+
+def scan_module(category: str, mod: str, mod_path: str) -> Dict[str, Any]:
+    """Extract everything a module page needs; the result is JSON-serialisable and cacheable."""
+    module = module_name(category, mod)
+    with span("scan", "module", module=module):
+        with span("read", "step", module=module):
+            scan = ModuleScan(mod_path)
+        with span("dependencies", "step", module=module):
+            nodes, edges = scan.dependencies()
+        with span("resource_types", "step", module=module):
+            resource_types = scan.resource_types()
+        with span("variables", "step", module=module):
+            variables = scan.variables()
+        with span("outputs", "step", module=module):
+            outputs = scan.outputs()
+        with span("remote_objects", "step", module=module):
+            remote_objects = scan.remote_objects()
+    return {
+        "nodes": sorted(nodes),
+        "edges": [list(edge) for edge in edges],
+        "sources": [f"modules/{module}/{fn}" for fn in scan.sources()],
+        "resource_types": resource_types,
+        "variables": variables,
+        "outputs": outputs,
+        "remote_objects": remote_objects,
+    }
+
+
+def render_module_page(category: str, mod: str, data: Dict[str, Any],
+                       examples: Optional[List[Dict[str, Any]]] = None,
+                       remote_objects: Optional["RemoteObjectsIndex"] = None) -> str:
+    """Build the markdown page for a single module from its scan data.
+
+    ``examples`` (from ``build_examples_index()``) adds an Examples section and
+    ``remote_objects`` (from ``build_remote_objects_index()``) the producers
+    of the module's remote inputs; None leaves them out.
+    """
+    nodes, edges = data["nodes"], data["edges"]
+    name = module_name(category, mod)
+    page = os.path.join(DOCS_MODULES, f"{name}.md")
+    diagram = (
+        embed_diagram(page, "\n".join(mermaid_block(nodes, edges)), {n: n for n in sorted(nodes)}, edges)
+        if nodes else "No dependencies detected."
+    )
+
+    sources = [f"`{src}`" for src in data["sources"]]
+    res_types = data["resource_types"]
+
+    # Format tables
+    inputs_table = format_inputs_table(data["variables"])
+    outputs_table = format_outputs_table(data["outputs"])
+
+    md = [
+        f"# {name}",
+        "",
+        "## Overview",
+        "This page documents the Terraform module implementation, key configuration surfaces, and how it integrates with CAF.",
+        "",
+        "## Dependency diagram (Mermaid)",
+        diagram,
+        "",
+        "## Module Reference",
+        f"**Category**: {category}  ",
+        f"**Path**: `modules/{name}`  ",
+        ("**Azure Resources**: " + ", ".join([f'`{t}`' for t in res_types])) if res_types else "",
+        "",
+        "### Inputs",
+        "",
+        inputs_table,
+        "",
+        "### Outputs",
+        "",
+        outputs_table,
+        "",
+    ]
+    if remote_objects is not None and data["remote_objects"]:
+        from scripts.deepwiki.remote_objects import format_remote_inputs
+
+        inputs = remote_objects.inputs(name, data["remote_objects"])
+        md += ["### Remote inputs", "", format_remote_inputs(name, inputs, remote_objects), ""]
+    if examples is not None:
+        md += ["## Examples", "", format_examples(examples), ""]
+    md += [
+        "## Sources",
+        "\n".join([f"- {s}" for s in sources]) if sources else "No Terraform sources found.",
+    ]
+    return "\n".join(md) + "\n"
+
+
+def modules_nav(tasks: List[ModuleEntry]) -> Dict[str, List[Tuple[str, str]]]:
+    """``{category: [(module, page path)]}`` nav entries of the discovered ``tasks``."""
+    nav_modules: Dict[str, List[Tuple[str, str]]] = {}
+    for task in tasks:
+        nav_modules.setdefault(task.category, []).append(module_nav_entry(task.name))
+    return nav_modules
+
+
+def module_nav_entry(name: str) -> Tuple[str, str]:
+    """Nav title and page of a module: its path below the category, or the category itself."""
+    return name.partition("/")[2] or name, f"modules/{name}.md"
+
+
+def _init_scan_worker(parse_cache: Optional[HclParseCache], profile: bool):
+    set_parse_cache(parse_cache)
+    set_tracer(Tracer() if profile else None)
+
+
+def _scan_module_task(task: ModuleEntry) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Process-pool entry point: scan one discovered module.
+
+    Returns the scan and the trace events the worker recorded for it.
+    """
+    data = scan_module(task.category, task.module, task.path)
+    return data, (_TRACER.drain() if _TRACER is not None else [])
+
+
+# Below this many modules per worker a process pool costs more than it saves:
+# every worker imports python-hcl2 and builds its parser before the first scan
+MODULES_PARALLEL_MIN = 128
+
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+def generate_modules_docs(create_dot=False, update_dot=False, jobs: int = 1,
+                          dot_concurrency: int = DEFAULT_DOT_CONCURRENCY, dot_timeout: float = DEFAULT_DOT_TIMEOUT,
+                          use_cache: bool = True, cache_dir: str = "",
+                          parse_cache_mb: int = DEFAULT_PARSE_CACHE_MB, catalog: Optional["Catalog"] = None,
+                          examples: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                          search_index: Optional["SearchIndex"] = None, only: Optional[Set[str]] = None,
+                          remote_objects: Optional["RemoteObjectsIndex"] = None):
+    """Render one page per module plus the modules index.
+
+    Modules whose .tf contents hash matches the cache skip scanning entirely;
+    for the rest, unchanged files python-hcl2 would parse come from the
+    persistent parse cache.
+    With ``jobs > 1`` the remaining scans are spread over a process pool of at
+    most one worker per ``MODULES_PARALLEL_MIN`` modules; pages are still
+    rendered and written in sorted order, so output is identical to the
+    serial path. Scan results are also synced into ``catalog`` and
+    ``search_index`` when given, and pages list their scenarios from the
+    ``examples`` index and the producers of their remote inputs from the
+    ``remote_objects`` index when given.
+    With ``only`` (module names, see ``--changed-since``) just those pages
+    are rendered, or removed for modules that no longer exist; every other
+    page, cache entry and catalog row is left as it is.
+    Cache lookups trust a module's file stats from the manifest, so unchanged
+    modules are not even read.
+    """
+    ensure_dir(DOCS_MODULES)
+
+    tasks = discover_modules()
+    nav_modules = modules_nav(tasks)
+    if only is not None:
+        tasks = [task for task in tasks if task.name in only]
+    total_modules = len(tasks)
+
+    cache_dir = cache_dir or default_cache_dir()
+    if create_dot or update_dot:
+        with span("terraform graph", "stage"):
+            run_module_dots(tasks, create_dot, update_dot, concurrency=dot_concurrency, timeout=dot_timeout,
+                            plugin_cache_dir=default_plugin_cache_dir(cache_dir))
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    pending: List[ModuleEntry] = []
+    restat = False
+    with span("module cache lookup", "stage"):
+        cached = load_scans(cache_dir, "modules") if use_cache else {}
+        for task in tasks:
+            name = task.name
+            hit = cached.get(name)
+            stat = stat_key(task.files)
+            if hit and stat and hit.get("stat") == stat:
+                key = hit["key"]
+            else:
+                key = module_content_hash(task.path, [fn for fn, _, _ in task.files])
+            if hit and hit.get("key") == key:
+                entries[name] = dict(hit, stat=stat)
+                restat = restat or hit.get("stat") != stat
+            else:
+                entries[name] = {"key": key, "stat": stat}
+                pending.append(task)
+
+    parse_cache = HclParseCache(os.path.join(cache_dir, "hcl2"), parse_cache_mb * 1024 * 1024) if use_cache else None
+    jobs = max(1, min(jobs or default_jobs(), len(pending) // MODULES_PARALLEL_MIN or 1))
+    previous_parse_cache = set_parse_cache(parse_cache)
+    try:
+        with span("module scans", "stage", modules=len(pending), jobs=jobs):
+            if jobs == 1:
+                scans = [scan_module(task.category, task.module, task.path) for task in pending]
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+
+                chunksize = max(1, len(pending) // (jobs * 4))
+                with ProcessPoolExecutor(max_workers=jobs, initializer=_init_scan_worker,
+                                         initargs=(parse_cache, _TRACER is not None)) as executor:
+                    results = list(executor.map(_scan_module_task, pending, chunksize=chunksize))
+                scans = [data for data, _ in results]
+                if _TRACER is not None:
+                    for _, events in results:
+                        _TRACER.extend(events)
+    finally:
+        set_parse_cache(previous_parse_cache)
+    if parse_cache is not None and pending:
+        parse_cache.prune()
+    for task, data in zip(pending, scans):
+        # Round-trip through JSON so fresh and cached scans render identically
+        entries[task.name]["data"] = compact_scan(json.loads(json.dumps(data)))
+
+    current = 0
+    with span("module pages", "stage"):
+        for task in tasks:
+            name = task.name
+            current += 1
+            print(f"[{current}/{total_modules}] Processing {name}...", end='\r')
+            with span("render", "step", module=name):
+                page = render_module_page(task.category, task.module, entries[name]["data"],
+                                          examples.get(name, []) if examples is not None else None,
+                                          remote_objects)
+                write(os.path.join(DOCS_MODULES, f"{name}.md"), page)
+
+    if use_cache:
+        if only is not None:
+            kept = {name: entry for name, entry in cached.items() if name not in only}
+            entries = {**kept, **entries}
+        if pending or restat or entries.keys() != cached.keys():
+            save_cache(cache_dir, "modules", entries)
+        print(f"\nCache: {total_modules - len(pending)} modules reused, {len(pending)} scanned", end="")
+    if catalog is not None:
+        with span("catalog", "stage"):
+            updated = catalog.update_modules(entries, only)
+        print(f"\nCatalog: {updated} modules updated in {catalog.path}", end="")
+    if search_index is not None:
+        with span("search index", "stage"):
+            rebuilt = search_index.update_modules(entries, only)
+        print(f"\nSearch index: {rebuilt} category shards rebuilt", end="")
+
+    print(f"\n✅ Processed {current} modules across {len(nav_modules)} categories")
+
+    write_modules_index(nav_modules)
+    if only is None:
+        remove_stale_pages(DOCS_MODULES)
+    else:
+        for name in sorted(only - set(entries)):
+            remove_page(os.path.join(DOCS_MODULES, f"{name}.md"))
+    return nav_modules, current
+
+
+def write_modules_index(nav_modules: Dict[str, List[Tuple[str, str]]]):
+    idx = ["# Modules index", ""]
+    for cat, items in sorted(nav_modules.items()):
+        idx.append(f"## {cat}")
+        for title, relp in items:
+            idx.append(f"- [{title}]({relp})")
+        idx.append("")
+    write(os.path.join(DOCS_MODULES, "index.md"), "\n".join(idx) + "\n")
+
+
+def generate_root_docs(use_cache: bool = True, cache_dir: str = "", search_index: Optional["SearchIndex"] = None):
+    ensure_dir(DOCS_ROOT_AGG)
+    nav_root = []
+    cache_dir = cache_dir or default_cache_dir()
+    cached = load_scans(cache_dir, "root") if use_cache else {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    scanned = 0
+    for fn in root_tf_files():
+        path = os.path.join(REPO_ROOT, fn)
+        key = content_hash([path])
+        hit = cached.get(fn)
+        if hit and hit.get("key") == key:
+            entries[fn] = hit
+        else:
+            entries[fn] = {"key": key, "data": compact_scan(scan_root_file(fn))}
+            scanned += 1
+        nav_root.append(write_root_page(fn, entries[fn]["data"]))
+
+    if use_cache and (scanned or entries.keys() != cached.keys()):
+        save_cache(cache_dir, "root", entries)
+    if search_index is not None:
+        search_index.update_root(entries)
+
+    write_root_index(nav_root)
+    remove_stale_pages(DOCS_ROOT_AGG, recursive=False, keep=("dependency_map.md",))
+    return nav_root
+
+
+def root_tf_files() -> List[str]:
+    return [fn for fn in sorted(os.listdir(REPO_ROOT)) if fn.endswith(".tf") and fn not in ("backend.azurerm",)]
+
+
+def root_nav_entry(fn: str) -> Tuple[str, str]:
+    """``(title, page path)`` nav entry of the page of root file ``fn``."""
+    title = os.path.splitext(fn)[0]
+    return title, f"root/{title}.md"
+
+
+def scan_root_file(fn: str) -> Dict[str, Any]:
+    with span("dependencies", "step", file=fn):
         nodes, edges = extract_dependencies_path(os.path.join(REPO_ROOT, fn))
-        diagram = "\n".join(mermaid_block(nodes, edges)) if nodes else "No dependencies detected."
-        md = [
-            f"# {fn}",
-            "",
-            "## Overview",
-            "Root-level aggregator wiring calling one or more service modules.",
-            "",
-            "## Dependency diagram",
-            diagram,
-            "",
-            "## Sources",
-            f"- `{fn}`",
-        ]
-        title = os.path.splitext(fn)[0]
-        rel_md = os.path.join("root", f"{title}.md")
-        write(os.path.join(DOCS_ROOT, rel_md), "\n".join(md) + "\n")
-        nav_root.append((title, rel_md.replace(os.sep, '/')))
+    return {"nodes": sorted(nodes), "edges": [list(e) for e in edges]}
 
-    # Root index
+
+def write_root_page(fn: str, data: Dict[str, Any]) -> Tuple[str, str]:
+    """Write the page of one root ``.tf`` file and return its ``(title, relative path)`` nav entry."""
+    nodes, edges = data["nodes"], data["edges"]
+    page = os.path.join(DOCS_ROOT_AGG, f"{os.path.splitext(fn)[0]}.md")
+    diagram = (
+        embed_diagram(page, "\n".join(mermaid_block(nodes, edges)), {n: n for n in sorted(nodes)}, edges)
+        if nodes else "No dependencies detected."
+    )
+    md = [
+        f"# {fn}",
+        "",
+        "## Overview",
+        "Root-level aggregator wiring calling one or more service modules.",
+        "",
+        "## Dependency diagram",
+        diagram,
+        "",
+        "## Sources",
+        f"- `{fn}`",
+    ]
+    write(page, "\n".join(md) + "\n")
+    return root_nav_entry(fn)
+
+
+def write_root_index(nav_root: List[Tuple[str, str]]):
     idx = ["# Root (aggregators) index", ""]
     for title, relp in nav_root:
         idx.append(f"- [{title}]({relp})")
     write(os.path.join(DOCS_ROOT_AGG, "index.md"), "\n".join(idx) + "\n")
-    return nav_root
 
 
 def generate_home():
@@ -626,7 +2644,9 @@ Use the left navigation to browse categories and pages. Diagrams are rendered wi
     write_if_absent(os.path.join(DOCS_ROOT, "index.md"), overview_md + "\n")
 
 
-def generate_mkdocs_yml(nav_modules, nav_root, force_nav=True):
+def generate_mkdocs_yml(nav_modules, nav_root, force_nav=True, search_index=False):
+    """Write mkdocs.yml; with ``search_index`` the prebuilt shards (``--search-index``) replace the
+    ``search`` plugin."""
     lines = [
         "site_name: CAF DeepWiki",
         "theme:",
@@ -652,9 +2672,10 @@ def generate_mkdocs_yml(nav_modules, nav_root, force_nav=True):
     lines.append("    - Index: root/index.md")
 
     # plugins
+    lines.append("plugins:")
+    if not search_index:
+        lines.append("  - search")
     lines += [
-        "plugins:",
-        "  - search",
         "  - mermaid2",
         "  - mkdocs_graphviz",
         "     #light_theme: 995522",
@@ -667,13 +2688,16 @@ def generate_mkdocs_yml(nav_modules, nav_root, force_nav=True):
         "     #node_fontcolor: 0000FF",
         "     #edge_color: FF0000",
         "     #edge_fontcolor: 00FF00",
-        "     #priority: 100"
-
+        "     #priority: 100",
         "markdown_extensions:",
         "  - admonition",
         "  - toc:",
         "      permalink: true",
     ]
+    if search_index:
+        from scripts.deepwiki.search_index import SEARCH_DIRNAME
+
+        lines += ["extra_javascript:", f"  - {SEARCH_DIRNAME.replace(os.sep, '/')}/search.js"]
     # Respect manual edits: only create mkdocs.yml if it doesn't exist
     mkdocs_path = os.path.join(REPO_ROOT, "mkdocs.yml")
     if not force_nav and os.path.exists(mkdocs_path):
@@ -681,7 +2705,146 @@ def generate_mkdocs_yml(nav_modules, nav_root, force_nav=True):
     write(mkdocs_path, "\n".join(lines) + "\n")
 
 
+# -----------------------------
+# Selective regeneration (--changed-since)
+# -----------------------------
+
+# A change under these repository paths can alter every page, so it always means a full run
+FULL_RUN_PATHS = ("scripts/deepwiki/",)
+
+
+class ChangePlan(NamedTuple):
+    """What a ``--changed-since`` run regenerates besides the indexes and the nav."""
+    modules: Set[str]  # "category/module" pages to render, or remove when the module is gone
+    root: bool  # root .tf files changed: root pages and the root search shard
+    examples: bool  # examples or root wiring changed: any module's Examples section may be stale
+    terraform: bool  # some .tf file changed: the root dependency map
+
+
+def git_changed_files(ref: str) -> Set[str]:
+    """Files changed between ``ref`` and the working tree, untracked ones included, relative to REPO_ROOT."""
+    import subprocess
+
+    changed: Set[str] = set()
+    for command in (["git", "diff", "--name-only", "--no-renames", "--relative", "-z", ref, "--"],
+                    ["git", "ls-files", "--others", "--exclude-standard", "-z"]):
+        try:
+            proc = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+        except OSError as exc:
+            raise SystemExit(f"❌ --changed-since needs git: {exc}")
+        if proc.returncode != 0:
+            raise SystemExit(f"❌ {' '.join(command[:2])} failed: {proc.stderr.strip()}")
+        changed.update(path for path in proc.stdout.split("\0") if path)
+    return changed
+
+
+def generated_module_pages() -> Set[str]:
+    """Module names of the module pages currently under docs/modules."""
+    pages: Set[str] = set()
+    for root, _, files in os.walk(DOCS_MODULES):
+        rel = os.path.relpath(root, DOCS_MODULES).replace(os.sep, "/")
+        prefix = "" if rel == "." else f"{rel}/"
+        pages.update(prefix + fn[:-3] for fn in files if fn.endswith(".md"))
+    pages.discard("index")
+    return pages
+
+
+def plan_changes(ref: str, search_index: bool = False) -> Optional[ChangePlan]:
+    """Map the files changed since git ``ref`` to the pages they affect.
+
+    The pages on disk are assumed to have been generated at ``ref``. Returns
+    None, after saying why, when only a full run gives the right output: the
+    generator itself changed, or there are no (current) pages to update.
+    """
+    from scripts.deepwiki.search_index import SearchIndex
+
+    changed = git_changed_files(ref)
+    modules = {task.name for task in discover_modules()}
+    pages = generated_module_pages()
+    reason = ""
+    if any(path.startswith(FULL_RUN_PATHS) for path in changed):
+        reason = "the generator changed"
+    elif not pages:
+        reason = "no module pages were generated yet"
+    elif search_index and not SearchIndex().current:
+        reason = "the search index is missing or from another generator version"
+    if reason:
+        print(f"--changed-since {ref}: {reason}; regenerating everything")
+        return None
+
+    affected = pages - modules  # Pages of deleted modules
+    known = modules | pages
+    dot_file = os.path.relpath(os.path.join(DOCS_ROOT_AGG, "graph.dot"), REPO_ROOT).replace(os.sep, "/")
+    root = examples = terraform = False
+    for path in changed:
+        parts = path.split("/")
+        if parts[0] == "modules":
+            name = owning_module(path[len("modules/"):], known)
+            if name is not None:
+                affected.add(name)
+        elif len(parts) == 1 and path.endswith(".tf"):
+            root = True
+        elif parts[0] == EXAMPLES_DIRNAME:
+            examples = True
+        terraform = terraform or path.endswith(".tf") or path == dot_file
+    plan = ChangePlan(affected, root, examples or root, terraform)
+    print(f"--changed-since {ref}: {len(changed)} changed files, {len(plan.modules)} module pages"
+          + (", root pages" if plan.root else "") + (", examples" if plan.examples else "")
+          + (", dependency map" if plan.terraform else ""))
+    return plan
+
+
+def stale_example_pages(examples: Dict[str, List[Dict[str, Any]]]) -> Set[str]:
+    """Modules whose page does not list the scenarios ``examples`` now holds for them."""
+    stale: Set[str] = set()
+    for task in discover_modules():
+        name = task.name
+        section = f"\n## Examples\n\n{format_examples(examples.get(name, []))}\n\n## Sources"
+        try:
+            if section in _read_text(os.path.join(DOCS_MODULES, f"{name}.md")):
+                continue
+        except OSError:
+            pass
+        stale.add(name)
+    return stale
+
+
+_REMOTE_INPUTS_SECTION = re.compile(r"\n### Remote inputs\n\n(\|.*?)\n\n", re.S)
+_REMOTE_INPUT_KEY = re.compile(r"^\| `([^`]+)` \|", re.M)
+
+
+def stale_remote_input_pages(remote_objects: "RemoteObjectsIndex") -> Set[str]:
+    """Modules whose Remote inputs table no longer matches the producers ``remote_objects`` now resolves.
+
+    The keys a module reads come from its page, so no scan is needed.
+    """
+    from scripts.deepwiki.remote_objects import format_remote_inputs
+
+    stale: Set[str] = set()
+    for task in discover_modules():
+        name = task.name
+        try:
+            m = _REMOTE_INPUTS_SECTION.search(_read_text(os.path.join(DOCS_MODULES, f"{name}.md")))
+        except OSError:
+            continue  # Rendered anyway
+        if m is None:
+            continue
+        inputs = remote_objects.inputs(name, _REMOTE_INPUT_KEY.findall(m.group(1)))
+        if m.group(1) != format_remote_inputs(name, inputs, remote_objects):
+            stale.add(name)
+    return stale
+
+
+# Phases selectable with --only, in run order; the first three write pages, "nav" writes index.md and mkdocs.yml
+PHASES = ("modules", "root", "deps", "nav")
+PAGE_PHASES = frozenset(PHASES[:3])
+
+
 def parse_args(argv: List[str]) -> argparse.Namespace:
+    from scripts.deepwiki.catalog import CATALOG_FILENAME
+    from scripts.deepwiki.search_index import SEARCH_DIRNAME
+    from scripts.deepwiki.site_build import SITE_DIRNAME
+
     parser = argparse.ArgumentParser(description="Generate MkDocs content for CAF DeepWiki")
     parser.add_argument("--create-dot", action="store_true", help="Create missing graph.dot files using terraform graph")
     parser.add_argument("--update-dot", action="store_true", help="(Re)generate graph.dot files even if they exist")
@@ -712,46 +2875,325 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
         action="store_false",
         help="Skip generating root-level module dependency map",
     )
+    parser.add_argument(
+        "--page-size-budget",
+        dest="page_budget_kb",
+        type=int,
+        default=DEFAULT_PAGE_BUDGET_KB,
+        help=f"Maximum size in KB of each root dependency map page (default: {DEFAULT_PAGE_BUDGET_KB})",
+    )
+    parser.add_argument(
+        "--collapse-categories",
+        action="store_true",
+        help="Draw one node per modules/<category> in the root dependency overview "
+        f"(automatic above {MERMAID_MAX_EDGES} reduced edges)",
+    )
+    parser.add_argument(
+        "--neighborhood-hops",
+        dest="hops",
+        type=int,
+        default=DEFAULT_NEIGHBORHOOD_HOPS,
+        help=f"Upstream/downstream depth of per-module neighborhood diagrams (default: {DEFAULT_NEIGHBORHOOD_HOPS})",
+    )
     parser.add_argument(
         "--root-graph-update",
         dest="root_graph_update",
         action="store_true",
         help="Force regeneration of root graph.dot",
     )
+    parser.add_argument(
+        "--static-graph",
+        action="store_true",
+        help="Derive root graph.dot from the Terraform sources instead of 'terraform graph' "
+        "(automatic when terraform is not installed)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=default_jobs(),
+        help="Number of worker processes used to render module pages (default: CPU count)",
+    )
+    parser.add_argument(
+        "--dot-concurrency",
+        type=int,
+        default=DEFAULT_DOT_CONCURRENCY,
+        help=f"Maximum concurrent terraform init/graph commands (default: {DEFAULT_DOT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--dot-timeout",
+        type=float,
+        default=DEFAULT_DOT_TIMEOUT,
+        help=f"Timeout in seconds for each terraform command (default: {DEFAULT_DOT_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default="",
+        help=f"Incremental cache location (default: <repo>/{CACHE_DIRNAME})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        default=True,
+        help="Ignore and do not update the incremental module cache",
+    )
+    parser.add_argument(
+        "--prerender",
+        action="store_true",
+        help="Render diagrams to SVG with Graphviz 'dot' (cached by content hash) instead of inline Mermaid",
+    )
+    parser.add_argument(
+        "--parse-cache-size",
+        dest="parse_cache_mb",
+        type=int,
+        default=DEFAULT_PARSE_CACHE_MB,
+        help=f"Size cap in MB for the persistent hcl2 parse cache (default: {DEFAULT_PARSE_CACHE_MB})",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="TRACE",
+        help="Record phase and per-module timings as a Chrome trace-event JSON file "
+        "(default: <cache-dir>/trace.json) and print the slowest modules",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_PROFILE_TOP,
+        help=f"Number of modules listed in the --profile summary (default: {DEFAULT_PROFILE_TOP})",
+    )
+    parser.add_argument(
+        "--catalog",
+        default="",
+        help=f"SQLite catalog for the 'query' subcommand (default: <cache-dir>/{CATALOG_FILENAME})",
+    )
+    parser.add_argument(
+        "--no-catalog",
+        dest="use_catalog",
+        action="store_false",
+        default=True,
+        help="Do not write the SQLite catalog",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help=f"Replace the MkDocs 'search' plugin with prebuilt shards in docs/{SEARCH_DIRNAME}: one per module "
+        "category, one for root files and one for the hand-written pages",
+    )
+    parser.add_argument(
+        "--no-examples",
+        dest="examples",
+        action="store_false",
+        default=True,
+        help=f"Do not index {EXAMPLES_DIRNAME}/**/*.tfvars or add Examples sections to module pages",
+    )
+    parser.add_argument(
+        "--no-remote-inputs",
+        dest="remote_inputs",
+        action="store_false",
+        default=True,
+        help="Do not resolve var.remote_objects keys to the root module calls producing them on module pages",
+    )
+    parser.add_argument(
+        "--build-site",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="SITE_DIR",
+        help=f"Then build the site (default: <repo>/{SITE_DIRNAME}) as one MkDocs sub-site per module category "
+        "plus root, in parallel processes, rebuilding only partitions whose pages changed",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=PHASES,
+        metavar="PHASE",
+        help=f"Run only this phase (repeatable; one of: {', '.join(PHASES)}). The nav is built from the "
+        "module folders and root .tf files alone, so '--only nav' parses nothing",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="GIT_REF",
+        help="Regenerate only the pages affected by files changed since GIT_REF (committed, uncommitted or "
+        "untracked), plus the indexes and nav; assumes docs/ was generated at GIT_REF",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After generating, keep running and regenerate only the pages of edited modules and root files",
+    )
     return parser.parse_args(argv)
 
 
 def main(argv=None):
-    args = parse_args(argv or sys.argv[1:])
+    argv = argv or sys.argv[1:]
+    if argv[:1] == ["query"]:
+        from scripts.deepwiki.catalog import query_main
+
+        sys.exit(query_main(argv[1:]))
+    args = parse_args(argv)
+    reset_write_stats()
+    tracer = Tracer() if args.profile is not None else None
+    previous_tracer = set_tracer(tracer)
+    try:
+        generate(args)
+    finally:
+        set_tracer(previous_tracer)
+    if tracer is not None:
+        trace_path = args.profile or os.path.join(args.cache_dir or default_cache_dir(), "trace.json")
+        tracer.export(trace_path)
+        print(tracer.summary(args.profile_top))
+        print(f"Trace written to {trace_path} (open in chrome://tracing or https://ui.perfetto.dev)")
+    if args.watch:
+        from scripts.deepwiki.watch import watch
+
+        watch(args)
+
+
+def generate(args: argparse.Namespace):
+    """Run every generation phase selected by the parsed command line."""
     ensure_dir(DOCS_ROOT)
     ensure_dir(DOCS_MODULES)
     ensure_dir(DOCS_ROOT_AGG)
     # Do not manage separate API pages anymore
 
+    phases = set(args.only or PHASES)
+    if args.prerender and phases & PAGE_PHASES:
+        renderer = DiagramRenderer.detect(os.path.join(args.cache_dir or default_cache_dir(), "svg"), jobs=args.jobs)
+        if renderer is None:
+            print("⚠️  Graphviz 'dot' not found; keeping inline Mermaid diagrams", file=sys.stderr)
+        set_diagram_renderer(renderer)
+
     # Optional cleanup of legacy per-module DOT files
     if args.clean_module_dots:
         removed = clean_module_dot_files(MODULES_ROOT)
         print(f"Removed {removed} per-module graph.dot files under {MODULES_ROOT}")
 
-    nav_modules, processed_modules = generate_modules_docs(
-        create_dot=args.create_dot, update_dot=args.update_dot
-    )
-    if processed_modules == 0:
-        print("❌ No modules processed. Check the modules directory path.", file=sys.stderr)
-        sys.exit(1)
+    catalog = None
+    if args.use_catalog and phases & {"modules", "deps"}:
+        from scripts.deepwiki.catalog import Catalog, default_catalog_path
 
-    nav_root = generate_root_docs()
-    # Optionally generate aggregated root dependency map
-    if args.root_deps:
-        generate_root_dependency_map(create_dot=True, update_dot=args.root_graph_update)
-    generate_home()
-    generate_mkdocs_yml(nav_modules, nav_root, force_nav=args.force_nav)
-    print(
-        "✅ MkDocs site content generated under ./docs and navigation written to mkdocs.yml"
-        if args.force_nav
-        else "✅ MkDocs site content generated under ./docs (mkdocs.yml left untouched)"
-    )
+        catalog = Catalog(args.catalog or default_catalog_path(args.cache_dir))
+    try:
+        generate_docs(args, catalog, phases)
+    finally:
+        if catalog is not None:
+            catalog.close()
+    if args.build_site is not None:
+        from scripts.deepwiki.site_build import build_site
+
+        with span("site"):
+            build_site(args.build_site, jobs=args.jobs, cache_dir=args.cache_dir)
+
+
+def generate_docs(args: argparse.Namespace, catalog: Optional["Catalog"], phases: Iterable[str] = PHASES):
+    """The generation phases proper, limited to ``phases``.
+
+    Every scan is also synced into ``catalog`` when enabled. Phases that do
+    not run leave their pages alone; heavy dependencies (python-hcl2,
+    asyncio, process pools) are only imported by the phases that use them.
+    """
+    phases = set(phases)
+    plan = plan_changes(args.changed_since, args.search_index) if args.changed_since is not None else None
+    if plan is not None:
+        phases -= {phase for phase, needed in (("modules", plan.modules or plan.examples), ("root", plan.root),
+                                               ("deps", plan.terraform)) if not needed}
+    search_index = None
+    if args.search_index and phases & {"modules", "root"}:
+        from scripts.deepwiki.search_index import SearchIndex
+
+        search_index = SearchIndex()
+    if "modules" in phases:
+        examples = None
+        if args.examples:
+            with span("examples"):
+                examples = build_examples_index(args.jobs, args.use_cache, args.cache_dir)
+        remote_objects = None
+        if args.remote_inputs:
+            from scripts.deepwiki.remote_objects import build_remote_objects_index
+
+            with span("remote_objects index"):
+                remote_objects = build_remote_objects_index(args.use_cache, args.cache_dir)
+        only = None
+        if plan is not None:
+            only = plan.modules | (stale_example_pages(examples) if plan.examples and examples is not None else set())
+            if plan.root and remote_objects is not None:
+                only |= stale_remote_input_pages(remote_objects)
+        with span("modules"):
+            nav_modules, _ = generate_modules_docs(
+                create_dot=args.create_dot,
+                update_dot=args.update_dot,
+                jobs=args.jobs,
+                dot_concurrency=args.dot_concurrency,
+                dot_timeout=args.dot_timeout,
+                use_cache=args.use_cache,
+                cache_dir=args.cache_dir,
+                parse_cache_mb=args.parse_cache_mb,
+                catalog=catalog,
+                examples=examples,
+                search_index=search_index,
+                only=only,
+                remote_objects=remote_objects,
+            )
+        if not nav_modules:
+            print("❌ No modules processed. Check the modules directory path.", file=sys.stderr)
+            sys.exit(1)
+    elif "nav" in phases:
+        nav_modules = modules_nav(discover_modules())
+
+    if "root" in phases:
+        with span("root docs"):
+            nav_root = generate_root_docs(use_cache=args.use_cache, cache_dir=args.cache_dir,
+                                          search_index=search_index)
+    elif "nav" in phases:
+        nav_root = [root_nav_entry(fn) for fn in root_tf_files()]
+    if "deps" in phases:
+        # Optionally generate aggregated root dependency map
+        if args.root_deps:
+            with span("dependency map"):
+                generate_root_dependency_map(
+                    create_dot=True,
+                    update_dot=args.root_graph_update,
+                    page_budget=args.page_budget_kb * 1024,
+                    collapse_categories=args.collapse_categories,
+                    hops=args.hops,
+                    static_graph=args.static_graph,
+                )
+        if catalog is not None:
+            with span("catalog"):
+                catalog.update_root(os.path.join(DOCS_ROOT, "root", "graph.dot"))
+    if phases & PAGE_PHASES:
+        with span("diagrams"):
+            # Only a run that wrote every page knows which SVGs are still referenced
+            finish_diagrams(prune=PAGE_PHASES <= phases and plan is None)
+    if "nav" in phases:
+        with span("home"):
+            generate_home()
+        with span("mkdocs.yml"):
+            generate_mkdocs_yml(nav_modules, nav_root, force_nav=args.force_nav, search_index=args.search_index)
+    if search_index is not None:
+        # After the home page, which the pages shard indexes
+        with span("search index"):
+            search_index.close()
+    print(write_summary())
+    if "nav" not in phases:
+        print(f"✅ Regenerated {', '.join(p for p in PHASES if p in phases)} (mkdocs.yml left untouched)")
+    else:
+        print(
+            "✅ MkDocs site content generated under ./docs and navigation written to mkdocs.yml"
+            if args.force_nav
+            else "✅ MkDocs site content generated under ./docs (mkdocs.yml left untouched)"
+        )
 
 
 if __name__ == "__main__":
-    main()
+    # Hand over to the importable copy of this module: watch.py and the other
+    # feature modules import it as scripts.deepwiki.generate_mkdocs_auto and
+    # have to share its state (output paths, write stats, tracer)
+    sys.path.insert(0, REPO_ROOT)
+    from scripts.deepwiki import generate_mkdocs_auto
+
+    generate_mkdocs_auto.main()
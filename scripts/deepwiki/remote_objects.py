@@ -0,0 +1,181 @@
+"""remote_objects wiring index (``local.remote_objects.tf``, ``locals.combined_objects.tf``).
+
+Resolves every ``var.remote_objects.<key>`` a module reads to the root module
+calls producing it, for the "Remote inputs" section of module pages.
+"""
+import os
+import posixpath
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+
+_LOCAL_REFERENCE = re.compile(r"\s*local\.([A-Za-z_][\w-]*)\s*")
+
+
+def _merge_arguments(expr: str) -> Optional[List[str]]:
+    """Arguments of a ``merge(a, b, ...)`` call; None for any other expression."""
+    expr = gma._strip_hcl_comments(expr).strip()
+    if not (expr.startswith("merge(") and expr.endswith(")")):
+        return None
+    # Blank out string contents so their brackets and commas do not count
+    masked = gma._LINE_STRING.sub(lambda m: '"' + " " * (len(m.group(0)) - 2) + '"', expr)
+    arguments: List[str] = []
+    depth = 0
+    start = len("merge(")
+    for i in range(start, len(expr) - 1):
+        ch = masked[i]
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+            if depth < 0:
+                return None  # merge(a) + merge(b)
+        elif ch == "," and depth == 0:
+            arguments.append(expr[start:i])
+            start = i + 1
+    arguments.append(expr[start:-1])
+    return [argument for argument in arguments if argument.strip()]
+
+
+def scan_remote_objects(files: List[str]) -> Dict[str, Any]:
+    """Resolve ``var.remote_objects`` keys to the root module calls producing them.
+
+    ``local.remote_objects`` maps each key to a ``local.combined_objects_*``,
+    which merges module outputs (and other locals) with objects of remote
+    landing zones. Every root module call passes its own ``remote_objects``:
+    an object, ``local.remote_objects`` or a ``merge()`` of those. Locals are
+    followed down to ``module.<call>`` (or root resource) producers.
+    Returns ``{"producers": {key: producers}}`` for ``local.remote_objects``,
+    ``{"consumers": {module: {key: producers}}}`` for the keys each module
+    folder is passed and ``{"sources": {"module.<call>": module}}``.
+    """
+    local_exprs: Dict[str, str] = {}
+    calls: List[Tuple[str, str, Optional[str]]] = []  # (call, folder under modules/, remote_objects expression)
+    declared: Set[str] = set()
+    for fn in files:
+        content = gma._read_text(os.path.join(gma.REPO_ROOT, fn))
+        for kind, labels, start, end in gma.scan_hcl_blocks(content):
+            body = content[start:end]
+            if kind == "locals":
+                local_exprs.update(gma.hcl_attributes(body))
+            elif kind == "resource" and len(labels) >= 2:
+                declared.add(f"{labels[0]}.{labels[1]}")
+            elif kind == "module" and labels:
+                attributes = gma.hcl_attributes(body)
+                m = gma._ROOT_MODULE_SOURCE.search("source =" + attributes.get("source", ""))
+                if m:
+                    calls.append((labels[0], m.group(1), attributes.get("remote_objects")))
+
+    resolved: Dict[str, Set[str]] = {}
+
+    def producers(expr: str) -> Set[str]:
+        found: Set[str] = set()
+        for reference in gma.wiring_references(expr, declared):
+            if reference[0] in ("module", "output"):
+                found.add(f"module.{reference[1]}")
+            elif reference[0] == "resource":
+                found.add(reference[1])
+            elif reference[0] == "local" and reference[1] in local_exprs:
+                name = reference[1]
+                if name not in resolved:
+                    resolved[name] = set()  # Cycles contribute nothing
+                    resolved[name] = producers(local_exprs[name])
+                found |= resolved[name]
+        return found
+
+    def passed(expr: str, seen: frozenset = frozenset()) -> Optional[Dict[str, str]]:
+        """``{key: expression}`` of a ``remote_objects`` value; None when it is not static."""
+        attributes = gma._object_attributes(expr)
+        if attributes is not None:
+            return attributes
+        arguments = _merge_arguments(expr)
+        if arguments is not None:
+            merged: Dict[str, str] = {}
+            for argument in arguments:
+                merged.update(passed(argument, seen) or {})
+            return merged
+        m = _LOCAL_REFERENCE.fullmatch(gma._strip_hcl_comments(expr))
+        if m and m.group(1) in local_exprs and m.group(1) not in seen:
+            return passed(local_exprs[m.group(1)], seen | {m.group(1)})
+        return None
+
+    consumers: Dict[str, Dict[str, Set[str]]] = {}
+    for _, folder, expr in calls:
+        keys = passed(expr) if expr is not None else None
+        if keys is not None:
+            wired = consumers.setdefault(folder, {})
+            for key, value in keys.items():
+                wired.setdefault(key, set()).update(producers(value))
+    return {
+        "producers": {key: sorted(producers(value))
+                      for key, value in sorted((passed("local.remote_objects") or {}).items())},
+        "consumers": {folder: {key: sorted(values) for key, values in sorted(wired.items())}
+                      for folder, wired in sorted(consumers.items())},
+        "sources": {f"module.{call}": folder for call, folder, _ in sorted(calls)},
+    }
+
+
+class RemoteObjectsIndex:
+    """The producers of every ``var.remote_objects`` key, from ``scan_remote_objects()``."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.producers: Dict[str, List[str]] = data["producers"]
+        self.consumers: Dict[str, Dict[str, List[str]]] = data["consumers"]
+        self.sources: Dict[str, str] = data["sources"]
+
+    def inputs(self, module: str, keys: Iterable[str]) -> List[Tuple[str, Optional[List[str]]]]:
+        """Producers of the remote objects ``module`` reads; None for keys its root call does not pass.
+
+        Modules no root call passes ``remote_objects`` to (nested modules, for
+        instance) get the producers of the same key in ``local.remote_objects``.
+        """
+        wired = self.consumers.get(module)
+        if wired is None:
+            return [(key, self.producers.get(key, [])) for key in keys]
+        return [(key, wired.get(key)) for key in keys]
+
+    def consuming_modules(self, key: str) -> List[str]:
+        """Module folders whose root calls pass ``key`` in their ``remote_objects``."""
+        return [module for module, wired in self.consumers.items() if key in wired]
+
+
+def build_remote_objects_index(use_cache: bool = True, cache_dir: str = "") -> RemoteObjectsIndex:
+    """``scan_remote_objects()`` of the root ``.tf`` files, cached under their content hash."""
+    files = gma.root_tf_files()
+    key = gma.content_hash([os.path.join(gma.REPO_ROOT, fn) for fn in files])
+    cache_dir = cache_dir or gma.default_cache_dir()
+    hit = gma.load_cache(cache_dir, "remote_objects").get("index") if use_cache else None
+    cached = bool(hit and hit.get("key") == key)
+    if cached:
+        data = hit["data"]
+    else:
+        data = scan_remote_objects(files)
+        if use_cache:
+            gma.save_cache(cache_dir, "remote_objects", {"index": {"key": key, "data": data}})
+    print(f"remote_objects: {len(data['producers'])} keys, {len(data['consumers'])} modules wired"
+          + (" (cached)" if cached else ""))
+    return RemoteObjectsIndex(data)
+
+
+def format_remote_inputs(module: str, inputs: List[Tuple[str, Optional[List[str]]]],
+                         index: RemoteObjectsIndex) -> str:
+    """Markdown table of ``inputs`` (from ``RemoteObjectsIndex.inputs()``), linking producers to their pages."""
+    base = posixpath.dirname(f"modules/{module}.md")
+
+    def producer(name: str) -> str:
+        folder = index.sources.get(name)
+        if folder is None:
+            return f"`{name}`"
+        return f"[`{name}`]({posixpath.relpath(f'modules/{folder}.md', base)})"
+
+    lines = ["| Key | Produced by |", "|-----|-------------|"]
+    for key, producers in inputs:
+        if producers is None:
+            cell = "Not passed by the root module call"
+        elif not producers:
+            cell = "Remote landing zones and data sources only"
+        else:
+            cell = ", ".join(producer(name) for name in producers)
+        lines.append(f"| `{key}` | {cell} |")
+    return "\n".join(lines)
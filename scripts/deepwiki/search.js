@@ -0,0 +1,221 @@
+// DeepWiki search over the shards prebuilt by generate_mkdocs_auto.py (docs/assets/search/).
+//
+// manifest.json lists one shard per module category, one for root files and
+// one for the hand-written pages, each with a Bloom filter of its tokens and their prefixes. Nothing is
+// downloaded until the search box is used, and then only the shards whose
+// filter holds every query token.
+(function () {
+  "use strict";
+
+  var browser = typeof document !== "undefined";
+  var indexUrl = browser ? new URL(".", document.currentScript.src) : null;
+  var siteUrl = browser ? new URL("../../", indexUrl) : null;
+  var MAX_RESULTS = 20;
+  var WEIGHTS = { exact: 20, title: 10, heading: 5, resource: 5, name: 3, description: 1 };
+
+  var manifest = null;
+  var shards = {};
+
+  function tokens(text) {
+    return (text.toLowerCase().match(/[a-z0-9]+/g) || []);
+  }
+
+  function fnv1a(text, seed) {
+    var h = seed >>> 0;
+    for (var i = 0; i < text.length; i++) {
+      h = Math.imul(h ^ text.charCodeAt(i), 0x01000193) >>> 0;
+    }
+    return h;
+  }
+
+  function mayContain(shard, token) {
+    if (!shard.bitmap) {
+      var raw = atob(shard.bloom);
+      shard.bitmap = new Uint8Array(raw.length);
+      for (var i = 0; i < raw.length; i++) shard.bitmap[i] = raw.charCodeAt(i);
+    }
+    var h1 = fnv1a(token, 0x811c9dc5);
+    var h2 = (fnv1a(token, 0x01000193) | 1) >>> 0;
+    for (var k = 0; k < manifest.hashes; k++) {
+      // (h1 + k * h2) mod bits without overflowing 2^53
+      var bit = (h1 % shard.bits + (k * (h2 % shard.bits)) % shard.bits) % shard.bits;
+      if (!(shard.bitmap[bit >> 3] & (1 << (bit & 7)))) return false;
+    }
+    return true;
+  }
+
+  var fetchJson = function (file) {
+    return fetch(new URL(file, indexUrl)).then(function (r) {
+      if (!r.ok) throw new Error(file + ": HTTP " + r.status);
+      return r.json();
+    });
+  };
+
+  // A failed fetch is not cached, so the next query tries again
+  function loadManifest() {
+    if (!manifest) {
+      manifest = fetchJson("manifest.json").then(function (m) { manifest = m; return m; },
+        function (error) { manifest = null; throw error; });
+    }
+    return Promise.resolve(manifest);
+  }
+
+  function loadShard(name) {
+    if (!shards[name]) {
+      shards[name] = fetchJson(manifest.shards[name].file).catch(function (error) {
+        delete shards[name];
+        throw error;
+      });
+    }
+    return shards[name];
+  }
+
+  function fieldScore(token, text, weight) {
+    var words = tokens(text);
+    for (var i = 0; i < words.length; i++) {
+      if (words[i].lastIndexOf(token, 0) === 0) return weight;
+    }
+    return 0;
+  }
+
+  // Best field of the document for one token: [score, snippet]
+  function match(doc, token) {
+    var best = [fieldScore(token, doc.title, WEIGHTS.title), ""];
+    (doc.headings || []).forEach(function (heading) {
+      var score = fieldScore(token, heading, WEIGHTS.heading);
+      if (score > best[0]) best = [score, heading];
+    });
+    doc.resources.forEach(function (resource) {
+      var score = fieldScore(token, resource, WEIGHTS.resource);
+      if (score > best[0]) best = [score, resource];
+    });
+    doc.variables.concat(doc.outputs).forEach(function (item) {
+      var score = Math.max(fieldScore(token, item[0], WEIGHTS.name), fieldScore(token, item[1], WEIGHTS.description));
+      if (score > best[0]) best = [score, item[1] ? item[0] + " — " + item[1] : item[0]];
+    });
+    return best;
+  }
+
+  // A resource type, variable or output named exactly like the query (e.g. "azurerm_key_vault_key")
+  function exact(doc, query) {
+    var names = doc.resources.concat(doc.variables.concat(doc.outputs).map(function (item) { return item[0]; }));
+    return names.indexOf(query) >= 0 || doc.title.toLowerCase() === query ? WEIGHTS.exact : 0;
+  }
+
+  function search(query) {
+    query = query.trim().toLowerCase();
+    var words = tokens(query).filter(function (t) { return t.length >= manifest.min_prefix; });
+    if (!words.length) return Promise.resolve([]);
+    var names = Object.keys(manifest.shards).filter(function (name) {
+      return words.every(function (t) { return mayContain(manifest.shards[name], t); });
+    });
+    return Promise.all(names.map(loadShard)).then(function (loaded) {
+      var results = [];
+      loaded.forEach(function (shard) {
+        shard.docs.forEach(function (doc) {
+          var total = 0, snippet = "";
+          for (var i = 0; i < words.length; i++) {
+            var m = match(doc, words[i]);
+            if (!m[0]) return;
+            total += m[0];
+            snippet = snippet || m[1];
+          }
+          results.push({ doc: doc, score: total + exact(doc, query), snippet: snippet });
+        });
+      });
+      results.sort(function (a, b) { return b.score - a.score || a.doc.title.localeCompare(b.doc.title); });
+      return results.slice(0, MAX_RESULTS);
+    });
+  }
+
+  function escape(text) {
+    var div = document.createElement("div");
+    div.textContent = text;
+    return div.innerHTML;
+  }
+
+  function render(panel, results, query, failed) {
+    if (!query) {
+      panel.hidden = true;
+      return;
+    }
+    panel.hidden = false;
+    if (failed) {
+      panel.innerHTML = '<div class="deepwiki-search__empty">Search is unavailable, please try again</div>';
+      return;
+    }
+    if (!results.length) {
+      panel.innerHTML = '<div class="deepwiki-search__empty">No matching pages</div>';
+      return;
+    }
+    panel.innerHTML = results.map(function (r) {
+      return '<a class="deepwiki-search__result" href="' + new URL(r.doc.location, siteUrl).href + '">' +
+        "<strong>" + escape(r.doc.title) + "</strong>" +
+        (r.snippet ? "<span>" + escape(r.snippet) + "</span>" : "") + "</a>";
+    }).join("");
+  }
+
+  var STYLE = [
+    ".deepwiki-search{position:relative;margin-left:auto;font-size:.7rem}",
+    ".deepwiki-search input{width:14rem;padding:.3rem .5rem;border:0;border-radius:.2rem}",
+    ".deepwiki-search__panel{position:absolute;right:0;z-index:10;width:28rem;max-height:70vh;overflow:auto;",
+    "background:#fff;color:#222;box-shadow:0 .2rem .6rem rgba(0,0,0,.3);border-radius:.2rem}",
+    ".deepwiki-search__result{display:block;padding:.4rem .6rem;color:inherit;border-bottom:1px solid #eee}",
+    ".deepwiki-search__result span{display:block;opacity:.7;white-space:nowrap;overflow:hidden;text-overflow:ellipsis}",
+    ".deepwiki-search__empty{padding:.4rem .6rem}",
+  ].join("");
+
+  function init() {
+    var style = document.createElement("style");
+    style.textContent = STYLE;
+    document.head.appendChild(style);
+
+    var box = document.createElement("div");
+    box.className = "deepwiki-search";
+    box.innerHTML = '<input type="search" placeholder="Search modules, resources, variables" ' +
+      'aria-label="Search"><div class="deepwiki-search__panel" hidden></div>';
+    var header = document.querySelector(".md-header__inner") || document.body;
+    header.insertBefore(box, header === document.body ? header.firstChild : null);
+
+    var input = box.querySelector("input");
+    var panel = box.querySelector(".deepwiki-search__panel");
+    var pending = 0;
+    var timer = null;
+    input.addEventListener("focus", function () { loadManifest().catch(function () {}); }, { once: true });
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        var query = input.value.trim();
+        var ticket = ++pending;
+        loadManifest().then(function () { return search(query); }).then(function (results) {
+          if (ticket === pending) render(panel, results, query, false);
+        }, function (error) {
+          if (ticket === pending) render(panel, [], query, true);
+          console.error("DeepWiki search:", error);
+        });
+      }, 150);
+    });
+    document.addEventListener("click", function (event) {
+      if (!box.contains(event.target)) panel.hidden = true;
+    });
+  }
+
+  if (!browser) {
+    // Under Node (tests): serve the index files from memory and report which shards were fetched
+    module.exports = {
+      fnv1a: fnv1a,
+      search: search,
+      load: function (files) {
+        fetchJson = function (file) {
+          return file in files ? Promise.resolve(files[file]) : Promise.reject(new Error(file + ": not found"));
+        };
+        return loadManifest();
+      },
+      fetched: function () { return Object.keys(shards).sort(); },
+    };
+  } else if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", init);
+  } else {
+    init();
+  }
+})();
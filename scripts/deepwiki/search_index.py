@@ -0,0 +1,217 @@
+"""Prebuilt search index (``docs/assets/search/``, ``--search-index``).
+
+Pages are indexed while they are generated: one JSON shard per module
+category, one for the root files and one for the hand-written pages, plus a
+manifest with a Bloom filter per shard that ``search.js`` uses to fetch only
+the shards a query can match.
+"""
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+
+SEARCH_DIRNAME = os.path.join("assets", "search")
+# Bump whenever the shard or manifest layout changes; shards of an older layout are all rebuilt
+SEARCH_INDEX_VERSION = "2"
+SEARCH_ROOT_SHARD = "root"
+# Hand-written pages: everything under docs/ except the generated module, root and asset folders
+SEARCH_PAGES_SHARD = "pages"
+SEARCH_GENERATED_DIRS = ("modules", "root", "assets")
+SEARCH_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "search.js")
+# Descriptions are cut to this many characters in the shards
+SEARCH_DESCRIPTION_CHARS = 160
+# Bloom filters: bits per token (~1% false positives with BLOOM_HASHES hashes) and shortest indexed prefix
+BLOOM_BITS_PER_TOKEN = 10
+BLOOM_HASHES = 7
+SEARCH_MIN_PREFIX = 2
+_SEARCH_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def search_tokens(text: str) -> Set[str]:
+    """Lower-case words of ``text``, splitting identifiers at underscores, dots and dashes."""
+    return set(_SEARCH_TOKEN.findall(text.lower()))
+
+
+def _fnv1a(text: str, seed: int = 0x811C9DC5) -> int:
+    h = seed
+    for byte in text.encode("utf-8"):
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def bloom_filter(tokens: Iterable[str]) -> Tuple[int, bytes]:
+    """``(bits, bitmap)`` of a Bloom filter holding every token and its prefixes.
+
+    Positions use double hashing over two FNV-1a seeds; ``search.js``
+    computes the same positions to decide which shards a query may hit.
+    """
+    keys = {token[:i] for token in tokens for i in range(SEARCH_MIN_PREFIX, len(token) + 1)}
+    size = max(64, (len(keys) * BLOOM_BITS_PER_TOKEN + 7) // 8 * 8)
+    bitmap = bytearray(size // 8)
+    for key in keys:
+        h1, h2 = _fnv1a(key), _fnv1a(key, 0x01000193) | 1
+        for i in range(BLOOM_HASHES):
+            bit = (h1 + i * h2) % size
+            bitmap[bit >> 3] |= 1 << (bit & 7)
+    return size, bytes(bitmap)
+
+
+def _search_description(value: Any) -> str:
+    text = " ".join(str(value or "").split())
+    return text if len(text) <= SEARCH_DESCRIPTION_CHARS else text[:SEARCH_DESCRIPTION_CHARS - 1] + "…"
+
+
+def module_search_doc(name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Searchable fields of one module page; diagrams and DOT content are left out."""
+    return {
+        "location": f"modules/{name}/",
+        "title": name,
+        "resources": data["resource_types"],
+        "variables": [[v.name, _search_description(v.description)] for v in data["variables"]],
+        "outputs": [[o.name, _search_description(o.description)] for o in data["outputs"]],
+    }
+
+
+def root_search_doc(fn: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    title = os.path.splitext(fn)[0]
+    return {"location": f"root/{title}/", "title": fn, "resources": data["nodes"], "variables": [], "outputs": []}
+
+
+def page_search_doc(rel: str, text: str) -> Dict[str, Any]:
+    """Title and section headings of a hand-written page (``rel`` relative to docs/)."""
+    stem = os.path.splitext(rel)[0].replace(os.sep, "/")
+    location = stem[:-len("index")] if stem == "index" or stem.endswith("/index") else f"{stem}/"
+    title, headings, fenced = "", [], False
+    for line in text.splitlines():
+        if line.lstrip().startswith(("```", "~~~")):
+            fenced = not fenced
+        elif not fenced and line.startswith("#"):
+            level, _, heading = line.partition(" ")
+            if set(level) == {"#"} and heading.strip():
+                if level == "#" and not title:
+                    title = heading.strip()
+                else:
+                    headings.append(heading.strip())
+    return {"location": location, "title": title or os.path.basename(stem), "headings": headings,
+            "resources": [], "variables": [], "outputs": []}
+
+
+class SearchIndex:
+    """Search shards written next to the pages: one per module category, one for root files and
+    one for the hand-written pages.
+
+    ``manifest.json`` lists every shard with a Bloom filter of its tokens, so
+    the browser (``search.js``) fetches only the shards a query can match.
+    Shards are keyed by the hash of their documents and only rewritten when
+    those change, so a partial update (``--changed-since``) ends up with the
+    same files and manifest as a full one.
+    """
+
+    def __init__(self, directory: str = ""):
+        self.directory = directory or os.path.join(gma.DOCS_ROOT, SEARCH_DIRNAME)
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        version = f"{SEARCH_INDEX_VERSION}/{gma.GENERATOR_VERSION}"
+        self.current = manifest.get("version") == version
+        self.shards: Dict[str, Dict[str, Any]] = manifest.get("shards", {}) if self.current else {}
+        self.version = version
+
+    def _update(self, shard: str, docs: List[Dict[str, Any]]) -> bool:
+        import base64
+
+        body = json.dumps({"shard": shard, "docs": docs}, separators=(",", ":"))
+        key = hashlib.sha256(f"{self.version}\0{body}".encode("utf-8")).hexdigest()
+        filename = f"{shard}.json"
+        current = self.shards.get(shard)
+        if current and current["key"] == key and os.path.exists(os.path.join(self.directory, filename)):
+            return False
+        tokens: Set[str] = set()
+        for doc in docs:
+            tokens |= search_tokens(doc["title"])
+            tokens |= search_tokens(" ".join(doc.get("headings", ())))
+            tokens |= search_tokens(" ".join(doc["resources"]))
+            for name, description in doc["variables"] + doc["outputs"]:
+                tokens |= search_tokens(f"{name} {description}")
+        bits, bitmap = bloom_filter(tokens)
+        gma.write(os.path.join(self.directory, filename), body)
+        self.shards[shard] = {"file": filename, "key": key, "docs": len(docs), "bits": bits,
+                              "bloom": base64.b64encode(bitmap).decode("ascii")}
+        return True
+
+    def _docs(self, shard: str) -> Dict[str, Dict[str, Any]]:
+        """``{title: doc}`` of the shard as last written, empty if it is not in the manifest."""
+        if shard not in self.shards:
+            return {}
+        try:
+            with open(os.path.join(self.directory, self.shards[shard]["file"]), "r", encoding="utf-8") as f:
+                return {doc["title"]: doc for doc in json.load(f)["docs"]}
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def update_modules(self, entries: Dict[str, Dict[str, Any]], names: Optional[Set[str]] = None) -> int:
+        """Sync the category shards with ``{"category/module": {"key", "data"}}``; returns shards rebuilt.
+
+        With ``names``, only those modules are updated (or dropped when missing
+        from ``entries``); the other documents of their shards are kept.
+        """
+        by_category: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if names is None:
+            stale = set(self.shards) - {name.split("/")[0] for name in entries}
+            for shard in stale - {SEARCH_ROOT_SHARD, SEARCH_PAGES_SHARD}:
+                del self.shards[shard]
+        for name in sorted(entries) if names is None else sorted(names):
+            category = name.split("/")[0]
+            if category not in by_category:
+                by_category[category] = {} if names is None else self._docs(category)
+            by_category[category].pop(name, None)
+            if name in entries:
+                by_category[category][name] = module_search_doc(name, entries[name]["data"])
+        rebuilt = 0
+        for category, docs in by_category.items():
+            if docs:
+                rebuilt += self._update(category, [docs[title] for title in sorted(docs)])
+            else:
+                self.shards.pop(category, None)
+        return rebuilt
+
+    def update_root(self, entries: Dict[str, Dict[str, Any]]) -> bool:
+        """Sync the root shard with ``{"file.tf": {"key", "data"}}`` from the root cache."""
+        docs = [root_search_doc(fn, entry["data"]) for fn, entry in sorted(entries.items())]
+        return self._update(SEARCH_ROOT_SHARD, docs)
+
+    def update_pages(self) -> bool:
+        """Sync the pages shard with the hand-written Markdown under docs/ (guides, architecture, ...)."""
+        docs = []
+        for dirpath, dirnames, filenames in os.walk(gma.DOCS_ROOT):
+            if dirpath == gma.DOCS_ROOT:
+                dirnames[:] = [d for d in dirnames if d not in SEARCH_GENERATED_DIRS]
+            dirnames.sort()
+            for fn in sorted(filenames):
+                if fn.endswith(".md"):
+                    path = os.path.join(dirpath, fn)
+                    docs.append(page_search_doc(os.path.relpath(path, gma.DOCS_ROOT), gma._read_text(path)))
+        if docs:
+            return self._update(SEARCH_PAGES_SHARD, docs)
+        self.shards.pop(SEARCH_PAGES_SHARD, None)
+        return False
+
+    def close(self):
+        """Index the hand-written pages, write the manifest and the loader script, and drop shards
+        of categories that went away."""
+        self.update_pages()
+        manifest = {"version": self.version, "hashes": BLOOM_HASHES, "min_prefix": SEARCH_MIN_PREFIX,
+                    "shards": dict(sorted(self.shards.items()))}
+        gma.write(self.manifest_path, json.dumps(manifest, indent=1, sort_keys=True) + "\n")
+        gma.write(os.path.join(self.directory, "search.js"), gma._read_text(SEARCH_SCRIPT))
+        keep = tuple(shard["file"] for shard in self.shards.values()) + ("manifest.json", "search.js")
+        for fn in os.listdir(self.directory):
+            if fn.endswith(".json") and fn not in keep:
+                os.remove(os.path.join(self.directory, fn))
+                gma.WRITE_STATS["removed"] += 1
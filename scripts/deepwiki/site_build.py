@@ -0,0 +1,292 @@
+"""Partitioned site build (``--build-site``).
+
+The generated docs are built as one MkDocs sub-site per module category plus
+a root one, in parallel ``mkdocs build`` processes, and merged into a single
+site; partitions whose pages did not change are not rebuilt.
+"""
+import functools
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+
+SITE_ROOT_PARTITION = "root"
+SITE_DIRNAME = "site"
+# Pages of other partitions are missing from each sub-site on purpose; MkDocs should not warn about them
+SITE_PARTITION_VALIDATION = {"nav": {"not_found": "info"}, "links": {"not_found": "info"}}
+_HTML_LINK = re.compile(r'\b(href|src)="([^":?#]+)((?:[?#][^"]*)?)"')
+_SITEMAP_URL = re.compile(r"<url>.*?</url>", re.S)
+
+
+def page_url(page: str) -> str:
+    """Site-relative URL of a docs page under MkDocs directory URLs ("" for the home page)."""
+    stem = page[:-len(".md")]
+    if stem == "index" or stem.endswith("/index"):
+        return stem[:-len("index")]
+    return f"{stem}/"
+
+
+def site_partition(page: str) -> str:
+    """``modules/<category>/...`` pages build in their category's sub-site, everything else in the root one.
+
+    A module directly under modules/ (``modules/<category>.md``) is part of its category's sub-site too.
+    """
+    parts = page.split("/")
+    if parts[0] != "modules" or len(parts) < 2 or page == "modules/index.md":
+        return SITE_ROOT_PARTITION
+    if len(parts) == 2:
+        return parts[1][:-len(".md")] if parts[1].endswith(".md") else SITE_ROOT_PARTITION
+    return parts[1]
+
+
+def docs_files() -> Dict[str, str]:
+    """``{posix path relative to docs/: absolute path}`` of every file MkDocs would pick up."""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(gma.DOCS_ROOT):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for fn in filenames:
+            if not fn.startswith("."):
+                path = os.path.join(dirpath, fn)
+                files[os.path.relpath(path, gma.DOCS_ROOT).replace(os.sep, "/")] = path
+    return files
+
+
+def partition_nav(nav: Any, partition: str, pages: Set[str]) -> Any:
+    """``nav`` with pages of other partitions turned into links to their built URLs."""
+    if isinstance(nav, list):
+        return [partition_nav(item, partition, pages) for item in nav]
+    if isinstance(nav, dict):
+        return {title: partition_nav(value, partition, pages) for title, value in nav.items()}
+    if isinstance(nav, str) and nav in pages and site_partition(nav) != partition:
+        return page_url(nav) or "./"
+    return nav
+
+
+def _load_nav(config_path: str) -> Any:
+    try:
+        import yaml
+    except ImportError:
+        raise SystemExit("PyYAML is required for --build-site. Install it with 'pip install mkdocs'.")
+
+    class Loader(yaml.SafeLoader):
+        pass
+
+    # Theme and extension configs may use !!python/name and friends; only the nav matters here
+    Loader.add_multi_constructor("", lambda loader, suffix, node: None)
+    with open(config_path, "r", encoding="utf-8") as f:
+        return (yaml.load(f, Loader=Loader) or {}).get("nav")
+
+
+def _sync_files(files: Dict[str, str], dest: str) -> int:
+    """Mirror ``{relative path: source}`` into ``dest``; returns the number of files copied."""
+    import shutil
+
+    copied = 0
+    for rel, src in files.items():
+        target = os.path.join(dest, rel)
+        st = os.stat(src)
+        try:
+            current = os.stat(target)
+            if current.st_size == st.st_size and current.st_mtime_ns == st.st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            gma.ensure_dir(os.path.dirname(target))
+        shutil.copy2(src, target)
+        copied += 1
+    keep = {os.path.normpath(os.path.join(dest, rel)) for rel in files}
+    for dirpath, _, filenames in os.walk(dest, topdown=False):
+        for fn in filenames:
+            if os.path.join(dirpath, fn) not in keep:
+                os.remove(os.path.join(dirpath, fn))
+        if dirpath != dest and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return copied
+
+
+def fix_partition_links(site_dir: str, pages: List[str], partition_of: Dict[str, str]):
+    """Point links MkDocs could not resolve in a sub-site at the pages and files of the merged site.
+
+    MkDocs leaves links to documents outside its docs_dir as written, relative
+    to the Markdown file; they are resolved against ``partition_of`` (every
+    docs file and the partition that builds it, "" for static files) and
+    rewritten relative to the built page.
+    """
+    for page in pages:
+        out_dir = page_url(page).rstrip("/")
+        html_path = os.path.join(site_dir, out_dir, "index.html")
+        if not os.path.exists(html_path):
+            continue
+        partition = site_partition(page)
+
+        def rewrite(m: "re.Match") -> str:
+            link = m.group(2)
+            if link.startswith("/"):
+                return m.group(0)
+            target = posixpath.normpath(posixpath.join(posixpath.dirname(page), link))
+            owner = partition_of.get(target)
+            if owner is None or owner == partition:
+                return m.group(0)
+            url = page_url(target) if target.endswith(".md") else target
+            rel = posixpath.relpath(url or ".", out_dir or ".")
+            if target.endswith(".md"):
+                rel = "./" if rel == "." else f"{rel}/"
+            return f'{m.group(1)}="{rel}{m.group(3)}"'
+
+        html = gma._read_text(html_path)
+        fixed = _HTML_LINK.sub(rewrite, html)
+        if fixed != html:
+            with open(html_path, "w", encoding="utf-8") as f:
+                f.write(fixed)
+
+
+def _run_mkdocs(binary: str, config_path: str) -> str:
+    """``mkdocs build`` one sub-site; returns an error message or ''."""
+    import subprocess
+
+    try:
+        with gma.span("mkdocs build", "subprocess", config=config_path):
+            proc = subprocess.run([binary, "build", "--quiet", "--config-file", config_path],
+                                  cwd=os.path.dirname(config_path), capture_output=True)
+    except OSError as exc:
+        return str(exc)
+    if proc.returncode != 0:
+        return proc.stderr.decode("utf-8", "ignore").strip()[-500:] or f"exit code {proc.returncode}"
+    return ""
+
+
+def _merge_sitemaps(paths: List[str]) -> str:
+    urls = [url for path in paths if os.path.exists(path) for url in _SITEMAP_URL.findall(gma._read_text(path))]
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+            + "".join(f"    {url}\n" for url in urls) + "</urlset>\n")
+
+
+def _merge_search_indexes(paths: List[str]) -> Optional[str]:
+    """The built-in search plugin's per-partition indexes as one (without ``--search-index``)."""
+    merged = None
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if merged is None:
+                merged = index
+            else:
+                merged["docs"].extend(index.get("docs", []))
+    return None if merged is None else json.dumps(merged, separators=(",", ":"))
+
+
+def build_site(site_dir: str = "", jobs: int = 1, cache_dir: str = "", binary: str = "mkdocs") -> List[str]:
+    """Build the site as one MkDocs sub-site per module category plus a root one, then merge them.
+
+    Each partition gets a config under ``<cache-dir>/site/<partition>/`` that
+    inherits mkdocs.yml (``INHERIT``) with its own docs_dir and the combined
+    nav, pages of other partitions becoming links to their URLs. Partitions
+    whose pages, nav and mkdocs.yml are unchanged since their last build are
+    skipped; the rest build in parallel ``mkdocs build`` processes. The merged
+    site takes theme assets and shared pages from the root partition, each
+    ``modules/<category>/`` tree from its partition and static docs files
+    (diagrams, search shards) straight from docs/. Returns the rebuilt partitions.
+    """
+    import gzip
+    import shutil
+
+    path = shutil.which(binary)
+    if not path:
+        raise SystemExit(f"'{binary}' not found; install it with 'pip install mkdocs-material'")
+    site_dir = site_dir or os.path.join(gma.REPO_ROOT, SITE_DIRNAME)
+    cache_dir = cache_dir or gma.default_cache_dir()
+    work_root = os.path.join(cache_dir, SITE_DIRNAME)
+    config_path = os.path.join(gma.REPO_ROOT, "mkdocs.yml")
+    nav = _load_nav(config_path)
+
+    files = docs_files()
+    pages = {rel for rel in files if rel.endswith(".md")}
+    partition_of = {rel: site_partition(rel) if rel in pages else "" for rel in files}
+    partitions: Dict[str, List[str]] = {SITE_ROOT_PARTITION: []}
+    for page in sorted(pages):
+        partitions.setdefault(site_partition(page), []).append(page)
+
+    cached = gma.load_cache(cache_dir, "site")
+    entries: Dict[str, Dict[str, Any]] = {}
+    pending: List[str] = []
+    with gma.span("site partitions", "stage"):
+        for name, members in sorted(partitions.items()):
+            work_dir = os.path.join(work_root, name)
+            config = "\n".join([
+                f"INHERIT: {json.dumps(os.path.relpath(config_path, work_dir).replace(os.sep, '/'))}",
+                "docs_dir: docs",
+                "site_dir: site",
+                "use_directory_urls: true",
+                f"validation: {json.dumps(SITE_PARTITION_VALIDATION, sort_keys=True)}",
+                f"nav: {json.dumps(partition_nav(nav, name, pages))}",
+            ]) + "\n"
+            digest = hashlib.sha256(f"{gma.content_hash([config_path])}\0{config}".encode("utf-8"))
+            for page in members:
+                digest.update(f"{page}\0{gma.content_hash([files[page]])}\0".encode("utf-8"))
+            entries[name] = {"key": digest.hexdigest()}
+            hit = cached.get(name)
+            if hit and hit.get("key") == entries[name]["key"] and os.path.isdir(os.path.join(work_dir, "site")):
+                continue
+            _sync_files({page: files[page] for page in members}, os.path.join(work_dir, "docs"))
+            gma.write(os.path.join(work_dir, "mkdocs.yml"), config)
+            pending.append(name)
+
+    print(f"Site: {len(pending)}/{len(partitions)} partitions to build")
+    from concurrent.futures import ThreadPoolExecutor
+
+    failures: List[Tuple[str, str]] = []
+    with gma.span("mkdocs build", "stage"), ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        configs = [os.path.join(work_root, name, "mkdocs.yml") for name in pending]
+        for name, error in zip(pending, executor.map(functools.partial(_run_mkdocs, path), configs)):
+            if error:
+                failures.append((name, error))
+                del entries[name]
+            else:
+                fix_partition_links(os.path.join(work_root, name, "site"), partitions[name], partition_of)
+            print(f"mkdocs build {'FAILED' if error else 'ok'}: {name}")
+    # Successful partitions are remembered even when another one failed
+    gma.save_cache(cache_dir, "site", entries)
+    if failures:
+        for name, error in failures:
+            print(f"  - {name}: {error}", file=sys.stderr)
+        raise SystemExit(f"❌ {len(failures)} site partitions failed to build")
+
+    with gma.span("site merge", "stage"):
+        merged: Dict[str, str] = {}
+        for name in sorted(partitions, key=lambda name: name != SITE_ROOT_PARTITION):
+            built = os.path.join(work_root, name, "site")
+            prefix = "" if name == SITE_ROOT_PARTITION else f"modules/{name}/"
+            for dirpath, dirnames, filenames in os.walk(built):
+                rel_dir = os.path.relpath(dirpath, built).replace(os.sep, "/")
+                rel_dir = "" if rel_dir == "." else f"{rel_dir}/"
+                if name != SITE_ROOT_PARTITION and not rel_dir.startswith(prefix):
+                    continue
+                for fn in filenames:
+                    rel = rel_dir + fn
+                    # modules/<category>/ of the root build only holds what the category build replaces
+                    if name == SITE_ROOT_PARTITION and site_partition(rel) != SITE_ROOT_PARTITION:
+                        continue
+                    merged[rel] = os.path.join(dirpath, fn)
+        merged.update({rel: src for rel, src in files.items() if rel not in pages})
+
+        combined_dir = os.path.join(work_root, "merged")
+        built_paths = [os.path.join(work_root, name, "site") for name in sorted(partitions)]
+        sitemap = _merge_sitemaps([os.path.join(built, "sitemap.xml") for built in built_paths])
+        if gma.write(os.path.join(combined_dir, "sitemap.xml"), sitemap) != "unchanged" or \
+                not os.path.exists(os.path.join(combined_dir, "sitemap.xml.gz")):
+            with open(os.path.join(combined_dir, "sitemap.xml.gz"), "wb") as f:
+                f.write(gzip.compress(sitemap.encode("utf-8"), mtime=0))
+        for fn in ("sitemap.xml", "sitemap.xml.gz"):
+            merged[fn] = os.path.join(combined_dir, fn)
+        search = _merge_search_indexes([os.path.join(built, "search", "search_index.json") for built in built_paths])
+        if search is not None:
+            gma.write(os.path.join(combined_dir, "search", "search_index.json"), search)
+            merged["search/search_index.json"] = os.path.join(combined_dir, "search", "search_index.json")
+        copied = _sync_files(merged, site_dir)
+    print(f"✅ Site merged into {site_dir} ({copied} files copied)")
+    return pending
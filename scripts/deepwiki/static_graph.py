@@ -0,0 +1,197 @@
+"""Static wiring graph: a terraform-free ``graph.dot`` for the root configuration (``--static-graph``).
+
+Module calls are followed into their source folders and references are
+traced through locals, variables and outputs down to resources, which gives
+the resource-level edges ``terraform graph`` would report.
+"""
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+
+class ModuleWiring:
+    """References between the locals, resources, outputs and module calls of one folder."""
+
+    def __init__(self, path: str):
+        scan = gma.ModuleScan(path)
+        spans = [(scan.files[fn], span) for fn in scan.files for span in scan.spans(fn)]
+        declared = {f"{labels[0]}.{labels[1]}" if kind == "resource" else f"data.{labels[0]}.{labels[1]}"
+                    for _, (kind, labels, _, _) in spans if kind in ("resource", "data") and len(labels) >= 2}
+        self.locals: Dict[str, Set[Tuple[str, ...]]] = {}
+        self.resources: Dict[str, Set[Tuple[str, ...]]] = {}
+        self.outputs: Dict[str, Set[Tuple[str, ...]]] = {}
+        # call name -> (source folder or None, argument references, for_each/count/depends_on references)
+        self.calls: Dict[str, Tuple[Optional[str], Dict[str, Set[Tuple[str, ...]]], Set[Tuple[str, ...]]]] = {}
+
+        for text, (kind, labels, start, end) in spans:
+            body = text[start:end]
+            if kind == "locals":
+                for name, expr in gma.hcl_attributes(body).items():
+                    self.locals[name] = gma.wiring_references(expr, declared)
+            elif kind in ("resource", "data", "output") and labels:
+                if kind == "output":
+                    target = self.outputs
+                    address = labels[0]
+                elif len(labels) >= 2:
+                    target = self.resources
+                    address = f"{labels[0]}.{labels[1]}" if kind == "resource" else f"data.{labels[0]}.{labels[1]}"
+                else:
+                    continue
+                depends_on = gma.hcl_attributes(body).get("depends_on", "")
+                target[address] = gma.wiring_references(body, declared) | gma.wiring_references(depends_on, declared, True)
+            elif kind == "module" and labels:
+                arguments: Dict[str, Set[Tuple[str, ...]]] = {}
+                meta: Set[Tuple[str, ...]] = set()
+                folder = None
+                for name, expr in gma.hcl_attributes(body).items():
+                    if name == "source":
+                        m = re.match(r'\s*"(\.{1,2}/[^"]*)"', expr)
+                        folder = os.path.normpath(os.path.join(path, m.group(1))) if m else None
+                    elif name in ("for_each", "count", "depends_on"):
+                        meta |= gma.wiring_references(expr, declared, whole_modules=name == "depends_on")
+                    elif name not in ("version", "providers"):
+                        arguments[name] = gma.wiring_references(expr, declared)
+                self.calls[labels[0]] = (folder, arguments, meta)
+
+
+def _wiring_graph(root: str) -> Tuple[Dict[str, Set[str]], Set[str]]:
+    """Instantiate the module tree under ``root`` into one graph of prefixed addresses.
+
+    Nodes are ``<prefix>var.x``, ``<prefix>local.x``, ``<prefix>output.x``,
+    resource addresses, and per call ``<call>.#expand`` (its for_each, count
+    and depends_on, which every resource inside waits for) and ``<call>.#all``
+    (every resource inside, for whole-module references). Each folder is
+    parsed once however often it is instantiated.
+    """
+    folders: Dict[str, ModuleWiring] = {}
+    graph: Dict[str, Set[str]] = {}
+    resources: Set[str] = set()
+
+    def instantiate(wiring: ModuleWiring, prefix: str, expand: Optional[str], stack: frozenset) -> List[str]:
+        def nodes(reference: Tuple[str, ...]) -> List[str]:
+            kind = reference[0]
+            if kind == "resource":
+                return [prefix + reference[1]]
+            if kind in ("var", "local"):
+                return [f"{prefix}{kind}.{reference[1]}"]
+            if reference[1] not in wiring.calls:
+                return []
+            call = f"{prefix}module.{reference[1]}."
+            return [call + "#all"] if kind == "module" else [f"{call}output.{reference[2]}"]
+
+        def link(node: str, references: Set[Tuple[str, ...]]):
+            graph.setdefault(node, set()).update(n for reference in references for n in nodes(reference))
+
+        for name, references in wiring.locals.items():
+            link(f"{prefix}local.{name}", references)
+        for name, references in wiring.outputs.items():
+            link(f"{prefix}output.{name}", references)
+        inside: List[str] = []
+        for address, references in wiring.resources.items():
+            node = prefix + address
+            link(node, references)
+            if expand:
+                graph[node].add(expand)
+            resources.add(node)
+            inside.append(node)
+        for name, (folder, arguments, meta) in wiring.calls.items():
+            call = f"{prefix}module.{name}."
+            link(call + "#expand", meta)
+            if expand:
+                graph[call + "#expand"].add(expand)
+            for argument, references in arguments.items():
+                link(f"{call}var.{argument}", references)
+            children: List[str] = []
+            if folder and folder not in stack and os.path.isdir(folder):
+                child = folders.get(folder) or folders.setdefault(folder, ModuleWiring(folder))
+                children = instantiate(child, call, call + "#expand", stack | {folder})
+            graph[call + "#all"] = set(children)
+            inside.extend(children)
+        return inside
+
+    instantiate(ModuleWiring(root), "", None, frozenset())
+    return graph, resources
+
+
+def _first_resources(graph: Dict[str, Set[str]], resources: Set[str]):
+    """Resolver for the resources first reached from a node through locals, variables and outputs."""
+    hits: Dict[str, frozenset] = {}
+
+    def resolve(start: str) -> frozenset:
+        if start in hits:
+            return hits[start]
+        found: Dict[str, Set[str]] = {start: set()}
+        work = [(start, iter(graph.get(start, ())))]
+        while work:
+            node, successors = work[-1]
+            for succ in successors:
+                if succ in resources:
+                    found[node].add(succ)
+                elif succ in hits:
+                    found[node] |= hits[succ]
+                elif succ not in found:  # Cycles contribute nothing
+                    found[succ] = set()
+                    work.append((succ, iter(graph.get(succ, ()))))
+                    break
+            else:
+                work.pop()
+                hits[node] = frozenset(found[node])
+                if work:
+                    found[work[-1][0]] |= hits[node]
+        return hits[start]
+
+    return resolve
+
+
+def static_resource_edges(root: str = "") -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Resource-level dependency graph of the root configuration, without terraform.
+
+    Module calls are followed into their ``./modules/...`` source folders and
+    references are traced through locals, module variables (including
+    ``var.remote_objects``) and outputs down to resources. A whole-module
+    reference (``module.x``, as in ``local.combined_objects_*``, or
+    ``depends_on``) depends on every resource of the call. Edges implied by
+    a longer path are dropped, as ``terraform graph`` does, so aggregating
+    the result gives the module-level edges of ``parse_dot_module_edges``.
+    Returns ``(resources, edges)``, both sorted.
+    """
+    graph, resources = _wiring_graph(root or gma.REPO_ROOT)
+    resolve = _first_resources(graph, resources)
+    edges: List[Tuple[str, str]] = []
+    for node in resources:
+        targets: Set[str] = set()
+        for succ in graph.get(node, ()):
+            if succ in resources:
+                targets.add(succ)
+            else:
+                targets |= resolve(succ)
+        targets.discard(node)
+        edges.extend((node, target) for target in targets)
+
+    # Transitive reduction; edges inside a (spurious) cycle are all kept
+    members, reduced = gma.reduce_graph(resources, edges)
+    label_of = {node: label for label, nodes in members.items() for node in nodes}
+    kept = set(reduced)
+    edges = [(src, dst) for src, dst in edges
+             if label_of[src] == label_of[dst] or (label_of[src], label_of[dst]) in kept]
+    return sorted(resources), sorted(edges)
+
+
+def static_graph_dot(resources: Iterable[str], edges: Iterable[Tuple[str, str]]) -> str:
+    """DOT text laid out like ``terraform graph``: one cluster per root module call."""
+    lines = ["digraph G {", '  rankdir = "RL";', '  node [shape = rect, fontname = "sans-serif"];']
+    clusters: Dict[str, List[str]] = {}
+    for address in sorted(resources):
+        module = gma._module_of_address(address)
+        if module == "root":
+            lines.append(f'  "{address}" [label="{address}"];')
+        else:
+            clusters.setdefault(module, []).append(address)
+    for module, addresses in sorted(clusters.items()):
+        lines += [f'  subgraph "cluster_{module}" {{', f'    label = "{module}"', '    fontname = "sans-serif"']
+        lines += [f'    "{address}" [label="{address[len(module) + 1:]}"];' for address in addresses]
+        lines.append("  }")
+    lines += [f'  "{src}" -> "{dst}";' for src, dst in sorted(edges)]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
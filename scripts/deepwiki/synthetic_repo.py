@@ -0,0 +1,234 @@
+"""Generator for synthetic CAF-shaped repositories, used by the benchmark suite.
+
+The layout mirrors this repository: ``modules/<category>/<module>/`` with
+``main.tf``/``variables.tf``/``outputs.tf``/``locals.tf``, one root
+``<category>.tf`` aggregator per category wiring the modules in, and a root
+``docs/root/graph.dot`` as written by ``terraform graph``.
+"""
+import os
+import random
+from dataclasses import dataclass
+from typing import List, Tuple
+
+
+@dataclass
+class RepoShape:
+    categories: int = 10
+    modules: int = 200
+    blocks: int = 6
+    variables: int = 12
+    dot_modules: int = 200
+    dot_edges: int = 5000
+    seed: int = 42
+
+
+# Named shapes for the benchmark suite; "caf" is roughly this repository
+PROFILES = {
+    "small": RepoShape(categories=8, modules=80, blocks=5, variables=10, dot_modules=80, dot_edges=2000),
+    "caf": RepoShape(categories=50, modules=270, blocks=8, variables=15, dot_modules=370, dot_edges=7200),
+    "large": RepoShape(categories=100, modules=5000, blocks=8, variables=15, dot_modules=5000, dot_edges=200000),
+}
+
+RESOURCE_TYPES = (
+    "azurerm_resource_group",
+    "azurerm_storage_account",
+    "azurerm_key_vault",
+    "azurerm_virtual_network",
+    "azurerm_subnet",
+    "azurerm_network_interface",
+    "azurerm_linux_virtual_machine",
+    "azurerm_monitor_diagnostic_setting",
+    "azurerm_private_endpoint",
+    "azurecaf_name",
+)
+
+
+def module_names(shape: RepoShape) -> List[Tuple[str, str]]:
+    """``(category, module)`` pairs, spread round-robin over the categories."""
+    return [(f"category_{i % shape.categories:03d}", f"module_{i:05d}") for i in range(shape.modules)]
+
+
+def _main_tf(rng: random.Random, shape: RepoShape) -> str:
+    lines: List[str] = []
+    names: List[str] = []
+    for b in range(shape.blocks):
+        rtype = RESOURCE_TYPES[rng.randrange(len(RESOURCE_TYPES))]
+        name = f"r{b}"
+        lines.append(f'resource "{rtype}" "{name}" {{')
+        lines.append(f"  name                = azurecaf_name.r{b}.result" if rtype != "azurecaf_name" else
+                     "  name                = var.settings.name")
+        lines.append("  location            = local.location")
+        lines.append("  resource_group_name = local.resource_group_name")
+        if names:
+            ref = names[rng.randrange(len(names))]
+            lines.append(f"  parent_id           = {ref}.id")
+        lines.append("  tags = merge(local.tags, try(var.settings.tags, {}))")
+        lines.append("")
+        lines.append("  dynamic \"identity\" {")
+        lines.append("    for_each = try(var.settings.identity, null) == null ? [] : [1]")
+        lines.append("    content {")
+        lines.append("      type = var.settings.identity.type")
+        lines.append("    }")
+        lines.append("  }")
+        lines.append("}")
+        lines.append("")
+        names.append(f"{rtype}.{name}")
+    lines.append('data "azurerm_client_config" "current" {}')
+    lines.append("")
+    lines.append('module "diagnostics" {')
+    lines.append('  source = "../../diagnostics"')
+    lines.append(f"  resource_id = {names[0]}.id")
+    lines.append("  diagnostics = var.remote_objects.diagnostics")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def _variables_tf(rng: random.Random, shape: RepoShape, index: int) -> str:
+    lines: List[str] = []
+    for v in range(shape.variables):
+        # Validation conditions use operators, which the fast loader hands to hcl2; keep them as rare as in CAF
+        kind = v % 4 if index % 8 == 0 else v % 3
+        lines.append(f'variable "input_{v}" {{')
+        if kind == 0:
+            lines.append(f'  description = "(Required) Input {v} of the module."')
+            lines.append("  type        = string")
+        elif kind == 1:
+            lines.append("  description = <<-EOT")
+            lines.append(f"    (Optional) Settings object {v}:")
+            lines.append("      - name")
+            lines.append("      - sku")
+            lines.append("  EOT")
+            lines.append("  type = object({")
+            lines.append("    name = string")
+            lines.append('    sku  = optional(string, "Standard")')
+            lines.append("    tags = optional(map(string), {})")
+            lines.append("  })")
+            lines.append("  default = null")
+        elif kind == 2:
+            lines.append(f'  description = "(Optional) Map of items {v}."')
+            lines.append("  type        = map(any)")
+            lines.append("  default     = {}")
+        else:
+            lines.append("  type    = number")
+            lines.append(f"  default = {rng.randrange(100)}")
+            lines.append("  validation {")
+            lines.append(f"    condition     = var.input_{v} >= 0")
+            lines.append('    error_message = "Must be positive."')
+            lines.append("  }")
+        lines.append("}")
+        lines.append("")
+    for name in ("settings", "global_settings", "client_config", "remote_objects"):
+        lines.append(f'variable "{name}" {{')
+        lines.append(f'  description = "{name} object (see README.md)."')
+        lines.append("}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _outputs_tf(rng: random.Random, shape: RepoShape, index: int) -> str:
+    lines = [
+        'output "id" {',
+        '  description = "The ID of the resource."',
+        f"  value       = {RESOURCE_TYPES[0]}.r0.id",
+        "}",
+        "",
+        'output "name" {',
+        "  value = try(azurecaf_name.r0.result, null)",
+        "}",
+        "",
+    ]
+    if index % 7 == 0:
+        # Conditional expressions are outside the fast loader's subset and exercise the hcl2 fallback
+        lines += [
+            'output "principal_id" {',
+            "  value = length(var.settings) > 0 ? var.settings.identity[0].principal_id : null",
+            "  sensitive = true",
+            "}",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+LOCALS_TF = """locals {
+  location            = try(var.settings.location, var.global_settings.regions[var.global_settings.default_region])
+  resource_group_name = var.remote_objects.resource_groups[try(var.settings.resource_group.lz_key, var.client_config.landingzone_key)][var.settings.resource_group.key].name
+  tags = merge(
+    var.global_settings.tags,
+    try(var.settings.tags, null),
+  )
+}
+"""
+
+
+def _root_tf(category: str, modules: List[str]) -> str:
+    lines: List[str] = []
+    for mod in modules:
+        lines += [
+            f'module "{mod}" {{',
+            f'  source   = "./modules/{category}/{mod}"',
+            f"  for_each = local.{category}.{mod}",
+            "",
+            "  global_settings = local.global_settings",
+            "  client_config   = local.client_config",
+            "  settings        = each.value",
+            "",
+            "  remote_objects = {",
+            "    resource_groups = local.combined_objects_resource_groups",
+            "    diagnostics     = local.combined_diagnostics",
+            "  }",
+            "}",
+            "",
+            f'output "{mod}" {{',
+            f"  value = module.{mod}",
+            "}",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def _graph_dot(rng: random.Random, shape: RepoShape) -> str:
+    names = [f"module_{i:05d}" for i in range(shape.dot_modules)]
+    lines = ["digraph G {", '  rankdir = "RL";', '  node [shape = rect, fontname = "sans-serif"];']
+    for name in names[:2000]:
+        node = f"module.{name}.azurerm_resource_group.r0"
+        lines.append(f'  "{node}" [label="{node}"];')
+    for _ in range(shape.dot_edges):
+        i = rng.randrange(len(names))
+        # Mostly "downstream" edges to nearby modules, like CAF's layered wiring
+        j = min(len(names) - 1, i + 1 + int(rng.expovariate(1 / 15))) if rng.random() < 0.9 else rng.randrange(i + 1)
+        src = f"module.{names[i]}.{RESOURCE_TYPES[rng.randrange(len(RESOURCE_TYPES))]}.r{rng.randrange(shape.blocks)}"
+        dst = f"module.{names[j]}.{RESOURCE_TYPES[rng.randrange(len(RESOURCE_TYPES))]}.r{rng.randrange(shape.blocks)}"
+        if rng.random() < 0.02:
+            dst = f"azurerm_resource_group.rg{rng.randrange(10)}"
+        lines.append(f'  "{src}" -> "{dst}";')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_repo(root: str, shape: RepoShape) -> str:
+    """Write a synthetic repository under ``root`` and return ``root``."""
+    rng = random.Random(shape.seed)
+    by_category = {}
+    for index, (category, mod) in enumerate(module_names(shape)):
+        mod_path = os.path.join(root, "modules", category, mod)
+        os.makedirs(mod_path, exist_ok=True)
+        files = {
+            "main.tf": _main_tf(rng, shape),
+            "variables.tf": _variables_tf(rng, shape, index),
+            "outputs.tf": _outputs_tf(rng, shape, index),
+            "locals.tf": LOCALS_TF,
+        }
+        for fn, text in files.items():
+            with open(os.path.join(mod_path, fn), "w", encoding="utf-8") as f:
+                f.write(text)
+        by_category.setdefault(category, []).append(mod)
+
+    for category, modules in by_category.items():
+        with open(os.path.join(root, f"{category}.tf"), "w", encoding="utf-8") as f:
+            f.write(_root_tf(category, modules))
+
+    dot_dir = os.path.join(root, "docs", "root")
+    os.makedirs(dot_dir, exist_ok=True)
+    with open(os.path.join(dot_dir, "graph.dot"), "w", encoding="utf-8") as f:
+        f.write(_graph_dot(rng, shape))
+    return root
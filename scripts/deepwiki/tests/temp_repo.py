@@ -0,0 +1,61 @@
+"""Shared fixture: tests that run the generator against a scratch repository."""
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+
+
+class TempRepoTestCase(unittest.TestCase):
+    """Runs each test against a temporary repository (``self.base``) holding ``FILES``.
+
+    ``FILES`` maps paths relative to the repository root to their text, and
+    ``PATCH`` holds extra ``gma`` globals to set for every test. The
+    generator's path globals point into the repository; everything patched
+    through ``patch()`` or ``patch_env()`` is restored after the test.
+    """
+
+    FILES: Dict[str, str] = {}
+    PATCH: Dict[str, Any] = {}
+
+    def setUp(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.base = base = Path(tmpdir.name)
+        for rel, text in self.FILES.items():
+            self.write(rel, text)
+        self.patch(
+            REPO_ROOT=str(base),
+            MODULES_ROOT=str(base / "modules"),
+            DOCS_ROOT=str(base / "docs"),
+            DOCS_MODULES=str(base / "docs" / "modules"),
+            DOCS_ROOT_AGG=str(base / "docs" / "root"),
+            **self.PATCH,
+        )
+
+    def write(self, rel: str, text: str) -> Path:
+        path = self.base / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def patch(self, **values: Any) -> None:
+        """Set ``gma`` globals until the end of the test."""
+        for name, value in values.items():
+            self.addCleanup(setattr, gma, name, getattr(gma, name))
+            setattr(gma, name, value)
+
+    def patch_env(self, **values: str) -> None:
+        """Set environment variables until the end of the test."""
+        for name, value in values.items():
+            self.addCleanup(_restore_env, name, os.environ.get(name))
+            os.environ[name] = value
+
+
+def _restore_env(name: str, value: Optional[str]) -> None:
+    if value is None:
+        os.environ.pop(name, None)
+    else:
+        os.environ[name] = value
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from scripts.deepwiki import benchmark
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki import synthetic_repo
+
+TINY = synthetic_repo.RepoShape(categories=2, modules=6, blocks=3, variables=4, dot_modules=6, dot_edges=60)
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    def test_synthetic_repo_is_caf_shaped(self) -> None:
+        repo_root = gma.REPO_ROOT
+        with tempfile.TemporaryDirectory() as root:
+            synthetic_repo.generate_repo(root, TINY)
+
+            self.assertEqual(sorted(os.listdir(os.path.join(root, "modules"))), ["category_000", "category_001"])
+            with benchmark.use_repo(root):
+                scan = gma.scan_module("category_000", "module_00000",
+                                       os.path.join(root, "modules", "category_000", "module_00000"))
+                self.assertEqual(gma.root_module_categories()["module.module_00001"], "category_001")
+            self.assertEqual(len(scan["variables"]), 8)
+            self.assertIn("module.diagnostics", scan["nodes"])
+        self.assertEqual(gma.REPO_ROOT, repo_root)
+
+    def test_suite_times_and_measures_every_phase(self) -> None:
+        results = benchmark.run_suite(TINY)
+
+        self.assertEqual(list(results)[:2], ["modules (cold)", "modules (warm)"])
+        for metrics in results.values():
+            self.assertEqual(sorted(metrics), ["peak_mb", "seconds"])
+
+    def test_regressions_beyond_tolerance_are_reported(self) -> None:
+        baseline = {"modules (cold)": {"seconds": 1.0, "peak_mb": 10.0}, "mkdocs.yml": {"seconds": 0.001}}
+        results = {"modules (cold)": {"seconds": 1.4, "peak_mb": 30.0}, "mkdocs.yml": {"seconds": 0.005}}
+
+        regressions = benchmark.compare_to_baseline(results, baseline, tolerance=0.5)
+
+        self.assertEqual(regressions, ["modules (cold): peak_mb 30 > baseline 10"])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
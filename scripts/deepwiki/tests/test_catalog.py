@@ -0,0 +1,122 @@
+import contextlib
+import io
+import shutil
+import unittest
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki.catalog import Catalog, query_main, run_catalog_query
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+MODULES = {
+    "networking/vnet": {
+        "main.tf": 'resource "azurerm_virtual_network" "vnet" {\n  name = var.settings.name\n}\n',
+        "variables.tf": 'variable "settings" {}\nvariable "diagnostic_profiles" {\n  default = {}\n}\n',
+        "outputs.tf": 'output "id" {\n  value = azurerm_virtual_network.vnet.id\n}\n',
+    },
+    "networking/private_endpoint": {
+        "main.tf": 'resource "azurerm_private_endpoint" "pep" {\n'
+        '  subnet_id = var.remote_objects.vnets[var.settings.vnet_key].subnets["pe"].id\n}\n',
+        "variables.tf": 'variable "settings" {}\nvariable "remote_objects" {}\n',
+    },
+}
+
+ROOT_TF = """
+module "networking" {
+  source = "./modules/networking/vnet"
+}
+module "private_endpoints" {
+  source = "./modules/networking/private_endpoint"
+}
+"""
+
+GRAPH_DOT = """digraph {
+  "module.private_endpoints.azurerm_private_endpoint.pep" -> "module.networking.azurerm_virtual_network.vnet"
+}
+"""
+
+
+class CatalogTests(TempRepoTestCase):
+    FILES = {
+        **{f"modules/{name}/{fn}": text for name, files in MODULES.items() for fn, text in files.items()},
+        "networking.tf": ROOT_TF,
+        "docs/root/graph.dot": GRAPH_DOT,
+    }
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = str(self.base / "catalog.sqlite")
+        self.catalog = Catalog(self.path)
+
+    def tearDown(self) -> None:
+        self.catalog.close()
+
+    def generate(self) -> None:
+        gma.generate_modules_docs(use_cache=False, catalog=self.catalog)
+        self.catalog.update_root(str(self.base / "docs" / "root" / "graph.dot"))
+
+    def rows(self, kind: str, term: str):
+        return run_catalog_query(self.catalog.db, kind, term)[1]
+
+    def test_queries(self) -> None:
+        self.generate()
+
+        self.assertEqual(self.rows("resource", "azurerm_private_*"),
+                         [("networking/private_endpoint", "azurerm_private_endpoint")])
+        self.assertEqual([row[0] for row in self.rows("variable", "diagnostic_profiles")], ["networking/vnet"])
+        self.assertEqual(self.rows("remote-object", "vnets"), [("networking/private_endpoint", "vnets")])
+        self.assertEqual(self.rows("output", "id"), [("networking/vnet", "id", "azurerm_virtual_network.vnet.id")])
+        # The same module can be named by folder, root call or call name
+        for name in ("networking/vnet", "module.networking", "networking"):
+            self.assertEqual(self.rows("dependents", name),
+                             [("module.private_endpoints", "networking/private_endpoint")])
+        self.assertEqual(self.rows("dependencies", "private_endpoints"), [("module.networking", "networking/vnet")])
+
+    def test_incremental_update(self) -> None:
+        self.generate()
+        self.assertEqual(self.catalog.update_modules({}), 0)  # Only removals; nothing rewritten
+        self.assertEqual(self.rows("resource", "*"), [])
+
+        self.generate()
+        main_tf = self.base / "modules" / "networking" / "vnet" / "main.tf"
+        main_tf.write_text(MODULES["networking/vnet"]["main.tf"] + 'resource "azurerm_subnet" "snet" {}\n',
+                           encoding="utf-8")
+        shutil.rmtree(self.base / "modules" / "networking" / "private_endpoint")
+        gma.reset_write_stats()
+        self.generate()
+
+        self.assertEqual(self.rows("resource", "*"),
+                         [("networking/vnet", "azurerm_subnet"), ("networking/vnet", "azurerm_virtual_network")])
+        self.assertEqual(self.rows("remote-object", "*"), [])
+        self.assertFalse(self.catalog.update_root(str(self.base / "docs" / "root" / "graph.dot")))
+
+    def test_query_subcommand(self) -> None:
+        self.generate()
+        self.catalog.close()
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), self.assertRaises(SystemExit) as status:
+            gma.main(["query", "resource", "azurerm_virtual_network", "--catalog", self.path])
+        self.assertEqual(status.exception.code, 0)
+        self.assertIn("networking/vnet", out.getvalue())
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(query_main(["variable", "missing", "--catalog", self.path]), 1)
+            # The catalog is opened read-only
+            self.assertEqual(query_main(["sql", "DELETE FROM modules", "--catalog", self.path]), 2)
+        self.catalog = Catalog(self.path)
+        self.assertEqual(self.catalog.db.execute("SELECT count(*) FROM modules").fetchone(), (2,))
+
+    def test_outdated_catalog_is_rebuilt(self) -> None:
+        self.generate()
+        self.catalog.db.execute("UPDATE meta SET value = 'old' WHERE key = 'version'")
+        self.catalog.db.commit()
+        self.catalog.close()
+
+        self.catalog = Catalog(self.path)
+        self.assertEqual(self.catalog.db.execute("SELECT count(*) FROM modules").fetchone(), (0,))
+        # Root data is reloaded too, even though the root files did not change
+        self.assertTrue(self.catalog.update_root(str(self.base / "docs" / "root" / "graph.dot")))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,107 @@
+import contextlib
+import io
+import shutil
+import subprocess
+import unittest
+from typing import Any, Dict, List
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+MODULES = {
+    "networking/vnet": 'resource "azurerm_virtual_network" "vnet" {\n  name = var.name\n}\n',
+    "networking/subnet": 'resource "azurerm_subnet" "subnet" {\n  name = var.name\n}\n',
+    "security/keyvault": 'resource "azurerm_key_vault" "kv" {\n  name = var.name\n}\n',
+    "cache/redis": 'resource "azurerm_redis_cache" "redis" {}\n',
+}
+
+ROOT_FILES = {
+    "networking.tf": 'module "networking" {\n  source   = "./modules/networking/vnet"\n'
+                     "  for_each = try(var.networking.vnets, {})\n}\n",
+    "keyvault.tf": 'module "keyvaults" {\n  source   = "./modules/security/keyvault"\n  for_each = var.keyvaults\n}\n',
+}
+
+EXAMPLES = {
+    "module.tf": 'module "example" {\n  source    = "../"\n  keyvaults = var.keyvaults\n'
+                 "  networking = {\n    vnets = var.vnets\n  }\n}\n",
+    "networking/100-vnet/configuration.tfvars": "vnets = {\n  vnet1 = {}\n}\n",
+    "keyvault/100-kv/configuration.tfvars": "keyvaults = {\n  kv1 = {}\n}\n",
+}
+
+
+class ChangedSinceTests(TempRepoTestCase):
+    FILES = {
+        **{f"modules/{name}/main.tf": text for name, text in MODULES.items()},
+        **ROOT_FILES,
+        **{f"examples/{rel}": text for rel, text in EXAMPLES.items()},
+    }
+
+    def setUp(self) -> None:
+        super().setUp()
+        # The docs on disk were generated at the ref
+        self.git("init", "-q")
+        self.run_main()
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "docs")
+
+    def git(self, *args: str) -> None:
+        subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                       cwd=self.base, check=True, capture_output=True)
+
+    def run_main(self, *argv: str) -> str:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            gma.main(["--static-graph", "--no-cache", "--no-catalog", "--search-index", "-j", "1", *argv])
+        return out.getvalue()
+
+    def docs(self) -> Dict[str, str]:
+        files = sorted((self.base / "docs").rglob("*")) + [self.base / "mkdocs.yml"]
+        return {path.relative_to(self.base).as_posix(): path.read_text(encoding="utf-8")
+                for path in files if path.is_file()}
+
+    def test_selective_output_matches_full_regeneration(self) -> None:
+        self.write("modules/networking/vnet/main.tf",
+                   MODULES["networking/vnet"] + 'resource "azurerm_route_table" "rt" {}\n')
+        self.write("modules/security/identity/main.tf", 'resource "azurerm_user_assigned_identity" "msi" {}\n')
+        shutil.rmtree(self.base / "modules" / "cache")
+        # Reaches keyvault's Examples section although none of its files changed
+        self.write("examples/keyvault/200-kv/configuration.tfvars", "keyvaults = {\n  kv2 = {}\n}\n")
+        self.write("storage.tf", 'resource "azurerm_storage_account" "sa" {}\n')
+
+        scanned: List[str] = []
+        original_scan = gma.scan_module
+
+        def tracking_scan(category: str, mod: str, mod_path: str) -> Dict[str, Any]:
+            scanned.append(f"{category}/{mod}")
+            return original_scan(category, mod, mod_path)
+
+        gma.scan_module = tracking_scan
+        try:
+            log = self.run_main("--changed-since", "HEAD")
+        finally:
+            gma.scan_module = original_scan
+        self.assertIn("3 module pages, root pages, examples, dependency map", log)
+        self.assertEqual(sorted(scanned), ["networking/vnet", "security/identity", "security/keyvault"])
+        selective = self.docs()
+
+        shutil.rmtree(self.base / "docs")
+        (self.base / "mkdocs.yml").unlink()
+        self.run_main()
+        self.assertEqual(selective, self.docs())
+
+    def test_unchanged_tree_rewrites_nothing(self) -> None:
+        before = self.docs()
+        log = self.run_main("--changed-since", "HEAD")
+        self.assertIn("0 changed files, 0 module pages", log)
+        self.assertIn("0 created, 0 updated", log)
+        self.assertEqual(before, self.docs())
+
+    def test_falls_back_to_full_run(self) -> None:
+        self.write("scripts/deepwiki/generate_mkdocs_auto.py", "# changed\n")
+        self.assertIn("the generator changed; regenerating everything", self.run_main("--changed-since", "HEAD"))
+        with self.assertRaises(SystemExit):
+            self.run_main("--changed-since", "no-such-ref")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,133 @@
+import contextlib
+import io
+import unittest
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+ROOT_FILES = {
+    "locals.tf": """
+locals {
+  networking = {
+    vnets   = try(var.networking.vnets, {})
+    bastion = try(var.networking.bastion, {}) # not a module
+  }
+}
+""",
+    "networking.tf": """
+module "networking" {
+  source   = "./modules/networking/vnet"
+  for_each = local.networking.vnets
+}
+""",
+    "keyvault.tf": """
+module "keyvaults" {
+  source   = "./modules/security/keyvault"
+  for_each = {
+    for key, value in var.keyvaults : key => value
+    if try(value.reuse, false) == false
+  }
+}
+""",
+    "cache.tf": """
+module "managed_redis" {
+  source   = "./modules/cache/managed_redis"
+  for_each = try(var.cache.managed_redis, {})
+}
+""",
+}
+
+WRAPPER = """
+module "example" {
+  source = "../"
+
+  keyvaults = var.keyvaults
+  networking = {
+    vnets = var.vnets # virtual networks
+  }
+}
+"""
+
+TFVARS = {
+    "networking/100-vnet/configuration.tfvars": 'vnets = {\n  vnet1 = {\n    name = "a"\n  }\n}\n',
+    "keyvault/100-kv/keyvaults.tfvars": "keyvaults = {\n  kv1 = {}\n}\n",
+    "keyvault/100-kv/networking.tfvars": "vnets = {}\n",
+    # Root variables can be set directly, without the wrapper
+    "cache/100-redis/configuration.tfvars": "cache = {\n  managed_redis = {}\n}\nglobal_settings = {}\n",
+}
+
+
+class ExamplesIndexTests(TempRepoTestCase):
+    FILES = {
+        **{f"modules/{folder}/main.tf": 'resource "null_resource" "this" {}\n'
+           for folder in ("networking/vnet", "security/keyvault", "cache/managed_redis")},
+        **ROOT_FILES,
+        "examples/module.tf": WRAPPER,
+        **{f"examples/{rel}": text for rel, text in TFVARS.items()},
+    }
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache_dir = str(self.base / "cache")
+
+    def build(self, **kwargs):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            index = gma.build_examples_index(cache_dir=self.cache_dir, **kwargs)
+        return index, out.getvalue()
+
+    def test_wiring(self) -> None:
+        self.assertEqual(gma.scan_tfvars(str(self.base / "examples" / "networking/100-vnet/configuration.tfvars")),
+                         {"vnets": ["vnet1"]})
+        self.assertEqual(gma.example_variable_paths(str(self.base / "examples")),
+                         {"keyvaults": {("keyvaults",)}, "vnets": {("networking", "vnets")}})
+        self.assertEqual(gma.root_module_inputs(), {
+            "networking": {("networking", "vnets")},
+            "keyvaults": {("keyvaults",)},
+            "managed_redis": {("cache", "managed_redis")},
+        })
+
+    def test_index(self) -> None:
+        index, _ = self.build()
+
+        self.assertEqual(index, {
+            "networking/vnet": [
+                {"scenario": "examples/networking/100-vnet", "keys": ["vnets"], "modules": 1},
+                {"scenario": "examples/keyvault/100-kv", "keys": ["vnets"], "modules": 2},
+            ],
+            "security/keyvault": [{"scenario": "examples/keyvault/100-kv", "keys": ["keyvaults"], "modules": 2}],
+            "cache/managed_redis": [{"scenario": "examples/cache/100-redis", "keys": ["cache"], "modules": 1}],
+        })
+
+    def test_unchanged_files_are_not_rescanned(self) -> None:
+        self.patch(EXAMPLES_PARALLEL_MIN=1)  # Scan through the process pool
+        parallel, _ = self.build(jobs=2)
+        self.assertEqual(parallel, self.build(use_cache=False)[0])
+        _, log = self.build()
+        self.assertIn("(0 scanned)", log)
+
+        (self.base / "examples" / "keyvault/100-kv/networking.tfvars").write_text("", encoding="utf-8")
+        index, log = self.build()
+        self.assertIn("4 files (1 scanned)", log)
+        self.assertEqual([e["scenario"] for e in index["networking/vnet"]], ["examples/networking/100-vnet"])
+
+    def test_module_pages_list_examples(self) -> None:
+        index, _ = self.build()
+        with contextlib.redirect_stdout(io.StringIO()):
+            gma.generate_modules_docs(use_cache=False, examples=index)
+
+        page = (self.base / "docs" / "modules" / "networking" / "vnet.md").read_text(encoding="utf-8")
+        self.assertIn("## Examples\n\n- `examples/networking/100-vnet` (`vnets`)\n- `examples/keyvault/100-kv`", page)
+        self.assertIn("No example configuration exercises this module.",
+                      gma.render_module_page("x", "y", {"nodes": [], "edges": [], "sources": [], "resource_types": [],
+                                                        "variables": [], "outputs": []}, []))
+        self.assertEqual(gma.format_examples(index["networking/vnet"], limit=1).splitlines()[-1],
+                         "- … and 1 more scenarios")
+
+    def test_no_examples_folder(self) -> None:
+        gma.REPO_ROOT = str(self.base / "modules")
+        self.assertIsNone(self.build()[0])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
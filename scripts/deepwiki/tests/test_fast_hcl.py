@@ -0,0 +1,82 @@
+import os
+import textwrap
+import unittest
+from pathlib import Path
+
+import hcl2
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def definition_files():
+    """Every variables*/outputs* .tf file in modules/ plus the root variables files."""
+    for root, dirs, files in os.walk(REPO_ROOT / "modules"):
+        dirs.sort()
+        for fn in sorted(files):
+            if fn.endswith(".tf") and fn.startswith(("variables", "outputs", "output")):
+                yield Path(root) / fn
+    for path in sorted(REPO_ROOT.glob("variables*.tf")):
+        yield path
+
+
+class FastHclLoaderTests(unittest.TestCase):
+    def test_matches_hcl2_on_repository(self) -> None:
+        fast = fallback = 0
+        for path in definition_files():
+            text = path.read_text(encoding="utf-8", errors="ignore")
+            expected = hcl2.loads(text)
+            expected = {kind: expected[kind] for kind in ("variable", "output") if kind in expected}
+            try:
+                actual = gma.load_hcl_fast(text)
+            except gma.UnsupportedHcl:
+                fallback += 1
+                continue
+            fast += 1
+            self.assertEqual(actual, expected, msg=str(path.relative_to(REPO_ROOT)))
+
+        self.assertGreater(fast, 0)
+        # The fast path is only worth having if it covers the common CAF patterns
+        self.assertGreater(fast, 4 * fallback)
+
+    def test_expressions_render_like_hcl2(self) -> None:
+        text = textwrap.dedent(
+            """
+            variable "settings" {
+              description = <<-EOT
+                Settings object:
+                  - name
+                EOT
+              type = map(object({
+                name     = string
+                tags     = optional(map(string), {})
+                enabled  = optional(bool, true)
+                sku      = optional(string, null)
+                zones    = optional(list(string), ["1"])
+              }))
+              default = { a = [var.x.0, local.y["k"]], b = 1.5, c = null }
+            }
+
+            output "id" {
+              value     = try(azurerm_resource_group.rg[*].id, null)
+              sensitive = true
+            }
+            """
+        )
+        self.assertEqual(gma.load_hcl_fast(text), hcl2.loads(text))
+
+    def test_operators_fall_back_to_hcl2(self) -> None:
+        text = 'output "flag" {\n  value = var.count > 0 ? true : false\n}\n'
+        with self.assertRaises(gma.UnsupportedHcl):
+            gma.load_hcl_fast(text)
+
+        before = dict(gma.FAST_HCL_STATS)
+        outputs = gma.parse_outputs(text)
+        self.assertEqual(gma.FAST_HCL_STATS["fallback"], before["fallback"] + 1)
+        self.assertEqual(outputs[0].name, "flag")
+        self.assertEqual(outputs[0].value, "var.count > 0 ? True : False")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -1,3 +1,4 @@
+import json
 import os
 import tempfile
 import unittest
@@ -80,6 +81,7 @@ class GenerateMkDocsAutoTests(unittest.TestCase):
             "DOCS_ROOT": gma.DOCS_ROOT,
             "DOCS_MODULES": gma.DOCS_MODULES,
             "DOCS_ROOT_AGG": gma.DOCS_ROOT_AGG,
+            "MODULES_PARALLEL_MIN": gma.MODULES_PARALLEL_MIN,
         }
 
         gma.REPO_ROOT = str(base)
@@ -101,6 +103,81 @@ class GenerateMkDocsAutoTests(unittest.TestCase):
         self.assertIn("cat1", nav_modules)
         self.assertIn("cat2", nav_modules)
 
+    def _snapshot_docs(self) -> Dict[str, bytes]:
+        docs_root = Path(gma.DOCS_ROOT)
+        return {
+            str(path.relative_to(docs_root)): path.read_bytes()
+            for path in sorted(docs_root.rglob("*.md"))
+        }
+
+    def test_generate_modules_docs_parallel_matches_serial(self) -> None:
+        serial_nav, serial_count = gma.generate_modules_docs(jobs=1, use_cache=False)
+        serial_docs = self._snapshot_docs()
+
+        gma.MODULES_PARALLEL_MIN = 1  # Scan through the process pool
+        parallel_nav, parallel_count = gma.generate_modules_docs(jobs=2, use_cache=False)
+        parallel_docs = self._snapshot_docs()
+
+        self.assertEqual(serial_count, parallel_count)
+        self.assertEqual(serial_nav, parallel_nav)
+        self.assertEqual(serial_docs, parallel_docs)
+
+    def test_generate_modules_docs_reuses_cache_for_unchanged_modules(self) -> None:
+        gma.generate_modules_docs(jobs=1)
+        cold_docs = self._snapshot_docs()
+
+        scanned: List[str] = []
+        original_scan = gma.scan_module
+
+        def tracking_scan(category: str, mod: str, mod_path: str) -> Dict[str, Any]:
+            scanned.append(f"{category}/{mod}")
+            return original_scan(category, mod, mod_path)
+
+        gma.scan_module = tracking_scan
+        try:
+            gma.generate_modules_docs(jobs=1)
+            self.assertEqual(scanned, [])
+            self.assertEqual(self._snapshot_docs(), cold_docs)
+
+            main_tf = Path(gma.MODULES_ROOT) / "cat2" / "module_b" / "main.tf"
+            main_tf.write_text(
+                main_tf.read_text(encoding="utf-8") + '\nresource "azurerm_key_vault" "kv" {}\n',
+                encoding="utf-8",
+            )
+            gma.generate_modules_docs(jobs=1)
+            self.assertEqual(scanned, ["cat2/module_b"])
+        finally:
+            gma.scan_module = original_scan
+
+        page = (Path(gma.DOCS_MODULES) / "cat2" / "module_b.md").read_text(encoding="utf-8")
+        self.assertIn("`azurerm_key_vault`", page)
+
+    def test_write_skips_identical_content(self) -> None:
+        target = Path(gma.DOCS_ROOT) / "page.md"
+
+        self.assertEqual(gma.write(str(target), "one\n"), "created")
+        os.utime(target, ns=(0, 0))
+        self.assertEqual(gma.write(str(target), "one\n"), "unchanged")
+        self.assertEqual(target.stat().st_mtime_ns, 0)
+        self.assertEqual(gma.write(str(target), "two\n"), "updated")
+        self.assertEqual(target.read_text(encoding="utf-8"), "two\n")
+
+    def test_generate_modules_docs_removes_stale_pages(self) -> None:
+        stale = Path(gma.DOCS_MODULES) / "old_cat" / "deleted_module.md"
+        # Two levels of stale folders: the empty parents go too, bottom-up
+        nested = Path(gma.DOCS_MODULES) / "old_cat" / "group" / "nested" / "deleted_module.md"
+        nested.parent.mkdir(parents=True)
+        for page in (stale, nested):
+            page.write_text("stale", encoding="utf-8")
+
+        gma.reset_write_stats()
+        gma.generate_modules_docs(jobs=1)
+
+        self.assertFalse(stale.exists())
+        self.assertFalse(stale.parent.exists())
+        self.assertEqual(gma.WRITE_STATS["removed"], 2)
+        self.assertTrue((Path(gma.DOCS_MODULES) / "cat1" / "module_a.md").exists())
+
     def test_generate_mkdocs_yml_force_flag(self) -> None:
         nav_modules, _ = gma.generate_modules_docs()
         nav_root: List[Dict[str, str]] = []
@@ -115,6 +192,9 @@ class GenerateMkDocsAutoTests(unittest.TestCase):
         content = mkdocs_path.read_text(encoding="utf-8")
         self.assertIn("site_name: CAF DeepWiki", content)
         self.assertIn("- cat1:", content)
+        # markdown_extensions is a top-level key, not swallowed into the plugins' trailing comment
+        top_level = [line for line in content.splitlines() if line and not line.startswith((" ", "#"))]
+        self.assertEqual(top_level, ["site_name: CAF DeepWiki", "theme:", "nav:", "plugins:", "markdown_extensions:"])
 
     def test_extract_dependencies_returns_real_edges(self) -> None:
         content = textwrap.dedent(
@@ -155,37 +235,108 @@ class GenerateMkDocsAutoTests(unittest.TestCase):
         self.assertIn(("module.network", "azurerm_resource_group.rg"), edges)
         self.assertIn(("module.network", "module.diag"), edges)
 
+    def test_scan_module_reads_each_file_once(self) -> None:
+        module_path = Path(gma.MODULES_ROOT) / "cat1" / "module_a"
+        reads: List[str] = []
+        original_read = gma._read_text
+
+        def counting_read(path: str) -> str:
+            reads.append(os.path.basename(path))
+            return original_read(path)
+
+        gma._read_text = counting_read
+        try:
+            data = gma.scan_module("cat1", "module_a", str(module_path))
+        finally:
+            gma._read_text = original_read
+
+        self.assertEqual(sorted(reads), ["main.tf", "outputs.tf", "variables.tf"])
+        self.assertEqual(data["resource_types"], ["azurerm_resource_group"])
+        self.assertEqual([var.name for var in data["variables"]], ["required_input", "optional_input"])
+        self.assertEqual([out.name for out in data["outputs"]], ["example_output"])
+        self.assertEqual(
+            data["sources"],
+            ["modules/cat1/module_a/main.tf", "modules/cat1/module_a/outputs.tf", "modules/cat1/module_a/variables.tf"],
+        )
+
+    def test_extract_dependencies_resolves_remote_objects_per_block(self) -> None:
+        content = textwrap.dedent(
+            """
+            resource "azurerm_storage_account" "sa" {
+              resource_group_name = var.remote_objects.resource_group[var.key].name
+            }
+
+            module "private_endpoint" {
+              source   = "./private_endpoint"
+              location = var.remote_objects.resource_groups[var.key].location
+              id       = "${azurerm_storage_account.sa.id}"
+              subnet   = data.azurerm_subnet.pe.id
+            }
+
+            data "azurerm_subnet" "pe" {
+              name = local.subnet.name
+            }
+            """
+        )
+
+        nodes, edges = gma.extract_dependencies_from_content(content)
+
+        self.assertIn("remote:resource_group", nodes)
+        self.assertIn("remote:resource_groups", nodes)
+        self.assertIn(("azurerm_storage_account.sa", "remote:resource_group"), edges)
+        self.assertIn(("module.private_endpoint", "remote:resource_groups"), edges)
+        self.assertNotIn(("module.private_endpoint", "remote:resource_group"), edges)
+        self.assertIn(("module.private_endpoint", "azurerm_storage_account.sa"), edges)
+        self.assertIn(("module.private_endpoint", "data.azurerm_subnet.pe"), edges)
+        self.assertEqual(len(edges), 4)
+
+    def test_blocks_and_cached_scans_are_compact(self) -> None:
+        content = 'resource "azurerm_resource_group" "rg" {\n  name = var.name\n}\n'
+        (block,) = gma._extract_blocks(content)
+        self.assertEqual(block.node, "azurerm_resource_group.rg")
+        self.assertIs(block.source, content)  # offsets into the file, not a copy
+        self.assertEqual(block.body, "\n  name = var.name\n")
+
+        module_path = Path(gma.MODULES_ROOT) / "cat1" / "module_a"
+        data = gma.scan_module("cat1", "module_a", str(module_path))
+        first = gma.compact_scan(json.loads(json.dumps(data)))
+        second = gma.compact_scan(json.loads(json.dumps(data)))
+        self.assertEqual(first, data)
+        self.assertIsInstance(first["variables"][0], gma.Variable)
+        self.assertIsInstance(first["outputs"][0], gma.Output)
+        self.assertIs(first["resource_types"][0], second["resource_types"][0])
+
     def test_extract_variables_parses_defaults(self) -> None:
         module_path = Path(gma.MODULES_ROOT) / "cat1" / "module_a"
         variables = gma.extract_variables(str(module_path))
-        var_lookup = {var["name"]: var for var in variables}
+        var_lookup = {var.name: var for var in variables}
 
         self.assertIn("required_input", var_lookup)
-        self.assertEqual(var_lookup["required_input"]["required"], "yes")
-        self.assertEqual(var_lookup["required_input"].get("default"), "")
+        self.assertEqual(var_lookup["required_input"].required, "yes")
+        self.assertEqual(var_lookup["required_input"].default, "")
 
         self.assertIn("optional_input", var_lookup)
         optional_var = var_lookup["optional_input"]
-        self.assertEqual(optional_var["required"], "no")
-        self.assertEqual(optional_var.get("default"), "{}")
+        self.assertEqual(optional_var.required, "no")
+        self.assertEqual(optional_var.default, "{}")
         self.assertIn(
             "optional_input must not be empty",
-            optional_var.get("validation", ""),
+            optional_var.validation,
         )
 
     def test_extract_outputs_includes_metadata(self) -> None:
         module_path = Path(gma.MODULES_ROOT) / "cat1" / "module_a"
         outputs = gma.extract_outputs(str(module_path))
-        output_lookup = {out["name"]: out for out in outputs}
+        output_lookup = {out.name: out for out in outputs}
 
         self.assertIn("example_output", output_lookup)
         example_out = output_lookup["example_output"]
-        self.assertEqual(example_out.get("description"), "Example output")
+        self.assertEqual(example_out.description, "Example output")
         self.assertIn(
             "azurerm_resource_group.example.id",
-            example_out.get("value", ""),
+            example_out.value,
         )
-        self.assertIn("false", example_out.get("sensitive", ""))
+        self.assertIn("false", example_out.sensitive)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,73 @@
+import textwrap
+import unittest
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+
+
+def spans(content):
+    return [(kind, labels, content[start:end]) for kind, labels, start, end in gma.scan_hcl_blocks(content)]
+
+
+class HclLexerTests(unittest.TestCase):
+    def test_top_level_kinds_and_labels(self) -> None:
+        content = textwrap.dedent(
+            """
+            resource "azurerm_resource_group" "rg" {
+              tags = { env = "dev" }
+            }
+            data "azurerm_client_config" "current" {}
+            module "network" { source = "./network" }
+            locals { name = "x" }
+            output "id" { value = azurerm_resource_group.rg.id }
+            """
+        )
+        blocks = spans(content)
+
+        self.assertEqual(
+            [(kind, labels) for kind, labels, _ in blocks],
+            [
+                ("resource", ("azurerm_resource_group", "rg")),
+                ("data", ("azurerm_client_config", "current")),
+                ("module", ("network",)),
+                ("locals", ()),
+                ("output", ("id",)),
+            ],
+        )
+        self.assertEqual(blocks[0][2], '\n  tags = { env = "dev" }\n')
+
+    def test_braces_in_strings_templates_and_heredocs_are_ignored(self) -> None:
+        content = textwrap.dedent(
+            """
+            resource "a" "b" {
+              x = "}${ {k = "}"}["k"] }"
+              y = <<-EOT
+                } } {
+                EOT
+              z = "%{ if true }{%{ endif }"
+            }
+            resource "a" "c" {}
+            """
+        )
+        self.assertEqual([labels for _, labels, _ in spans(content)], [("a", "b"), ("a", "c")])
+
+    def test_commented_out_blocks_are_skipped(self) -> None:
+        content = textwrap.dedent(
+            """
+            # resource "random_password" "pwd" {
+            # }
+            // module "old" {}
+            /* data "x" "y" {
+            } */
+            resource "a" "b" { // }
+            }
+            """
+        )
+        self.assertEqual([(kind, labels) for kind, labels, _ in spans(content)], [("resource", ("a", "b"))])
+
+    def test_unterminated_block_runs_to_end(self) -> None:
+        content = 'module "m" {\n  source = "./m"\n'
+        self.assertEqual(spans(content), [("module", ("m",), '\n  source = "./m"\n')])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import time
+import unittest
+from typing import Any, List
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki import site_build
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+MODULE_FILES = {
+    # A module directly under modules/, with nested modules of its own
+    "storage_account/storage_account.tf": 'resource "azurerm_storage_account" "sa" {}\n',
+    "storage_account/blob/blob.tf": 'resource "azurerm_storage_blob" "blob" {}\n',
+    # compute/batch only groups nested modules
+    "compute/batch/README.md": "Batch modules\n",
+    "compute/batch/batch_account/main.tf": 'resource "azurerm_batch_account" "account" {}\n',
+    "compute/batch/batch_account/.terraform/modules/main.tf": "",
+    "compute/vm/main.tf": 'resource "azurerm_linux_virtual_machine" "vm" {}\n',
+    "compute/vm/scripts/setup.sh": "#!/bin/sh\n",
+}
+
+
+class ModuleDiscoveryTests(TempRepoTestCase):
+    FILES = {f"modules/{rel}": text for rel, text in MODULE_FILES.items()}
+
+    def test_manifest_lists_every_folder_with_tf_files(self) -> None:
+        manifest = gma.discover_modules()
+
+        self.assertEqual([task.name for task in manifest],
+                         ["compute/batch/batch_account", "compute/vm", "storage_account", "storage_account/blob"])
+        self.assertEqual(manifest[2][:2], ("storage_account", ""))
+        self.assertEqual(manifest[0].files[0][:2],
+                         ("main.tf", len(MODULE_FILES["compute/batch/batch_account/main.tf"])))
+        self.assertEqual(gma.owning_module("compute/batch/batch_account/main.tf", {t.name for t in manifest}),
+                         "compute/batch/batch_account")
+        self.assertIsNone(gma.owning_module("compute/batch/README.md", {t.name for t in manifest}))
+
+    def test_nested_modules_get_pages_and_nav_entries(self) -> None:
+        nav_modules, processed = gma.generate_modules_docs(jobs=1, use_cache=False)
+
+        self.assertEqual(processed, 4)
+        self.assertEqual(nav_modules, {
+            "compute": [("batch/batch_account", "modules/compute/batch/batch_account.md"),
+                        ("vm", "modules/compute/vm.md")],
+            "storage_account": [("storage_account", "modules/storage_account.md"),
+                                ("blob", "modules/storage_account/blob.md")],
+        })
+        page = (self.base / "docs" / "modules" / "storage_account.md").read_text(encoding="utf-8")
+        self.assertIn("**Path**: `modules/storage_account`", page)
+        self.assertIn("- `modules/storage_account/storage_account.tf`", page)
+        self.assertFalse((self.base / "docs" / "modules" / "compute" / "batch.md").exists())
+        self.assertEqual(gma.generated_module_pages(), {task.name for task in gma.discover_modules()})
+        self.assertEqual(site_build.site_partition("modules/storage_account.md"), "storage_account")
+        self.assertEqual(site_build.site_partition("modules/index.md"), site_build.SITE_ROOT_PARTITION)
+
+    def test_cache_lookup_trusts_unchanged_file_stats(self) -> None:
+        # Old enough for their stats to be trusted
+        past = time.time_ns() - 10 * gma.RACY_STAT_NS
+        for rel in MODULE_FILES:
+            os.utime(self.base / "modules" / rel, ns=(past, past))
+        cache_dir = str(self.base / "cache")
+        gma.generate_modules_docs(jobs=1, cache_dir=cache_dir)
+
+        hashed: List[str] = []
+        original_hash = gma.module_content_hash
+
+        def tracking_hash(mod_path: str, names: Any = None) -> str:
+            hashed.append(os.path.relpath(mod_path, gma.MODULES_ROOT).replace(os.sep, "/"))
+            return original_hash(mod_path, names)
+
+        gma.module_content_hash = tracking_hash
+        try:
+            gma.generate_modules_docs(jobs=1, cache_dir=cache_dir)
+            self.assertEqual(hashed, [])
+
+            (self.base / "modules" / "compute" / "vm" / "main.tf").write_text(
+                'resource "azurerm_windows_virtual_machine" "vm" {}\n', encoding="utf-8")
+            gma.generate_modules_docs(jobs=1, cache_dir=cache_dir)
+            self.assertEqual(hashed, ["compute/vm"])
+        finally:
+            gma.module_content_hash = original_hash
+        page = (self.base / "docs" / "modules" / "compute" / "vm.md").read_text(encoding="utf-8")
+        self.assertIn("azurerm_windows_virtual_machine", page)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import stat
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+
+FAKE_TERRAFORM = textwrap.dedent(
+    """\
+    #!/bin/sh
+    # Minimal stand-in for the terraform CLI used by run_module_dots.
+    case "$(basename "$PWD")" in
+      broken) echo "boom" >&2; exit 1 ;;
+      slow) exec sleep 5 ;;
+    esac
+    case "$1" in
+      init)
+        mkdir -p .terraform
+        echo "$TF_PLUGIN_CACHE_DIR" > .terraform/plugin_cache
+        ;;
+      graph)
+        echo 'digraph { "azurerm_resource_group.rg" }'
+        ;;
+    esac
+    """
+)
+
+
+class ModuleDotSchedulerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        base = Path(self.tmpdir.name)
+
+        bin_dir = base / "bin"
+        bin_dir.mkdir()
+        fake = bin_dir / "terraform"
+        fake.write_text(FAKE_TERRAFORM, encoding="utf-8")
+        fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+        self.original_path = os.environ.get("PATH", "")
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{self.original_path}"
+
+        self.modules_root = base / "modules"
+        self.tasks = []
+        for category, module in (("cat1", "ok_a"), ("cat1", "ok_b"), ("cat2", "broken"), ("cat2", "slow")):
+            module_path = self.modules_root / category / module
+            module_path.mkdir(parents=True)
+            (module_path / "main.tf").write_text('resource "azurerm_resource_group" "rg" {}\n', encoding="utf-8")
+            self.tasks.append((category, module, str(module_path)))
+        self.plugin_cache = str(base / "plugin-cache")
+
+    def tearDown(self) -> None:
+        os.environ["PATH"] = self.original_path
+        self.tmpdir.cleanup()
+
+    def test_update_dot_runs_all_and_reports_failures(self) -> None:
+        failures = gma.run_module_dots(
+            self.tasks, update_dot=True, concurrency=2, timeout=1.0, plugin_cache_dir=self.plugin_cache
+        )
+
+        failed = dict(failures)
+        self.assertEqual(sorted(failed), ["cat2/broken", "cat2/slow"])
+        self.assertIn("boom", failed["cat2/broken"])
+        self.assertIn("timed out", failed["cat2/slow"])
+
+        for module in ("ok_a", "ok_b"):
+            module_path = self.modules_root / "cat1" / module
+            self.assertIn("digraph", (module_path / "graph.dot").read_text(encoding="utf-8"))
+            cache = (module_path / ".terraform" / "plugin_cache").read_text(encoding="utf-8").strip()
+            self.assertEqual(cache, self.plugin_cache)
+
+        for module in ("broken", "slow"):
+            module_dir = self.modules_root / "cat2" / module
+            self.assertFalse((module_dir / "graph.dot").exists())
+            self.assertFalse((module_dir / "graph.dot.tmp").exists())
+
+    def test_create_dot_skips_existing_graphs(self) -> None:
+        existing = self.modules_root / "cat1" / "ok_a" / "graph.dot"
+        existing.write_text("keep", encoding="utf-8")
+        ok_tasks = [task for task in self.tasks if task[0] == "cat1"]
+
+        failures = gma.run_module_dots(ok_tasks, create_dot=True, plugin_cache_dir=self.plugin_cache)
+
+        self.assertEqual(failures, [])
+        self.assertEqual(existing.read_text(encoding="utf-8"), "keep")
+        self.assertTrue((self.modules_root / "cat1" / "ok_b" / "graph.dot").exists())
+
+    def test_default_plugin_cache_is_under_the_generator_cache(self) -> None:
+        original = os.environ.pop("TF_PLUGIN_CACHE_DIR", None)
+        try:
+            self.assertEqual(gma.default_plugin_cache_dir("/tmp/cache"), os.path.join("/tmp/cache", "plugin-cache"))
+            self.assertEqual(gma.default_plugin_cache_dir(),
+                             os.path.join(gma.REPO_ROOT, gma.CACHE_DIRNAME, "plugin-cache"))
+            os.environ["TF_PLUGIN_CACHE_DIR"] = self.plugin_cache
+            self.assertEqual(gma.default_plugin_cache_dir("/tmp/cache"), self.plugin_cache)
+        finally:
+            os.environ.pop("TF_PLUGIN_CACHE_DIR", None)
+            if original is not None:
+                os.environ["TF_PLUGIN_CACHE_DIR"] = original
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,77 @@
+import marshal
+import os
+import sys
+import tempfile
+import zlib
+import unittest
+from pathlib import Path
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+
+# Uses a conditional, so load_hcl() always needs python-hcl2 for it
+OUTPUT_TF = 'output "flag" {\n  value = var.count > 0 ? true : false\n}\n'
+
+
+class HclParseCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = gma.HclParseCache(self.tmpdir.name)
+        self.previous = gma.set_parse_cache(self.cache)
+
+    def tearDown(self) -> None:
+        gma.set_parse_cache(self.previous)
+        self.tmpdir.cleanup()
+
+    def test_second_parse_is_served_from_cache(self) -> None:
+        before = dict(gma.FAST_HCL_STATS)
+        first = gma.load_hcl(OUTPUT_TF)
+        second = gma.load_hcl(OUTPUT_TF)
+
+        self.assertEqual(first, second)
+        self.assertEqual(gma.FAST_HCL_STATS["fallback"], before["fallback"] + 1)
+        self.assertEqual(gma.FAST_HCL_STATS["cached"], before["cached"] + 1)
+
+        # A fresh instance (another process) sees the same entry
+        other = gma.HclParseCache(self.tmpdir.name)
+        self.assertEqual(other.get(other.key(OUTPUT_TF)), first)
+
+    def test_corrupt_entry_is_a_miss_and_gets_replaced(self) -> None:
+        key = self.cache.key(OUTPUT_TF)
+        path = Path(self.cache._path(key))
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"not a cache entry")
+
+        self.assertIsNone(self.cache.get(key))
+        data = gma.load_hcl(OUTPUT_TF)
+        self.assertEqual(self.cache.get(key), data)
+
+    def test_entries_are_keyed_by_python_version(self) -> None:
+        self.assertIn("py{}.{}".format(*sys.version_info[:2]), os.path.basename(self.cache.directory))
+
+        # A truncated marshal blob (e.g. written by another Python) is a miss, not an error
+        key = self.cache.key(OUTPUT_TF)
+        path = Path(self.cache._path(key))
+        path.parent.mkdir(parents=True)
+        path.write_bytes(zlib.compress(marshal.dumps({"output": [{"flag": {"value": "x"}}]})[:-3]))
+        self.assertIsNone(self.cache.get(key))
+
+    def test_prune_evicts_least_recently_used(self) -> None:
+        keys = []
+        for i in range(3):
+            key = self.cache.key(f"file {i}")
+            self.cache.put(key, {"output": [{f"o{i}": {"value": "x" * 200}}]})
+            os.utime(self.cache._path(key), (1000 + i, 1000 + i))
+            keys.append(key)
+        entry_size = os.path.getsize(self.cache._path(keys[0]))
+
+        self.cache.get(keys[0])  # Refreshes the oldest entry
+        self.cache.max_bytes = 2 * entry_size
+
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,82 @@
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from typing import Dict
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki.search_index import SEARCH_DIRNAME
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+MODULES = {
+    "networking/vnet": 'resource "azurerm_virtual_network" "vnet" {}\n',
+    "security/keyvault": 'resource "azurerm_key_vault" "kv" {}\n',
+}
+
+ROOT_TF = 'module "networking" {\n  source = "./modules/networking/vnet"\n}\n'
+
+# Runs a nav-only generation in a fresh interpreter and reports which heavy modules it imported
+NAV_ONLY = """
+import json, sys
+from scripts.deepwiki import generate_mkdocs_auto as gma
+base = sys.argv[1]
+gma.REPO_ROOT, gma.MODULES_ROOT = base, base + "/modules"
+gma.DOCS_ROOT, gma.DOCS_MODULES, gma.DOCS_ROOT_AGG = base + "/docs", base + "/docs/modules", base + "/docs/root"
+gma.main(["--only", "nav", "--search-index", "--cache-dir", base + "/cache"])
+print(json.dumps(sorted(name for name in ("hcl2", "lark", "asyncio", "concurrent.futures") if name in sys.modules)))
+"""
+
+
+class PhaseSelectionTests(TempRepoTestCase):
+    FILES = {**{f"modules/{name}/main.tf": text for name, text in MODULES.items()}, "networking.tf": ROOT_TF}
+
+    def run_main(self, *argv: str) -> str:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            gma.main(["--no-root-deps", "--search-index", "-j", "1", "--cache-dir", str(self.base / "cache"), *argv])
+        return out.getvalue()
+
+    def docs(self) -> Dict[str, str]:
+        files = sorted((self.base / "docs").rglob("*")) + [self.base / "mkdocs.yml"]
+        return {path.relative_to(self.base).as_posix(): path.read_text(encoding="utf-8")
+                for path in files if path.is_file()}
+
+    def test_nav_only_parses_nothing(self) -> None:
+        out = subprocess.run([sys.executable, "-c", NAV_ONLY, str(self.base)], cwd=REPO_ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        self.assertEqual(json.loads(out.splitlines()[-1]), [])
+
+        # Same nav as a full run, without any module or root page
+        self.assertEqual(sorted(path.name for path in (self.base / "docs").rglob("*.md")), ["index.md"])
+        nav_only = (self.base / "mkdocs.yml").read_text(encoding="utf-8")
+        self.run_main()
+        self.assertEqual((self.base / "mkdocs.yml").read_text(encoding="utf-8"), nav_only)
+
+    def test_selected_phases_leave_other_pages_alone(self) -> None:
+        self.run_main()
+        full = self.docs()
+
+        (self.base / "modules" / "security" / "keyvault" / "main.tf").write_text(
+            'resource "azurerm_key_vault_key" "key" {}\n', encoding="utf-8")
+        (self.base / "networking.tf").write_text(ROOT_TF + 'resource "azurerm_resource_group" "rg" {}\n',
+                                                 encoding="utf-8")
+        self.assertIn("Regenerated root (mkdocs.yml left untouched)", self.run_main("--only", "root"))
+        changed = {path for path, text in self.docs().items() if full.get(path) != text}
+        self.assertIn("docs/root/networking.md", changed)
+        self.assertFalse(any(path.startswith("docs/modules/") for path in changed))
+        self.assertNotIn("mkdocs.yml", changed)
+        # The module shards of the search index survive a root-only run
+        manifest = json.loads((self.base / "docs" / SEARCH_DIRNAME / "manifest.json").read_text(encoding="utf-8"))
+        self.assertEqual(sorted(manifest["shards"]), ["networking", "pages", "root", "security"])
+
+        self.run_main("--only", "modules", "--only", "nav")
+        self.assertIn("azurerm_key_vault_key", self.docs()["docs/modules/security/keyvault.md"])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
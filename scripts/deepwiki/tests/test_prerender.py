@@ -0,0 +1,82 @@
+import os
+import stat
+import textwrap
+import unittest
+from pathlib import Path
+from typing import Dict
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+FAKE_DOT = textwrap.dedent(
+    """\
+    #!/bin/sh
+    # Minimal stand-in for Graphviz used by DiagramRenderer.
+    if [ "$1" = "-V" ]; then echo "dot - graphviz version 0.0 (fake)" >&2; exit 0; fi
+    source="$(cat)"
+    echo render >> "$DOT_LOG"
+    case "$source" in
+      *broken*) echo "syntax error" >&2; exit 1 ;;
+    esac
+    echo "<svg><!-- $(echo "$source" | wc -l) lines --></svg>"
+    """
+)
+
+
+class PrerenderTests(TempRepoTestCase):
+    FILES = {
+        f"modules/cat/{module}/main.tf": f'resource "azurerm_resource_group" "{resource}" {{}}\n'
+        for module, resource in (("ok_a", "a"), ("ok_b", "b"), ("broken", "broken"))
+    }
+
+    def setUp(self) -> None:
+        super().setUp()
+        fake = self.write("bin/dot", FAKE_DOT)
+        fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+        self.log = self.base / "dot.log"
+        self.patch_env(PATH=f"{fake.parent}{os.pathsep}{os.environ.get('PATH', '')}", DOT_LOG=str(self.log))
+        self.cache_dir = str(self.base / "svg-cache")
+
+    def tearDown(self) -> None:
+        gma.set_diagram_renderer(None)
+
+    def run_generator(self) -> Dict[str, str]:
+        gma.reset_write_stats()
+        gma.set_diagram_renderer(gma.DiagramRenderer.detect(self.cache_dir, jobs=2))
+        gma.generate_modules_docs(use_cache=False)
+        return gma.finish_diagrams()
+
+    def renders(self) -> int:
+        return len(self.log.read_text(encoding="utf-8").splitlines()) if self.log.exists() else 0
+
+    def page(self, module: str) -> str:
+        return (Path(gma.DOCS_MODULES) / "cat" / f"{module}.md").read_text(encoding="utf-8")
+
+    def test_pages_reference_cached_svgs(self) -> None:
+        failures = self.run_generator()
+
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(self.renders(), 3)
+        page = self.page("ok_a")
+        self.assertIn("![Dependency diagram](../../assets/diagrams/", page)
+        self.assertNotIn("```mermaid", page)
+        svgs = list((Path(gma.DOCS_ROOT) / "assets" / "diagrams").glob("*.svg"))
+        self.assertEqual(len(svgs), 2)
+
+        # Unchanged diagrams are served from the cache; only the failed one is retried
+        self.run_generator()
+        self.assertEqual(self.renders(), 4)
+
+    def test_failed_render_keeps_inline_mermaid(self) -> None:
+        self.run_generator()
+        page = self.page("broken")
+        self.assertIn("```mermaid", page)
+        self.assertNotIn("assets/diagrams", page)
+
+    def test_missing_renderer_is_detected(self) -> None:
+        self.assertIsNone(gma.DiagramRenderer.detect(self.cache_dir, binary="no-such-renderer"))
+        self.assertEqual(gma.embed_diagram("page.md", "inline", {"a": "a"}, []), "inline")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import unittest
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+# The conditional sends outputs.tf through python-hcl2, so a "parse" span is recorded
+MODULES = {
+    "small": 'resource "azurerm_resource_group" "rg" {}\n',
+    "large": "".join(f'resource "azurerm_storage_account" "sa{i}" {{}}\n' for i in range(200))
+    + 'output "flag" {\n  value = var.enabled ? 1 : 0\n}\n',
+}
+
+
+class ProfileTests(TempRepoTestCase):
+    FILES = {f"modules/cat/{module}/main.tf": text for module, text in MODULES.items()}
+
+    def tearDown(self) -> None:
+        gma.set_tracer(None)
+
+    def test_disabled_spans_are_a_shared_noop(self) -> None:
+        self.assertIs(gma.span("modules"), gma.span("render", "step", module="cat/small"))
+
+    def test_trace_and_summary(self) -> None:
+        tracer = gma.Tracer()
+        gma.set_tracer(tracer)
+        with gma.span("modules"):
+            gma.generate_modules_docs(use_cache=False)
+        gma.set_tracer(None)
+
+        path = self.base / "trace.json"
+        tracer.export(str(path))
+        events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+        complete = [event for event in events if event["ph"] == "X"]
+        self.assertTrue(all(event["dur"] >= 0 and "ts" in event for event in complete))
+        self.assertEqual([e["name"] for e in complete if e["cat"] == "phase"], ["modules"])
+        steps = {(e["args"].get("module"), e["name"]) for e in complete if e["cat"] == "step"}
+        self.assertIn(("cat/large", "dependencies"), steps)
+        self.assertIn(("cat/small", "render"), steps)
+        self.assertTrue(any(e["cat"] == "io" for e in complete))
+
+        summary = tracer.summary(top=1)
+        self.assertIn("Slowest modules (top 1 of 2):", summary)
+        self.assertIn("cat/large", summary)
+        self.assertNotIn("cat/small", summary)
+
+    def test_main_exports_trace(self) -> None:
+        trace = self.base / "out" / "trace.json"
+        gma.main(["--no-root-deps", "--no-cache", "-j", "1", "--profile", str(trace)])
+
+        names = {event["name"] for event in json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]}
+        self.assertTrue({"modules", "root docs", "mkdocs.yml"} <= names)
+        self.assertIsNone(gma._TRACER)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,141 @@
+import contextlib
+import io
+import unittest
+from typing import Any, Dict, List
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki import remote_objects
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+ROOT_FILES = {
+    "local.remote_objects.tf": """locals {
+  remote_objects = {
+    vnets           = try(local.combined_objects_networking, null)
+    resource_groups = try(local.combined_objects_resource_groups, null)
+  }
+}
+""",
+    "locals.combined_objects.tf": """locals {
+  # Local objects merged with the ones of remote landing zones
+  combined_objects_networking      = merge(tomap({ (local.client_config.landingzone_key) = module.networking }), lookup(var.remote_objects, "vnets", {}))
+  combined_objects_resource_groups = merge(tomap({ (local.client_config.landingzone_key) = local.resource_groups }), lookup(var.remote_objects, "resource_groups", {}))
+}
+""",
+    "locals.tf": """locals {
+  client_config   = { landingzone_key = "launchpad" }
+  resource_groups = merge(module.resource_groups, module.resource_group_reused)
+}
+""",
+    "resource_groups.tf": """module "resource_groups" {
+  source = "./modules/resource_group"
+}
+
+module "resource_group_reused" {
+  source = "./modules/resource_group_reused"
+}
+""",
+    "networking.tf": """module "networking" {
+  source = "./modules/networking/vnet"
+  remote_objects = {
+    resource_groups = local.combined_objects_resource_groups
+  }
+}
+""",
+    "keyvaults.tf": """module "keyvaults" {
+  source = "./modules/security/keyvault"
+  remote_objects = merge(
+    local.remote_objects,
+    {
+      diagnostics = null # "(not, a merge)"
+    }
+  )
+}
+""",
+}
+
+MODULES = {
+    "resource_group": 'resource "azurerm_resource_group" "rg" {}\n',
+    "resource_group_reused": 'data "azurerm_resource_group" "rg" {}\n',
+    "networking/vnet": 'resource "azurerm_virtual_network" "vnet" {\n'
+                       "  resource_group_name = var.remote_objects.resource_groups.launchpad.rg.name\n"
+                       "  dns_servers         = [var.remote_objects.private_dns.launchpad.dns.ip]\n}\n",
+    "security/keyvault": 'resource "azurerm_key_vault" "kv" {\n  subnet = var.remote_objects.vnets.launchpad.id\n}\n',
+    # Not called from the root: falls back to local.remote_objects
+    "security/keyvault/access_policies": 'resource "azurerm_key_vault_access_policy" "policy" {\n'
+                                         "  rg = var.remote_objects.resource_groups\n}\n",
+}
+
+
+class RemoteObjectsIndexTests(TempRepoTestCase):
+    FILES = {**ROOT_FILES, **{f"modules/{name}/main.tf": text for name, text in MODULES.items()}}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache_dir = str(self.base / "cache")
+
+    def build(self) -> remote_objects.RemoteObjectsIndex:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return remote_objects.build_remote_objects_index(cache_dir=self.cache_dir)
+
+    def test_keys_resolve_to_producing_module_calls(self) -> None:
+        data = remote_objects.scan_remote_objects(gma.root_tf_files())
+
+        self.assertEqual(data["producers"], {
+            "resource_groups": ["module.resource_group_reused", "module.resource_groups"],
+            "vnets": ["module.networking"],
+        })
+        self.assertEqual(data["consumers"]["networking/vnet"],
+                         {"resource_groups": ["module.resource_group_reused", "module.resource_groups"]})
+        # merge(local.remote_objects, {...}) passes every key plus its own
+        self.assertEqual(sorted(data["consumers"]["security/keyvault"]), ["diagnostics", "resource_groups", "vnets"])
+        self.assertEqual(data["sources"]["module.networking"], "networking/vnet")
+
+        index = remote_objects.RemoteObjectsIndex(data)
+        self.assertEqual(index.inputs("networking/vnet", ["private_dns"]), [("private_dns", None)])
+        self.assertEqual(index.inputs("security/keyvault/access_policies", ["vnets"]),
+                         [("vnets", ["module.networking"])])
+        self.assertEqual(index.consuming_modules("vnets"), ["security/keyvault"])
+
+    def test_module_pages_show_producers_of_remote_inputs(self) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            gma.generate_modules_docs(jobs=1, use_cache=False, remote_objects=self.build())
+
+        page = (self.base / "docs" / "modules" / "networking" / "vnet.md").read_text(encoding="utf-8")
+        self.assertIn("| `private_dns` | Not passed by the root module call |", page)
+        self.assertIn("| `resource_groups` | [`module.resource_group_reused`](../resource_group_reused.md), "
+                      "[`module.resource_groups`](../resource_group.md) |", page)
+        nested = (self.base / "docs" / "modules" / "security" / "keyvault" / "access_policies.md")
+        self.assertIn("[`module.resource_groups`](../../resource_group.md)", nested.read_text(encoding="utf-8"))
+        self.assertNotIn("Remote inputs", (self.base / "docs" / "modules" / "resource_group.md").read_text(
+            encoding="utf-8"))
+        self.assertEqual(gma.stale_remote_input_pages(self.build()), set())
+
+        # Rewiring the root makes exactly the affected page stale
+        networking = self.base / "networking.tf"
+        networking.write_text(ROOT_FILES["networking.tf"].replace("local.combined_objects_resource_groups",
+                                                                   "module.resource_groups"), encoding="utf-8")
+        self.assertEqual(gma.stale_remote_input_pages(self.build()), {"networking/vnet"})
+
+    def test_index_is_cached_by_root_file_hash(self) -> None:
+        scans: List[List[str]] = []
+        original_scan = remote_objects.scan_remote_objects
+
+        def tracking_scan(files: List[str]) -> Dict[str, Any]:
+            scans.append(files)
+            return original_scan(files)
+
+        remote_objects.scan_remote_objects = tracking_scan
+        try:
+            first = self.build()
+            self.assertEqual(self.build().producers, first.producers)
+            self.assertEqual(len(scans), 1)
+
+            (self.base / "networking.tf").write_text(ROOT_FILES["networking.tf"] + "\n", encoding="utf-8")
+            self.build()
+            self.assertEqual(len(scans), 2)
+        finally:
+            remote_objects.scan_remote_objects = original_scan
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
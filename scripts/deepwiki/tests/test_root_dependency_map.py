@@ -1,7 +1,21 @@
+import os
+import tempfile
 import unittest
+from pathlib import Path
+
 from scripts.deepwiki import generate_mkdocs_auto as gma
 
 
+def synthetic_dot(modules: int = 6, resources: int = 40) -> str:
+    lines = ["digraph G {", '  rankdir = "RL";', '  "azurerm_resource_group.rg" [label="azurerm_resource_group.rg"];']
+    for m in range(modules):
+        for r in range(resources):
+            lines.append(f'  "module.m{m}.azurerm_thing.t{r}" -> "module.m{(m + 1) % modules}.azurerm_thing.t{r}";')
+        lines.append(f'  "azurerm_resource_group.rg" -> "module.m{m}.azurerm_thing.t0";')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
 class RootDependencyMapTests(unittest.TestCase):
     def test_parse_dot_module_edges_basic(self):
         dot = """
@@ -17,6 +31,110 @@ class RootDependencyMapTests(unittest.TestCase):
         self.assertIn(("module.a", "module.b"), edges)
         self.assertIn(("root", "module.a"), edges)
 
+    def test_streamed_file_edges_match_text_parser(self):
+        dot = synthetic_dot()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.dot")
+            Path(path).write_text(dot, encoding="utf-8")
+            streamed = gma.aggregate_module_edges(gma.iter_dot_file_edges(path))
+            Path(path).write_text("", encoding="utf-8")
+            self.assertEqual(list(gma.iter_dot_file_edges(path)), [])
+        self.assertEqual(streamed, gma.parse_dot_module_edges(dot))
+
+
+class GraphReductionTests(unittest.TestCase):
+    def test_condenses_cycles_and_drops_implied_edges(self):
+        edges = [
+            ("module.a", "module.b"),
+            ("module.b", "module.c"),
+            ("module.a", "module.c"),  # implied by a -> b -> c
+            ("module.c", "module.d"),
+            ("module.d", "module.c"),  # c and d form a cycle
+            ("module.d", "module.e"),
+            ("module.a", "module.e"),  # implied through the cycle
+        ]
+        members, reduced = gma.reduce_graph(["module.lonely"], edges)
+
+        self.assertEqual(members["module.c + module.d"], ["module.c", "module.d"])
+        self.assertEqual(members["module.lonely"], ["module.lonely"])
+        self.assertEqual(
+            reduced,
+            [
+                ("module.a", "module.b"),
+                ("module.b", "module.c + module.d"),
+                ("module.c + module.d", "module.e"),
+            ],
+        )
+
+    def test_group_graph_keeps_cycles_between_groups(self):
+        members, reduced = gma.reduce_graph([], [("module.a1", "module.b1"), ("module.b1", "module.a2")])
+        grouped, edges = gma.group_graph(members, reduced, {"module.a1": "a", "module.a2": "a", "module.b1": "b"})
+
+        self.assertEqual(grouped, {"a": ["module.a1", "module.a2"], "b": ["module.b1"]})
+        self.assertEqual(edges, [("a", "b"), ("b", "a")])
+
+    def test_neighborhood_is_limited_to_k_hops(self):
+        edges = [("module.a", "module.b"), ("module.b", "module.c"), ("module.c", "module.d"), ("module.x", "module.a")]
+        graph = gma.adjacency(edges)
+        nodes, near = gma.neighborhood(["module.b"], graph, hops=1)
+        self.assertEqual(nodes, ["module.a", "module.b", "module.c"])
+        self.assertEqual(near, [("module.a", "module.b"), ("module.b", "module.c")])
+
+        nodes, _ = gma.neighborhood(["module.b"], graph, hops=2)
+        self.assertEqual(nodes, ["module.a", "module.b", "module.c", "module.d", "module.x"])
+
+    def test_root_roles_do_not_merge_modules_into_one_cycle(self):
+        edges = [("root", "module.a"), ("module.b", "root"), ("module.a", "module.b")]
+        self.assertEqual(len(gma.reduce_graph([], edges)[0]), 1)
+        members, _ = gma.reduce_graph([], gma.split_root(edges))
+        self.assertEqual(sorted(members), ["module.a", "module.b", gma.ROOT_CONSUMERS, gma.ROOT_PROVIDERS])
+
+
+class SplitDependencyMapTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.original_docs_root = gma.DOCS_ROOT
+        gma.DOCS_ROOT = self.tmpdir.name
+        self.root_dir = Path(self.tmpdir.name) / "root"
+        self.root_dir.mkdir()
+        (self.root_dir / "graph.dot").write_text(synthetic_dot(), encoding="utf-8")
+
+    def tearDown(self) -> None:
+        gma.DOCS_ROOT = self.original_docs_root
+        self.tmpdir.cleanup()
+
+    def test_pages_stay_within_budget_and_link_the_dot_artifact(self):
+        budget = 4096
+        gma.generate_root_dependency_map(page_budget=budget)
+
+        overview = (self.root_dir / "dependency_map.md").read_text(encoding="utf-8")
+        self.assertNotIn("```dot", overview)
+        self.assertIn("[graph.dot](graph.dot)", overview)
+        self.assertIn("(dependency_map/module.m0.md)", overview)
+        # The ring m0 -> m1 -> ... -> m5 -> m0 is one strongly connected component
+        self.assertIn("module.m0 + … (6)", overview)
+
+        pages = sorted((self.root_dir / "dependency_map").glob("*.md"))
+        self.assertIn("module.m0.part2.md", [p.name for p in pages])
+        for page in [self.root_dir / "dependency_map.md"] + pages:
+            self.assertLessEqual(page.stat().st_size, budget, msg=page.name)
+
+        # Every resource edge of a module appears in exactly one of its parts
+        module_pages = "".join(p.read_text(encoding="utf-8") for p in pages if p.name.startswith("module.m0."))
+        self.assertEqual(module_pages.count("-> \"module.m1."), 40)
+        self.assertEqual(module_pages.count("\"module.m5.azurerm_thing.t7\" -> "), 1)
+
+    def test_parts_no_longer_needed_are_removed(self):
+        gma.generate_root_dependency_map(page_budget=4096)
+        gma.reset_write_stats()  # As main() does at the start of each run
+        gma.generate_root_dependency_map(page_budget=1024 * 1024)
+
+        names = sorted(p.name for p in (self.root_dir / "dependency_map").glob("*.md"))
+        self.assertEqual(names, ["module.m0.md", "module.m1.md", "module.m2.md", "module.m3.md", "module.m4.md",
+                                 "module.m5.md", "root.md"])
+        self.assertIn("```mermaid", (self.root_dir / "dependency_map.md").read_text(encoding="utf-8"))
+        self.assertIn("## Neighborhood", (self.root_dir / "dependency_map" / "root.md").read_text(encoding="utf-8"))
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
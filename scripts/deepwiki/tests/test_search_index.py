@@ -0,0 +1,190 @@
+import base64
+import contextlib
+import io
+import json
+import shutil
+import subprocess
+import unittest
+from typing import Any, Dict
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki import search_index
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+MODULES = {
+    "networking/vnet": {
+        "main.tf": 'resource "azurerm_virtual_network" "vnet" {\n  name = var.settings.name\n}\n',
+        "variables.tf": 'variable "settings" {\n  description = "Virtual network settings"\n}\n',
+        "outputs.tf": 'output "id" {\n  value = azurerm_virtual_network.vnet.id\n}\n',
+    },
+    "networking/private_endpoint": {
+        "main.tf": 'resource "azurerm_private_endpoint" "pep" {\n  subnet_id = var.subnet_id\n}\n',
+        "variables.tf": 'variable "subnet_id" {\n  description = "Subnet of the private endpoint"\n}\n',
+    },
+    "security/keyvault": {
+        "main.tf": 'resource "azurerm_key_vault" "kv" {\n  name = var.name\n}\n',
+        "variables.tf": 'variable "name" {}\n',
+    },
+}
+
+ROOT_TF = 'module "networking" {\n  source = "./modules/networking/vnet"\n}\nresource "azurerm_resource_group" "rg" {}\n'
+
+GUIDE_MD = """# Module Development Guide
+
+## Prerequisites
+
+```hcl
+# In modules/networking/vnet/main.tf
+```
+
+### Coalesce Pattern
+"""
+
+NODE_SCRIPT = """
+const fs = require("fs"), path = require("path");
+const search = require(process.argv[1]);
+const files = {};
+for (const fn of fs.readdirSync(process.argv[2])) {
+  if (fn.endsWith(".json")) files[fn] = JSON.parse(fs.readFileSync(path.join(process.argv[2], fn)));
+}
+search.load(files).then(() => search.search(process.argv[3])).then((results) => {
+  console.log(JSON.stringify({ titles: results.map((r) => r.doc.title), fetched: search.fetched() }));
+});
+"""
+
+# A first manifest fetch that fails is retried instead of being remembered
+RETRY_SCRIPT = """
+const search = require(process.argv[1]);
+const manifest = { hashes: 1, min_prefix: 2, shards: {} };
+search.load({}).catch((error) => console.log(error.message))
+  .then(() => search.load({ "manifest.json": manifest }))
+  .then(() => search.search("vnet")).then((results) => console.log(JSON.stringify(results)));
+"""
+
+
+class SearchIndexTests(TempRepoTestCase):
+    FILES = {
+        **{f"modules/{name}/{fn}": text for name, files in MODULES.items() for fn, text in files.items()},
+        "networking.tf": ROOT_TF,
+        "docs/guides/MODULE_DEVELOPMENT.md": GUIDE_MD,
+    }
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.search_dir = self.base / "docs" / "assets" / "search"
+
+    def generate(self) -> str:
+        index = search_index.SearchIndex()
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            gma.generate_modules_docs(use_cache=False, search_index=index)
+            gma.generate_root_docs(use_cache=False, search_index=index)
+        index.close()
+        return out.getvalue()
+
+    def manifest(self) -> Dict[str, Any]:
+        return json.loads((self.search_dir / "manifest.json").read_text(encoding="utf-8"))
+
+    def shard(self, name: str) -> Dict[str, Any]:
+        return json.loads((self.search_dir / f"{name}.json").read_text(encoding="utf-8"))
+
+    def test_shards_per_category(self) -> None:
+        self.generate()
+
+        manifest = self.manifest()
+        self.assertEqual(sorted(manifest["shards"]), ["networking", "pages", "root", "security"])
+        self.assertTrue((self.search_dir / "search.js").exists())
+        docs = {doc["title"]: doc for doc in self.shard("networking")["docs"]}
+        self.assertEqual(docs["networking/vnet"], {
+            "location": "modules/networking/vnet/",
+            "title": "networking/vnet",
+            "resources": ["azurerm_virtual_network"],
+            "variables": [["settings", "Virtual network settings"]],
+            "outputs": [["id", ""]],
+        })
+        self.assertEqual(self.shard("root")["docs"][0]["resources"],
+                         ["azurerm_resource_group.rg", "module.networking"])
+        # Diagrams stay out of the index
+        self.assertNotIn("mermaid", (self.search_dir / "networking.json").read_text(encoding="utf-8"))
+
+    def test_bloom_filter_holds_tokens_and_prefixes(self) -> None:
+        self.generate()
+
+        entry = self.manifest()["shards"]["networking"]
+        bitmap = base64.b64decode(entry["bloom"])
+
+        def may_contain(token: str) -> bool:
+            h1, h2 = search_index._fnv1a(token), search_index._fnv1a(token, 0x01000193) | 1
+            bits = [(h1 + i * h2) % entry["bits"] for i in range(search_index.BLOOM_HASHES)]
+            return all(bitmap[bit >> 3] & (1 << (bit & 7)) for bit in bits)
+
+        for token in ("azurerm", "private", "endpoint", "subnet", "pri", "vnet", "settings"):
+            self.assertTrue(may_contain(token), token)
+        self.assertEqual(search_index.search_tokens("azurerm_key_vault.kv"), {"azurerm", "key", "vault", "kv"})
+
+    def test_only_changed_categories_are_rebuilt(self) -> None:
+        self.assertIn("2 category shards rebuilt", self.generate())
+        self.assertIn("0 category shards rebuilt", self.generate())
+
+        main_tf = self.base / "modules" / "security" / "keyvault" / "main.tf"
+        main_tf.write_text(MODULES["security/keyvault"]["main.tf"] + 'resource "azurerm_key_vault_key" "k" {}\n',
+                           encoding="utf-8")
+        self.assertIn("1 category shards rebuilt", self.generate())
+        self.assertIn("azurerm_key_vault_key", self.shard("security")["docs"][0]["resources"])
+
+        shutil.rmtree(self.base / "modules" / "security")
+        self.generate()
+        self.assertNotIn("security", self.manifest()["shards"])
+        self.assertFalse((self.search_dir / "security.json").exists())
+
+    def test_hand_written_pages_are_indexed(self) -> None:
+        self.generate()
+
+        self.assertEqual(self.shard("pages")["docs"], [{
+            "location": "guides/MODULE_DEVELOPMENT/",
+            "title": "Module Development Guide",
+            # Comments in code blocks are not headings
+            "headings": ["Prerequisites", "Coalesce Pattern"],
+            "resources": [],
+            "variables": [],
+            "outputs": [],
+        }])
+        self.assertEqual(search_index.page_search_doc("index.md", "# Overview\n")["location"], "")
+
+    def test_mkdocs_yml_replaces_search_plugin(self) -> None:
+        gma.generate_mkdocs_yml({}, [], search_index=True)
+        mkdocs_yml = (self.base / "mkdocs.yml").read_text(encoding="utf-8")
+        self.assertNotIn("  - search\n", mkdocs_yml)
+        self.assertIn("extra_javascript:\n  - assets/search/search.js\n", mkdocs_yml)
+
+        gma.generate_mkdocs_yml({}, [])
+        self.assertIn("  - search\n", (self.base / "mkdocs.yml").read_text(encoding="utf-8"))
+        # The prebuilt shards are opt-in: by default the plugin indexes every page
+        self.assertFalse(gma.parse_args([]).search_index)
+
+    @unittest.skipUnless(shutil.which("node"), "node is not installed")
+    def test_browser_search_fetches_matching_shards_only(self) -> None:
+        self.generate()
+
+        def search(query: str) -> Dict[str, Any]:
+            out = subprocess.run(["node", "-e", NODE_SCRIPT, search_index.SEARCH_SCRIPT, str(self.search_dir), query],
+                                 check=True, capture_output=True, text=True).stdout
+            return json.loads(out)
+
+        result = search("private endp")
+        self.assertEqual(result["titles"], ["networking/private_endpoint"])
+        self.assertEqual(result["fetched"], ["networking"])
+        self.assertEqual(search("azurerm_key_vault")["titles"], ["security/keyvault"])
+        self.assertEqual(search("zzzq"), {"titles": [], "fetched": []})
+        # Hand-written pages stay searchable by title and section heading
+        self.assertEqual(search("coalesce"), {"titles": ["Module Development Guide"], "fetched": ["pages"]})
+
+    @unittest.skipUnless(shutil.which("node"), "node is not installed")
+    def test_browser_search_retries_failed_manifest(self) -> None:
+        out = subprocess.run(["node", "-e", RETRY_SCRIPT, search_index.SEARCH_SCRIPT], check=True, capture_output=True,
+                             text=True).stdout
+        self.assertEqual(out.splitlines(), ["manifest.json: not found", "[]"])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
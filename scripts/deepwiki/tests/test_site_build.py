@@ -0,0 +1,170 @@
+import contextlib
+import io
+import json
+import os
+import stat
+import textwrap
+import unittest
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki import site_build
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+# Minimal stand-in for `mkdocs build`: directory URLs, links to files of the
+# docs_dir rewritten relative to the built page, unknown links left as written
+FAKE_MKDOCS = textwrap.dedent(
+    """\
+    #!/usr/bin/env python3
+    import json, os, posixpath, re, shutil, sys
+    config_path = sys.argv[sys.argv.index("--config-file") + 1]
+    with open(os.environ["MKDOCS_LOG"], "a") as log:
+        log.write(os.path.basename(os.path.dirname(config_path)) + "\\n")
+    config = dict(line.split(": ", 1) for line in open(config_path).read().splitlines())
+    base = os.path.dirname(config_path)
+    docs, site = os.path.join(base, config["docs_dir"]), os.path.join(base, config["site_dir"])
+    shutil.rmtree(site, ignore_errors=True)
+    pages = [os.path.relpath(os.path.join(d, f), docs).replace(os.sep, "/")
+             for d, _, fs in os.walk(docs) for f in fs]
+
+    def url(page):
+        stem = page[:-3]
+        return stem[:-5] if stem == "index" or stem.endswith("/index") else stem + "/"
+
+    def nav_links(nav):
+        for item in nav:
+            for value in item.values():
+                if isinstance(value, list):
+                    yield from nav_links(value)
+                else:
+                    yield value
+
+    for page in pages:
+        out_dir = url(page).rstrip("/")
+
+        def resolve(link):
+            target = posixpath.normpath(posixpath.join(posixpath.dirname(page), link))
+            if target not in pages:
+                return link
+            return posixpath.relpath(url(target) or ".", out_dir or ".") + "/"
+
+        text = open(os.path.join(docs, page)).read()
+        if "BROKEN" in text:
+            sys.exit(f"broken page {page}")
+        body = re.sub(r"\\[([^]]*)\\]\\(([^)]*)\\)", lambda m: f'<a href="{resolve(m.group(2))}">{m.group(1)}</a>', text)
+        nav = "".join(f'<a href="{resolve(link) if link.endswith(".md") else posixpath.relpath(link, out_dir or ".")}">'
+                      for link in nav_links(json.loads(config["nav"])))
+        os.makedirs(os.path.join(site, out_dir), exist_ok=True)
+        with open(os.path.join(site, out_dir, "index.html"), "w") as f:
+            f.write(f"<nav>{nav}</nav>{body}")
+    os.makedirs(os.path.join(site, "assets"), exist_ok=True)
+    open(os.path.join(site, "assets", "theme.css"), "w").write("body {}")
+    with open(os.path.join(site, "sitemap.xml"), "w") as f:
+        f.write("<urlset>" + "".join(f"<url><loc>{url(page)}</loc></url>" for page in pages) + "</urlset>")
+    """
+)
+
+MKDOCS_YML = """site_name: Test
+nav:
+  - Overview: index.md
+  - Modules:
+    - networking:
+      - vnet: modules/networking/vnet.md
+    - security:
+      - keyvault: modules/security/keyvault.md
+"""
+
+DOCS = {
+    "index.md": "# Home\n[vnet](modules/networking/vnet.md)\n",
+    "modules/networking/vnet.md": "# vnet\n[keyvault](../security/keyvault.md#inputs) ![d](../../assets/d.svg)\n",
+    "modules/security/keyvault.md": "# keyvault\n",
+    "assets/d.svg": "<svg/>",
+}
+
+
+class SiteBuildTests(TempRepoTestCase):
+    FILES = {"mkdocs.yml": MKDOCS_YML, **{f"docs/{rel}": text for rel, text in DOCS.items()}}
+
+    def setUp(self) -> None:
+        super().setUp()
+        fake = self.write("bin/mkdocs", FAKE_MKDOCS)
+        fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+        self.log = self.base / "mkdocs.log"
+        self.patch_env(PATH=f"{fake.parent}{os.pathsep}{os.environ.get('PATH', '')}", MKDOCS_LOG=str(self.log))
+        self.site = self.base / "site"
+
+    def build(self):
+        self.log.write_text("", encoding="utf-8")
+        with contextlib.redirect_stdout(io.StringIO()):
+            rebuilt = site_build.build_site(jobs=2)
+        self.assertEqual(sorted(self.log.read_text(encoding="utf-8").split()), sorted(rebuilt))
+        return rebuilt
+
+    def html(self, rel: str) -> str:
+        return (self.site / rel).read_text(encoding="utf-8")
+
+    def test_partition_helpers(self) -> None:
+        self.assertEqual(site_build.page_url("index.md"), "")
+        self.assertEqual(site_build.page_url("modules/index.md"), "modules/")
+        self.assertEqual(site_build.page_url("root/aadb2c.md"), "root/aadb2c/")
+        self.assertEqual(site_build.site_partition("modules/networking/vnet.md"), "networking")
+        self.assertEqual(site_build.site_partition("modules/index.md"), site_build.SITE_ROOT_PARTITION)
+        nav = [{"Overview": "index.md"}, {"Modules": [{"vnet": "modules/networking/vnet.md"}]}]
+        self.assertEqual(site_build.partition_nav(nav, "networking", {"index.md", "modules/networking/vnet.md"}),
+                         [{"Overview": "./"}, {"Modules": [{"vnet": "modules/networking/vnet.md"}]}])
+
+    def test_merged_site_links_across_partitions(self) -> None:
+        self.assertEqual(self.build(), ["networking", "root", "security"])
+
+        vnet = self.html("modules/networking/vnet/index.html")
+        self.assertIn('href="../../security/keyvault/#inputs"', vnet)
+        self.assertIn('href="../../../assets/d.svg"', vnet)
+        # The combined nav reaches pages of every partition
+        self.assertIn('href="../../.."', vnet)
+        self.assertIn('href="../../security/keyvault"', vnet)
+        self.assertIn('href="modules/networking/vnet/"', self.html("index.html"))
+        self.assertEqual(self.html("assets/d.svg"), "<svg/>")
+        self.assertTrue((self.site / "assets" / "theme.css").exists())
+        sitemap = self.html("sitemap.xml")
+        for loc in ("<loc></loc>", "<loc>modules/networking/vnet/</loc>", "<loc>modules/security/keyvault/</loc>"):
+            self.assertIn(loc, sitemap)
+
+    def test_only_changed_partitions_rebuild(self) -> None:
+        self.build()
+        self.assertEqual(self.build(), [])
+
+        page = self.base / "docs" / "modules" / "security" / "keyvault.md"
+        page.write_text("# keyvault\nUpdated\n", encoding="utf-8")
+        self.assertEqual(self.build(), ["security"])
+        self.assertIn("Updated", self.html("modules/security/keyvault/index.html"))
+
+        # A new page changes the nav of every partition
+        (self.base / "mkdocs.yml").write_text(MKDOCS_YML + "  - Extra: extra.md\n", encoding="utf-8")
+        (self.base / "docs" / "extra.md").write_text("# extra\n", encoding="utf-8")
+        self.assertEqual(self.build(), ["networking", "root", "security"])
+
+        (self.base / "docs" / "extra.md").unlink()
+        (self.base / "docs" / "assets" / "d.svg").unlink()
+        self.build()
+        self.assertFalse((self.site / "extra").exists())
+        self.assertFalse((self.site / "assets" / "d.svg").exists())
+
+    def test_failed_partition_is_retried(self) -> None:
+        self.build()
+        page = self.base / "docs" / "modules" / "security" / "keyvault.md"
+        page.write_text("# keyvault\nBROKEN\n", encoding="utf-8")
+        with contextlib.redirect_stderr(io.StringIO()) as err, self.assertRaises(SystemExit):
+            self.build()
+        self.assertIn("broken page modules/security/keyvault.md", err.getvalue())
+        cache = json.loads((self.base / gma.CACHE_DIRNAME / "site.json").read_text(encoding="utf-8"))
+        self.assertEqual(sorted(cache["entries"]), ["networking", "root"])
+
+        page.write_text("# keyvault\n", encoding="utf-8")
+        self.assertEqual(self.build(), ["security"])
+
+        os.environ["PATH"] = str(self.base)  # mkdocs is not installed
+        with self.assertRaises(SystemExit):
+            site_build.build_site()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
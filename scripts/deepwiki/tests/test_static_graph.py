@@ -0,0 +1,170 @@
+import os
+import unittest
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki.static_graph import static_graph_dot, static_resource_edges
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+MODULES = {
+    "networking/vnet": """
+resource "azurerm_virtual_network" "vnet" {
+  resource_group_name = var.resource_group_name
+}
+
+resource "azurerm_subnet" "snet" {
+  virtual_network_name = azurerm_virtual_network.vnet.name
+}
+
+module "diagnostics" {
+  source      = "../../diagnostics"
+  resource_id = azurerm_virtual_network.vnet.id
+}
+
+output "id" {
+  value = azurerm_virtual_network.vnet.id
+}
+""",
+    "networking/private_endpoint": """
+resource "azurerm_private_endpoint" "pep" {
+  subnet_id = var.remote_objects.vnets[var.settings.lz_key][var.settings.vnet_key].id
+  # azurerm_virtual_network.vnet is not declared here
+  custom_dns_configs = <<-EOT
+    module.diagnostics
+  EOT
+}
+""",
+    "diagnostics": """
+resource "azurerm_monitor_diagnostic_setting" "diagnostics" {
+  target_resource_id = var.resource_id
+}
+""",
+}
+
+ROOT_TF = """
+locals {
+  combined_objects_networking = merge(
+    tomap({ (var.landingzone_key) = module.networking }),
+    lookup(var.remote_objects, "vnets", {})
+  )
+}
+
+resource "azurerm_resource_group" "rg" {}
+
+module "networking" {
+  source              = "./modules/networking/vnet"
+  resource_group_name = azurerm_resource_group.rg.name
+}
+
+module "private_endpoints" {
+  source   = "./modules/networking/private_endpoint"
+  for_each = var.private_endpoints
+  settings = each.value
+
+  remote_objects = {
+    vnets = local.combined_objects_networking
+  }
+}
+
+module "diagnostics" {
+  source      = "./modules/diagnostics"
+  resource_id = azurerm_resource_group.rg.id
+  depends_on  = [module.private_endpoints]
+}
+"""
+
+VNET = "module.networking.azurerm_virtual_network.vnet"
+SUBNET = "module.networking.azurerm_subnet.snet"
+VNET_DIAGNOSTICS = "module.networking.module.diagnostics.azurerm_monitor_diagnostic_setting.diagnostics"
+PEP = "module.private_endpoints.azurerm_private_endpoint.pep"
+ROOT_DIAGNOSTICS = "module.diagnostics.azurerm_monitor_diagnostic_setting.diagnostics"
+
+
+class HclAttributesTests(unittest.TestCase):
+    def test_multiline_values_and_nested_blocks(self) -> None:
+        body = """
+  name = "a = b"  # not = an attribute
+  tags = merge(
+    var.tags,
+  )
+  ip_configuration {
+    subnet_id = var.subnet_id
+  }
+  script = <<EOT
+x = 1
+EOT
+  depends_on = [module.x]
+"""
+        attributes = gma.hcl_attributes(body)
+        self.assertEqual(list(attributes), ["name", "tags", "script", "depends_on"])
+        self.assertIn("var.tags", attributes["tags"])
+        self.assertNotIn("subnet_id", attributes["tags"])
+        self.assertEqual(attributes["depends_on"].strip(), "[module.x]")
+
+
+class StaticGraphTests(TempRepoTestCase):
+    FILES = {**{f"modules/{name}/main.tf": text for name, text in MODULES.items()}, "main.tf": ROOT_TF}
+
+    def test_resource_edges(self) -> None:
+        resources, edges = static_resource_edges()
+
+        self.assertEqual(resources, sorted(["azurerm_resource_group.rg", VNET, SUBNET, VNET_DIAGNOSTICS, PEP,
+                                            ROOT_DIAGNOSTICS]))
+        self.assertEqual(edges, sorted([
+            (VNET, "azurerm_resource_group.rg"),
+            (SUBNET, VNET),
+            (VNET_DIAGNOSTICS, VNET),
+            # A whole-module reference waits for every resource of the call; pep -> vnet is implied
+            (PEP, SUBNET),
+            (PEP, VNET_DIAGNOSTICS),
+            # depends_on reaches the resources through the call; the rg reference is implied by the path via pep
+            (ROOT_DIAGNOSTICS, PEP),
+        ]))
+
+    def test_dot_round_trip(self) -> None:
+        resources, edges = static_resource_edges()
+        dot_text = static_graph_dot(resources, edges)
+
+        self.assertEqual(gma.parse_dot_module_edges(dot_text), gma.aggregate_module_edges(edges))
+        self.assertEqual(gma.aggregate_module_edges(edges)[1], [
+            ("module.diagnostics", "module.private_endpoints"),
+            ("module.networking", "root"),
+            ("module.private_endpoints", "module.networking"),
+        ])
+
+    def test_dependency_map_without_terraform(self) -> None:
+        gma.generate_root_dependency_map(static_graph=True)
+
+        dot_file = self.base / "docs" / "root" / "graph.dot"
+        self.assertIn(f'"{PEP}" -> "{SUBNET}";', dot_file.read_text(encoding="utf-8"))
+        page = (self.base / "docs" / "root" / "dependency_map.md").read_text(encoding="utf-8")
+        self.assertIn("module_private_endpoints --> module_networking", page)
+
+
+class CheckedInGraphTests(unittest.TestCase):
+    """The static graph against the ``terraform graph`` output committed under docs/root."""
+
+    # The committed DOT predates some root modules, and terraform resolves a few
+    # references (provider-computed values, dynamic lookups) differently
+    MIN_RECALL = 0.95
+    MIN_PRECISION = 0.9
+
+    def test_module_edges_match_terraform_graph(self) -> None:
+        dot_file = os.path.join(gma.REPO_ROOT, "docs", "root", "graph.dot")
+        if not os.path.exists(dot_file):
+            self.skipTest("no checked-in docs/root/graph.dot")
+        with open(dot_file, encoding="utf-8") as f:
+            dot_modules, dot_edges = gma.parse_dot_module_edges(f.read())
+        static_modules, static_edges = gma.aggregate_module_edges(static_resource_edges()[1])
+
+        # Only modules both graphs know about are comparable
+        common = set(dot_modules) & set(static_modules)
+        self.assertGreater(len(common), 0.9 * len(dot_modules))
+        expected = {edge for edge in dot_edges if set(edge) <= common}
+        actual = {edge for edge in static_edges if set(edge) <= common}
+        both = len(expected & actual)
+        self.assertGreaterEqual(both / len(expected), self.MIN_RECALL, sorted(expected - actual)[:20])
+        self.assertGreaterEqual(both / len(actual), self.MIN_PRECISION, sorted(actual - expected)[:20])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,163 @@
+import contextlib
+import io
+import os
+import shutil
+import sys
+import unittest
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki import watch
+from scripts.deepwiki.tests.temp_repo import TempRepoTestCase
+
+MAIN_TF = 'resource "azurerm_resource_group" "rg" {}\n'
+
+
+class FakeWatcher:
+    """Makes one queued batch of edits (``{path: text}``) per call, then stops watch() like Ctrl+C."""
+
+    name = "fake"
+
+    def __init__(self, *batches: Dict[Path, str]) -> None:
+        self.batches = list(batches)
+        self.closed = False
+
+    def changes(self, timeout: Optional[float] = None) -> Set[str]:
+        if not self.batches:
+            raise KeyboardInterrupt
+        edits = self.batches.pop(0)
+        for path, text in edits.items():
+            path.write_text(text, encoding="utf-8")
+        return {str(path) for path in edits}
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class WatchSessionTests(TempRepoTestCase):
+    FILES = {
+        "modules/cat/a/main.tf": MAIN_TF,
+        "modules/cat/b/main.tf": MAIN_TF,
+        "compute.tf": 'module "a" {\n  source = "./modules/cat/a"\n}\n',
+    }
+
+    def setUp(self) -> None:
+        super().setUp()
+        argv = ["--no-root-deps", "--search-index", "-j", "1", "--cache-dir", str(self.base / "cache")]
+        gma.main(argv)
+        gma.reset_write_stats()
+        self.session = watch.WatchSession(gma.parse_args(argv))
+
+    def tearDown(self) -> None:
+        self.session.close()
+
+    def read(self, *parts: str) -> str:
+        return self.base.joinpath(*parts).read_text(encoding="utf-8")
+
+    def test_startup_from_cache_writes_nothing(self) -> None:
+        self.assertEqual(set(self.session.modules), {"cat/a", "cat/b"})
+        self.assertEqual(gma.WRITE_STATS["created"] + gma.WRITE_STATS["updated"], 0)
+
+    def test_edit_rewrites_only_that_page(self) -> None:
+        main_tf = self.base / "modules" / "cat" / "a" / "main.tf"
+        main_tf.write_text(MAIN_TF + 'resource "azurerm_storage_account" "sa" {}\n', encoding="utf-8")
+
+        pages = self.session.apply({str(main_tf), str(self.base / "docs" / "index.md")})
+
+        self.assertEqual(pages, [os.path.join(gma.DOCS_MODULES, "cat", "a.md")])
+        self.assertIn("`azurerm_storage_account`", self.read("docs", "modules", "cat", "a.md"))
+        # The page, its category's search shard and the search manifest
+        self.assertEqual(gma.WRITE_STATS["updated"], 3)
+        self.assertIn("azurerm_storage_account", self.read("docs", "assets", "search", "cat.json"))
+        self.assertEqual(gma.WRITE_STATS["created"], 0)
+
+        # Saving again without a content change is a no-op
+        self.assertEqual(self.session.apply({str(main_tf)}), [])
+
+    def test_added_and_removed_modules_update_index_and_nav(self) -> None:
+        new_module = self.base / "modules" / "cat" / "c"
+        new_module.mkdir()
+        (new_module / "main.tf").write_text(MAIN_TF, encoding="utf-8")
+        self.session.apply({str(new_module)})
+
+        self.assertIn("- [c](modules/cat/c.md)", self.read("docs", "modules", "index.md"))
+        self.assertIn("modules/cat/c.md", self.read("mkdocs.yml"))
+
+        shutil.rmtree(self.base / "modules" / "cat" / "b")
+        pages = self.session.apply({str(self.base / "modules" / "cat" / "b")})
+
+        self.assertEqual(pages, [os.path.join(gma.DOCS_MODULES, "cat", "b.md")])
+        self.assertFalse(os.path.exists(pages[0]))
+        self.assertNotIn("cat/b.md", self.read("mkdocs.yml"))
+
+    def test_nested_module_is_its_own_page(self) -> None:
+        nested = self.base / "modules" / "cat" / "a" / "sub"
+        nested.mkdir()
+        (nested / "main.tf").write_text(MAIN_TF, encoding="utf-8")
+        pages = self.session.apply({str(nested), str(nested / "main.tf")})
+
+        self.assertEqual(pages, [os.path.join(gma.DOCS_MODULES, "cat", "a", "sub.md")])
+        self.assertIn("- [a/sub](modules/cat/a/sub.md)", self.read("docs", "modules", "index.md"))
+
+        (nested / "main.tf").write_text(MAIN_TF + 'resource "azurerm_storage_account" "sa" {}\n', encoding="utf-8")
+        self.assertEqual(self.session.apply({str(nested / "main.tf")}), pages)
+
+    def test_root_file_edit(self) -> None:
+        root_tf = self.base / "compute.tf"
+        root_tf.write_text('module "a" {\n  source = "./modules/cat/a"\n}\nmodule "b" {\n  source = "./modules/cat/b"\n}\n',
+                           encoding="utf-8")
+
+        pages = self.session.apply({str(root_tf)})
+
+        self.assertEqual(pages, [os.path.join(gma.DOCS_ROOT_AGG, "compute.md")])
+        self.assertIn("b", self.read("docs", "root", "compute.md"))
+
+    def test_overflow_rescans_everything(self) -> None:
+        (self.base / "modules" / "cat" / "b" / "main.tf").write_text(MAIN_TF + "# edited\n", encoding="utf-8")
+        self.assertEqual(self.session.apply(None), [os.path.join(gma.DOCS_MODULES, "cat", "b.md")])
+
+    def test_watch_until_interrupted(self) -> None:
+        watcher = FakeWatcher({self.base / "modules" / "cat" / "b" / "main.tf": MAIN_TF + "# edited\n"})
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            watch.watch(self.session.args, watcher)
+
+        self.assertTrue(watcher.closed)
+        self.assertIn(f"Watching {gma.MODULES_ROOT}", out.getvalue())
+        self.assertIn("↻ modules/cat/b.md", out.getvalue())
+
+
+class WatcherTests(TempRepoTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        (self.base / "modules" / "cat" / "a").mkdir(parents=True)
+
+    def check_watcher(self, watcher) -> None:
+        try:
+            main_tf = self.base / "modules" / "cat" / "a" / "main.tf"
+            main_tf.write_text(MAIN_TF, encoding="utf-8")
+            self.assertIn(str(main_tf), watcher.changes(timeout=2))
+
+            new_module = self.base / "modules" / "cat" / "b"
+            new_module.mkdir()
+            (new_module / "main.tf").write_text(MAIN_TF, encoding="utf-8")
+            changed = watcher.changes(timeout=2)
+            while str(new_module / "main.tf") not in changed:
+                more = watcher.changes(timeout=2)
+                self.assertTrue(more, "new module file was not reported")
+                changed |= more
+        finally:
+            watcher.close()
+
+    def test_polling_watcher(self) -> None:
+        self.check_watcher(watch.PollingWatcher(interval=0.01))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_watcher(self) -> None:
+        self.check_watcher(watch.InotifyWatcher(debounce=0.01))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
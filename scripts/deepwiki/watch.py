@@ -0,0 +1,343 @@
+"""Watch mode (``--watch``): regenerate only the pages of edited modules and root files.
+
+After the full run, ``main()`` hands over to ``watch()``, which keeps the scan
+results in memory and maps every batch of file changes reported by the
+watcher (inotify on Linux, polling elsewhere) to the pages it affects.
+"""
+import argparse
+import json
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scripts.deepwiki import generate_mkdocs_auto as gma
+from scripts.deepwiki.catalog import Catalog, default_catalog_path
+from scripts.deepwiki.remote_objects import build_remote_objects_index
+from scripts.deepwiki.search_index import SearchIndex
+
+WATCH_DEBOUNCE = 0.05
+WATCH_POLL_INTERVAL = 0.1
+
+
+class InotifyWatcher:
+    """Linux inotify (through ctypes) on the repository root and every folder under ``modules/``.
+
+    ``changes()`` blocks until something happens, then keeps reading for
+    ``debounce`` seconds so an editor's save burst (temp file, rename, chmod)
+    arrives as one batch. Returns the touched paths, or None when the kernel
+    queue overflowed and the caller has to assume everything changed.
+    """
+
+    name = "inotify"
+    IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x8, 0x40, 0x80, 0x100, 0x200
+    IN_Q_OVERFLOW, IN_IGNORED, IN_ISDIR = 0x4000, 0x8000, 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, debounce: float = WATCH_DEBOUNCE):
+        import ctypes
+        import ctypes.util
+
+        self.debounce = debounce
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._errno = ctypes.get_errno
+        self.fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(self._errno(), "inotify_init1 failed")
+        self.paths: Dict[int, str] = {}
+        try:
+            self._watch(gma.REPO_ROOT)
+            self._watch_tree(gma.MODULES_ROOT)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, path: str):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            raise OSError(self._errno(), f"inotify_add_watch failed for {path}")
+        self.paths[wd] = path
+
+    def _watch_tree(self, top: str) -> List[str]:
+        """Watch ``top`` and its folders; returns the files already there."""
+        found: List[str] = []
+        for root, dirs, files in os.walk(top):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]  # .terraform and friends
+            self._watch(root)
+            found.extend(os.path.join(root, fn) for fn in files)
+        return found
+
+    def _read(self) -> Optional[Set[str]]:
+        buffer = os.read(self.fd, 64 * 1024)
+        changed: Set[str] = set()
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _cookie, length = self.EVENT.unpack_from(buffer, offset)
+            name = os.fsdecode(buffer[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b"\0"))
+            offset += self.EVENT.size + length
+            if mask & self.IN_Q_OVERFLOW:
+                return None
+            directory = self.paths.get(wd)
+            if directory is None:
+                continue
+            if mask & self.IN_IGNORED:
+                del self.paths[wd]
+                continue
+            path = os.path.join(directory, name)
+            if (mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO) and directory != gma.REPO_ROOT
+                    and not name.startswith(".")):
+                # Files written before the watch existed produce no events of their own
+                try:
+                    changed.update(self._watch_tree(path))
+                except OSError:
+                    pass  # Removed again before we got to it
+            changed.add(path)
+        return changed
+
+    def changes(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        changed = self._read()
+        while changed is not None and select.select([self.fd], [], [], self.debounce)[0]:
+            more = self._read()
+            changed = None if more is None else changed | more
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Portable fallback: compares ``(mtime, size)`` of the watched ``.tf`` files every ``interval`` seconds."""
+
+    name = "polling"
+
+    def __init__(self, interval: float = WATCH_POLL_INTERVAL):
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    @staticmethod
+    def _snapshot() -> Dict[str, Tuple[int, int]]:
+        files: Dict[str, Tuple[int, int]] = {gma.REPO_ROOT: (0, 0)}
+        with os.scandir(gma.REPO_ROOT) as entries:
+            for entry in entries:
+                if entry.name.endswith(".tf") and entry.is_file():
+                    st = entry.stat()
+                    files[entry.path] = (st.st_mtime_ns, st.st_size)
+        for task in gma.discover_modules():
+            files[task.path] = (0, 0)
+            files.update((os.path.join(task.path, fn), (mtime, size)) for fn, size, mtime in task.files)
+        return files
+
+    def changes(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._snapshot()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher():
+    """inotify on Linux, polling anywhere else or when inotify is unavailable (e.g. out of watches)."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as exc:
+            print(f"⚠️  inotify unavailable ({exc}); falling back to polling", file=sys.stderr)
+    return PollingWatcher()
+
+
+class WatchSession:
+    """Scan results of every module and root file, kept in memory between edits.
+
+    ``apply()`` maps changed paths to modules and root files, rescans only those
+    whose content hash changed and rewrites only their pages; the indexes and
+    mkdocs.yml are rewritten only when a module or root file appeared or went away.
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.cache_dir = args.cache_dir or gma.default_cache_dir()
+        self.modules = gma.load_scans(self.cache_dir, "modules") if args.use_cache else {}
+        self.root = gma.load_scans(self.cache_dir, "root") if args.use_cache else {}
+        self.dirty = False
+        parse_cache = (
+            gma.HclParseCache(os.path.join(self.cache_dir, "hcl2"), args.parse_cache_mb * 1024 * 1024)
+            if args.use_cache else None
+        )
+        self.previous_parse_cache = gma.set_parse_cache(parse_cache)
+        self.catalog = (
+            Catalog(args.catalog or default_catalog_path(args.cache_dir)) if args.use_catalog else None
+        )
+        self.search_index = SearchIndex() if args.search_index else None
+        # Built once; edits under examples/ and to the remote_objects wiring are picked up by the next full run
+        self.examples = (
+            gma.build_examples_index(args.jobs, args.use_cache, args.cache_dir) if args.examples else None
+        )
+        self.remote_objects = (
+            build_remote_objects_index(args.use_cache, args.cache_dir) if args.remote_inputs else None
+        )
+        # Drop entries the full build did not cache (--no-cache) or that are gone, and fill the gaps
+        self.manifest = {task.name: task for task in gma.discover_modules()}
+        self.modules = {name: entry for name, entry in self.modules.items() if name in self.manifest}
+        self.root = {fn: entry for fn, entry in self.root.items() if fn in gma.root_tf_files()}
+        self.update(set(self.manifest), gma.root_tf_files())
+
+    def targets(self, paths: Optional[Iterable[str]]) -> Tuple[Set[str], Set[str]]:
+        """``(modules, root files)`` possibly affected by ``paths``; None means everything.
+
+        Changes under modules/ refresh the manifest; modules that appeared or
+        went away are always included.
+        """
+        if paths is None:
+            self.manifest = {task.name: task for task in gma.discover_modules()}
+            return set(self.manifest) | set(self.modules), set(gma.root_tf_files()) | set(self.root)
+        modules: Set[str] = set()
+        root: Set[str] = set()
+        rescan = False
+        for path in paths:
+            rel = os.path.relpath(path, gma.MODULES_ROOT).replace(os.sep, "/")
+            if rel.startswith("../"):
+                if os.path.dirname(path) == gma.REPO_ROOT and path.endswith(".tf"):
+                    root.add(os.path.basename(path))
+            elif not any(part.startswith(".") for part in rel.split("/")):
+                rescan = True
+                modules.add(gma.owning_module(rel, self.manifest) or "")
+        if rescan:
+            self.manifest = {task.name: task for task in gma.discover_modules()}
+            modules |= set(self.manifest).symmetric_difference(self.modules)
+        modules.discard("")
+        return modules, root
+
+    def apply(self, paths: Optional[Iterable[str]]) -> List[str]:
+        """Bring the pages affected by ``paths`` up to date; returns the pages written or removed."""
+        start = time.perf_counter()
+        modules, root = self.targets(paths)
+        pages = self.update(modules, root)
+        if pages:
+            names = ", ".join(os.path.relpath(page, gma.DOCS_ROOT) for page in pages[:5])
+            more = f" (+{len(pages) - 5} more)" if len(pages) > 5 else ""
+            print(f"↻ {names}{more} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return pages
+
+    def update(self, modules: Iterable[str], root: Iterable[str]) -> List[str]:
+        pages: List[str] = []
+        renderer = gma.set_diagram_renderer(None)
+        if renderer is not None:
+            # A fresh renderer per batch, so finish_diagrams() only handles this batch's diagrams
+            gma.set_diagram_renderer(gma.DiagramRenderer(renderer.binary, renderer.version, renderer.cache_dir,
+                                                         renderer.jobs, renderer.timeout))
+        try:
+            modules_changed = self._update_modules(modules, pages)
+            root_changed = self._update_root(root, pages)
+            if pages:
+                gma.finish_diagrams(prune=False)
+        finally:
+            gma.set_diagram_renderer(renderer)
+        if modules_changed:
+            gma.write_modules_index(self.nav_modules())
+        if root_changed:
+            gma.write_root_index(self.nav_root())
+        if modules_changed or root_changed:
+            gma.generate_mkdocs_yml(self.nav_modules(), self.nav_root(), force_nav=self.args.force_nav,
+                                    search_index=self.search_index is not None)
+        if self.catalog is not None and pages:
+            self.catalog.update_modules(self.modules)
+            self.catalog.update_root(os.path.join(gma.DOCS_ROOT, "root", "graph.dot"))
+        if self.search_index is not None and pages:
+            self.search_index.update_modules(self.modules)
+            self.search_index.update_root(self.root)
+            self.search_index.close()
+        self.dirty = self.dirty or bool(pages)
+        return pages
+
+    def _update_modules(self, modules: Iterable[str], pages: List[str]) -> bool:
+        structure_changed = False
+        for name in sorted(modules):
+            task = self.manifest.get(name)
+            page = os.path.join(gma.DOCS_MODULES, f"{name}.md")
+            if task is None:
+                if self.modules.pop(name, None) is not None:
+                    structure_changed = True
+                    if os.path.exists(page):
+                        os.remove(page)
+                        pages.append(page)
+                continue
+            key = gma.module_content_hash(task.path, [fn for fn, _, _ in task.files])
+            entry = self.modules.get(name)
+            if entry is not None and entry.get("key") == key and os.path.exists(page):
+                continue
+            structure_changed = structure_changed or entry is None
+            data = gma.compact_scan(json.loads(json.dumps(gma.scan_module(task.category, task.module, task.path))))
+            self.modules[name] = {"key": key, "data": data}
+            examples = self.examples.get(name, []) if self.examples is not None else None
+            gma.write(page, gma.render_module_page(task.category, task.module, data, examples, self.remote_objects))
+            pages.append(page)
+        return structure_changed
+
+    def _update_root(self, root: Iterable[str], pages: List[str]) -> bool:
+        structure_changed = False
+        for fn in sorted(root):
+            path = os.path.join(gma.REPO_ROOT, fn)
+            page = os.path.join(gma.DOCS_ROOT_AGG, f"{os.path.splitext(fn)[0]}.md")
+            if not os.path.isfile(path):
+                if self.root.pop(fn, None) is not None:
+                    structure_changed = True
+                    if os.path.exists(page):
+                        os.remove(page)
+                        pages.append(page)
+                continue
+            key = gma.content_hash([path])
+            entry = self.root.get(fn)
+            if entry is not None and entry.get("key") == key and os.path.exists(page):
+                continue
+            structure_changed = structure_changed or entry is None
+            self.root[fn] = {"key": key, "data": gma.compact_scan(gma.scan_root_file(fn))}
+            gma.write_root_page(fn, self.root[fn]["data"])
+            pages.append(page)
+        return structure_changed
+
+    def nav_modules(self) -> Dict[str, List[Tuple[str, str]]]:
+        nav: Dict[str, List[Tuple[str, str]]] = {}
+        for name in sorted(self.modules, key=lambda name: name.split("/")):
+            nav.setdefault(name.split("/")[0], []).append(gma.module_nav_entry(name))
+        return nav
+
+    def nav_root(self) -> List[Tuple[str, str]]:
+        return [gma.root_nav_entry(fn) for fn in sorted(self.root)]
+
+    def close(self):
+        """Persist what changed into the incremental cache, so the next full run starts warm."""
+        gma.set_parse_cache(self.previous_parse_cache)
+        if self.catalog is not None:
+            self.catalog.close()
+        if self.args.use_cache and self.dirty:
+            gma.save_cache(self.cache_dir, "modules", self.modules)
+            gma.save_cache(self.cache_dir, "root", self.root)
+
+
+def watch(args: argparse.Namespace, watcher=None):
+    """Keep regenerating affected pages until interrupted (``--watch``)."""
+    session = WatchSession(args)
+    watcher = watcher or open_watcher()
+    print(f"👀 Watching {gma.MODULES_ROOT} and root *.tf files ({watcher.name}); press Ctrl+C to stop")
+    try:
+        while True:
+            session.apply(watcher.changes())
+    except KeyboardInterrupt:
+        print()
+    finally:
+        watcher.close()
+        session.close()